@@ -1,18 +1,8 @@
 #!/bin/bash
-# Auto-discover and run all Harambe scrapers in parallel
+# Run all Harambe scrapers in one process that shares a single browser. Each
+# scraper gets its own browser context, and HARAMBE_PAGE_BUDGET limits the pages
+# open across all of them.
 
-# Find all Python files in harambe_scrapers/ (excluding __init__.py, observers.py, and utils.py)
-for scraper in harambe_scrapers/*.py; do
-    # Skip special files
-    if [[ "$scraper" == *"__init__.py"* ]] || [[ "$scraper" == *"observers.py"* ]] || [[ "$scraper" == *"utils.py"* ]]; then
-        continue
-    fi
-
-    echo "Starting: $scraper"
-    pipenv run python "$scraper" &
-done
-
-# Wait for all background jobs to complete
-wait
+pipenv run python -m harambe_scrapers.runner
 
 echo "All Harambe scrapers completed"
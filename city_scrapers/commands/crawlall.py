@@ -0,0 +1,90 @@
+import logging
+
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+from twisted.internet.defer import DeferredSemaphore
+
+logger = logging.getLogger(__name__)
+
+
+class Command(ScrapyCommand):
+    """
+    Runs every spider (or a chosen subset) on a single CrawlerProcess instead of
+    starting a separate `scrapy crawl` process per spider. Each spider still gets
+    its own Crawler, so feed URIs (which are formatted with the spider name) and
+    stats stay separate. The number of spiders crawling at once is capped by
+    `--max-concurrent` or the CITY_SCRAPERS_MAX_CONCURRENT_SPIDERS setting.
+    """
+
+    requires_project = True
+    # All spiders share one reactor, so it needs to be the asyncio reactor that
+    # scrapy-playwright spiders set in their custom_settings
+    default_settings = {
+        "TWISTED_REACTOR": "twisted.internet.asyncioreactor.AsyncioSelectorReactor",
+    }
+
+    def syntax(self):
+        return "[options] [spider ...]"
+
+    def short_desc(self):
+        return "Run all spiders, or the spiders provided, in a single process"
+
+    def add_options(self, parser):
+        ScrapyCommand.add_options(self, parser)
+        parser.add_argument(
+            "-c",
+            "--max-concurrent",
+            dest="max_concurrent",
+            type=int,
+            default=None,
+            help="maximum number of spiders to crawl at the same time",
+        )
+
+    def run(self, args, opts):
+        spider_names = self._get_spider_names(args)
+        max_concurrent = opts.max_concurrent or self.settings.getint(
+            "CITY_SCRAPERS_MAX_CONCURRENT_SPIDERS"
+        )
+        if max_concurrent < 1:
+            raise UsageError("The maximum number of concurrent spiders must be >= 1")
+
+        logger.info(
+            "Crawling %d spiders, at most %d at a time",
+            len(spider_names),
+            max_concurrent,
+        )
+        semaphore = DeferredSemaphore(max_concurrent)
+        for spider_name in spider_names:
+            semaphore.run(self._crawl, spider_name)
+
+        # CrawlerProcess.join waits until no crawls are active. A queued spider is
+        # started by the semaphore as soon as a running one finishes, so the
+        # reactor only stops once every spider has run.
+        self.crawler_process.start()
+        if self.crawler_process.bootstrap_failed:
+            self.exitcode = 1
+
+    def _get_spider_names(self, args):
+        """Return the requested spider names, or all spiders if none provided"""
+        spider_list = self.crawler_process.spider_loader.list()
+        if not args:
+            return sorted(spider_list)
+        unknown = [name for name in args if name not in spider_list]
+        if unknown:
+            raise UsageError("Unknown spiders: {}".format(", ".join(unknown)))
+        return list(dict.fromkeys(args))
+
+    def _crawl(self, spider_name):
+        d = self.crawler_process.crawl(spider_name)
+        d.addErrback(self._log_failure, spider_name)
+        return d
+
+    def _log_failure(self, failure, spider_name):
+        """Log a crawl failure without stopping the spiders still queued"""
+        logger.error(
+            "Spider %s failed: %s",
+            spider_name,
+            failure.getErrorMessage(),
+            exc_info=(failure.type, failure.value, failure.getTracebackObject()),
+        )
+        self.exitcode = 1
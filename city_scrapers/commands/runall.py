@@ -0,0 +1,6 @@
+from city_scrapers_core.commands.runall import Command as CoreCommand
+
+
+class Command(CoreCommand):
+    """Re-exposes the city_scrapers_core `runall` command alongside the
+    project-level commands in this module"""
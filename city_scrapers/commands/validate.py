@@ -0,0 +1,6 @@
+from city_scrapers_core.commands.validate import Command as CoreCommand
+
+
+class Command(CoreCommand):
+    """Re-exposes the city_scrapers_core `validate` command alongside the
+    project-level commands in this module"""
@@ -1,5 +1,21 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+from city_scrapers_core.constants import CANCELLED
 from city_scrapers_core.items import Meeting
+from scrapy import Request, signals
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Headers
+from scrapy.utils.project import data_path
 from scrapy_wayback_middleware import WaybackMiddleware
+from twisted.internet import defer, task
+
+from city_scrapers.utils import ResponseStore
 
 
 class CityScrapersWaybackMiddleware(WaybackMiddleware):
@@ -16,3 +32,517 @@ class CityScrapersWaybackMiddleware(WaybackMiddleware):
         if isinstance(item, dict):
             return [doc.get("url") for doc in item.get("documents", [])][:MAX_LINKS]
         return []
+
+
+class HostSlot:
+    """Concurrency budget and minimum delay between requests for a single host"""
+
+    def __init__(self, concurrency, delay):
+        self.semaphore = defer.DeferredSemaphore(concurrency)
+        self.delay = delay
+        self.next_request_time = 0
+
+    def acquire(self):
+        """Returns a deferred that fires once a request to this host can be sent"""
+        return self.semaphore.acquire().addCallback(self._wait_for_delay)
+
+    def release(self):
+        self.semaphore.release()
+
+    def _wait_for_delay(self, _):
+        from twisted.internet import reactor
+
+        now = time.monotonic()
+        wait = max(0, self.next_request_time - now)
+        self.next_request_time = now + wait + self.delay
+        if wait == 0:
+            return
+        return task.deferLater(reactor, wait, lambda: None)
+
+
+class HostThrottleMiddleware:
+    """
+    Limits in-flight requests and the delay between requests for each host across
+    every spider running in the process. AutoThrottle and the downloader slots are
+    per spider, so without this many spiders crawling the same site (like the
+    Cuyahoga County boards) can add up to far more load than any one of them.
+
+    Slots are shared at the class level and created with the settings of the first
+    crawler that requests a host. HOST_THROTTLE_HOSTS maps a domain to overrides of
+    HOST_THROTTLE_CONCURRENCY and HOST_THROTTLE_DELAY, and all of its subdomains
+    share that domain's slot.
+    """
+
+    slots = {}
+
+    def __init__(self, crawler):
+        self.stats = crawler.stats
+        self.concurrency = crawler.settings.getint("HOST_THROTTLE_CONCURRENCY", 4)
+        self.delay = crawler.settings.getfloat("HOST_THROTTLE_DELAY", 0)
+        self.host_overrides = crawler.settings.getdict("HOST_THROTTLE_HOSTS")
+        self.pending = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("HOST_THROTTLE_ENABLED"):
+            raise NotConfigured
+        return cls(crawler)
+
+    def process_request(self, request, spider):
+        slot = self._get_slot(request)
+        self.stats.inc_value("host_throttle/request_count", spider=spider)
+        d = slot.acquire()
+        d.addCallback(self._acquired, request, slot)
+        return d
+
+    def process_response(self, request, response, spider):
+        self._release(request)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        self._release(request)
+
+    def _acquired(self, _, request, slot):
+        self.pending[request] = slot
+
+    def _release(self, request):
+        slot = self.pending.pop(request, None)
+        if slot is not None:
+            slot.release()
+
+    def _get_slot(self, request):
+        host = urlparse(request.url).hostname or ""
+        key, overrides = host, {}
+        for domain, domain_overrides in self.host_overrides.items():
+            if host == domain or host.endswith("." + domain):
+                key, overrides = domain, domain_overrides
+                break
+        if key not in self.slots:
+            self.slots[key] = HostSlot(
+                overrides.get("concurrency", self.concurrency),
+                overrides.get("delay", self.delay),
+            )
+        return self.slots[key]
+
+
+class SharedResponseMiddleware:
+    """
+    Downloads each URL at most once per process for requests with the
+    "shared_response" meta key set, handing the same response to every spider that
+    requests it. The Cuyahoga County boards are all listed on one CMS, so detail
+    pages are often linked from more than one board's listing. The first spider to
+    request a page downloads it, spiders requesting it while that download is in
+    flight wait for it, and later requests reuse the stored response. Each spider
+    still parses the response in its own callback, so the resulting meetings go to
+    that spider's feed.
+
+    Only 200 responses are shared. If the download fails, waiting requests are
+    downloaded separately. SHARED_RESPONSE_MAX_ENTRIES caps how many responses
+    are kept in memory.
+    """
+
+    responses = OrderedDict()
+    in_flight = {}
+
+    def __init__(self, crawler):
+        self.stats = crawler.stats
+        self.max_entries = crawler.settings.getint("SHARED_RESPONSE_MAX_ENTRIES", 500)
+        self.owned = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def process_request(self, request, spider):
+        if not request.meta.get("shared_response"):
+            return
+        key = request.url
+        if key in self.responses:
+            self.responses.move_to_end(key)
+            self.stats.inc_value("shared_response/hit", spider=spider)
+            return self._copy_response(self.responses[key], request)
+        if key in self.in_flight:
+            self.stats.inc_value("shared_response/coalesced", spider=spider)
+            d = defer.Deferred()
+            self.in_flight[key].append(d)
+            return d.addCallback(self._copy_response, request)
+        self.stats.inc_value("shared_response/miss", spider=spider)
+        self.in_flight[key] = []
+        self.owned[request] = key
+
+    def process_response(self, request, response, spider):
+        key = self.owned.pop(request, None)
+        if key is None:
+            return response
+        shared = response if response.status == 200 else None
+        if shared is not None:
+            self.responses[key] = shared
+            while len(self.responses) > self.max_entries:
+                self.responses.popitem(last=False)
+        self._notify_waiting(key, shared)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        key = self.owned.pop(request, None)
+        if key is not None:
+            self._notify_waiting(key, None)
+
+    def _notify_waiting(self, key, response):
+        for d in self.in_flight.pop(key, []):
+            d.callback(response)
+
+    def _copy_response(self, response, request):
+        """Copy a shared response for a request, or return None to download it"""
+        if response is None:
+            return
+        return response.replace(request=request, flags=response.flags + ["shared"])
+
+
+def open_past_meeting_cache(settings):
+    """Open the ResponseStore configured by the PAST_MEETING_CACHE_* settings. A max
+    size of 0 disables eviction."""
+    return ResponseStore.open(
+        data_path(settings.get("PAST_MEETING_CACHE_DIR"), createdir=True),
+        max_bytes=settings.getint("PAST_MEETING_CACHE_MAX_BYTES") or None,
+    )
+
+
+class PastMeetingCacheMiddleware:
+    """
+    Serves pages for meetings that have already happened from a persistent cache.
+    Requests opt in with the "past_meeting_cache" meta key, which spiders set on
+    detail pages. A cached page is only used if the latest meeting parsed from it
+    (recorded by PastMeetingCacheSpiderMiddleware, or provided by the listing in the
+    "meeting_start" meta key) started more than PAST_MEETING_CACHE_MIN_AGE_DAYS ago.
+    Listing pages and pages for upcoming meetings are always downloaded.
+    """
+
+    def __init__(self, crawler):
+        self.stats = crawler.stats
+        self.min_age = timedelta(
+            days=crawler.settings.getfloat("PAST_MEETING_CACHE_MIN_AGE_DAYS", 30)
+        )
+        self.store = open_past_meeting_cache(crawler.settings)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("PAST_MEETING_CACHE_ENABLED"):
+            raise NotConfigured
+        return cls(crawler)
+
+    def process_request(self, request, spider):
+        if not request.meta.get("past_meeting_cache"):
+            return
+        entry = self.store.get(request.url)
+        if entry and self._is_past(entry.get("meeting_start")):
+            self.stats.inc_value("past_meeting_cache/hit", spider=spider)
+            return self.store.retrieve_response(request.url)
+        self.stats.inc_value("past_meeting_cache/miss", spider=spider)
+
+    def process_response(self, request, response, spider):
+        if (
+            request.meta.get("past_meeting_cache")
+            and response.status == 200
+            and "cached" not in response.flags
+        ):
+            metadata = {}
+            if request.meta.get("meeting_start"):
+                metadata["meeting_start"] = request.meta["meeting_start"].isoformat()
+            self.store.store_response(request.url, response, **metadata)
+            self.stats.inc_value("past_meeting_cache/store", spider=spider)
+        return response
+
+    def spider_closed(self, spider):
+        evicted = self.store.save()
+        self.stats.set_value("past_meeting_cache/evicted", evicted, spider=spider)
+
+    def _is_past(self, meeting_start):
+        if not meeting_start:
+            return False
+        return datetime.fromisoformat(meeting_start) < datetime.now() - self.min_age
+
+
+class PastMeetingCacheSpiderMiddleware:
+    """
+    Records the latest start of the meetings parsed from each page requested with
+    the "past_meeting_cache" meta key, which PastMeetingCacheMiddleware uses to
+    decide whether the page can be served from the cache on later runs.
+    """
+
+    def __init__(self, crawler):
+        self.store = open_past_meeting_cache(crawler.settings)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("PAST_MEETING_CACHE_ENABLED"):
+            raise NotConfigured
+        return cls(crawler)
+
+    def process_spider_output(self, response, result, spider):
+        starts = []
+        for item in result:
+            if isinstance(item, Meeting) and item.get("start"):
+                starts.append(item["start"])
+            yield item
+        self._record_start(response, starts)
+
+    async def process_spider_output_async(self, response, result, spider):
+        starts = []
+        async for item in result:
+            if isinstance(item, Meeting) and item.get("start"):
+                starts.append(item["start"])
+            yield item
+        self._record_start(response, starts)
+
+    def _record_start(self, response, starts):
+        if starts and response.meta.get("past_meeting_cache"):
+            self.store.update(response.url, meeting_start=max(starts).isoformat())
+
+
+class ConditionalRequestMiddleware:
+    """
+    Revalidates listing pages with conditional requests instead of downloading them
+    in full on every run. Requests opt in with the "conditional_request" meta key.
+    The ETag and Last-Modified validators from the last 200 response for a URL are
+    kept in a persistent store along with the body, and sent back as If-None-Match
+    and If-Modified-Since. A 304 response is replaced with the stored page so the
+    spider parses it as usual, and the size of the stored body is added to the
+    "conditional_request/bytes_saved" stat.
+
+    This runs closest to the downloader so every other middleware sees the replayed
+    page rather than the 304.
+    """
+
+    def __init__(self, crawler):
+        self.stats = crawler.stats
+        self.store = ResponseStore.open(
+            data_path(crawler.settings.get("CONDITIONAL_REQUEST_DIR"), createdir=True),
+            max_bytes=crawler.settings.getint("CONDITIONAL_REQUEST_MAX_BYTES") or None,
+        )
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("CONDITIONAL_REQUEST_ENABLED"):
+            raise NotConfigured
+        return cls(crawler)
+
+    def process_request(self, request, spider):
+        if not self._is_conditional(request):
+            return
+        entry = self.store.get(request.url)
+        if entry is None:
+            return
+        headers = Headers(entry["headers"])
+        if headers.get("ETag"):
+            request.headers.setdefault("If-None-Match", headers["ETag"])
+        if headers.get("Last-Modified"):
+            request.headers.setdefault("If-Modified-Since", headers["Last-Modified"])
+
+    def process_response(self, request, response, spider):
+        if not self._is_conditional(request):
+            return response
+        if response.status == 304:
+            entry = self.store.get(request.url)
+            if entry is None:
+                return response
+            self.stats.inc_value("conditional_request/not_modified", spider=spider)
+            self.stats.inc_value(
+                "conditional_request/bytes_saved", entry["size"], spider=spider
+            )
+            return self.store.retrieve_response(request.url).replace(
+                request=request, flags=["revalidated"]
+            )
+        if response.status == 200 and (
+            response.headers.get("ETag") or response.headers.get("Last-Modified")
+        ):
+            self.stats.inc_value("conditional_request/store", spider=spider)
+            self.store.store_response(request.url, response)
+        return response
+
+    def spider_closed(self, spider):
+        evicted = self.store.save()
+        self.stats.set_value("conditional_request/evicted", evicted, spider=spider)
+
+    def _is_conditional(self, request):
+        return request.method == "GET" and request.meta.get("conditional_request")
+
+
+class ListingFingerprintMiddleware:
+    """
+    Replays the meetings from the last successful run when a listing page hasn't
+    changed, skipping the detail requests made from it. Listing requests opt in with
+    the "listing_fingerprint" meta key, and spiders set `listing_fingerprint_css` to
+    the section of the page that lists meetings. The text of that section is hashed
+    with whitespace normalized, and the meetings parsed from the listing and the
+    requests made from it are stored with the hash when the spider finishes without
+    errors of its own: callback or item pipeline errors, or requests that ran out
+    of retries. log_count/ERROR isn't used because it counts the errors of every
+    spider running in the process.
+
+    When the hash matches, the stored meetings are yielded with their status
+    recomputed instead of running the listing callback, along with the stored
+    requests for other fingerprinted listings linked from it (like the earlier
+    years of a board's meetings) so those are still checked. Entries older than
+    LISTING_FINGERPRINT_MAX_AGE_DAYS are ignored so detail pages are still crawled
+    every so often.
+    """
+
+    def __init__(self, crawler):
+        self.stats = crawler.stats
+        self.max_age = timedelta(
+            days=crawler.settings.getfloat("LISTING_FINGERPRINT_MAX_AGE_DAYS", 7)
+        )
+        self.path = data_path(
+            crawler.settings.get("LISTING_FINGERPRINT_DIR"), createdir=True
+        )
+        self.entries = {}
+        self.stored_entries = {}
+        self.errors = 0
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(self.count_error, signal=signals.spider_error)
+        crawler.signals.connect(self.count_error, signal=signals.item_error)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("LISTING_FINGERPRINT_ENABLED"):
+            raise NotConfigured
+        return cls(crawler)
+
+    def spider_opened(self, spider):
+        if os.path.exists(self._spider_path(spider)):
+            with open(self._spider_path(spider)) as f:
+                self.stored_entries = json.load(f)
+
+    def count_error(self, spider, **kwargs):
+        self.errors += 1
+
+    def spider_closed(self, spider, reason):
+        if (
+            reason != "finished"
+            or self.errors
+            or self.stats.get_value("retry/max_reached", spider=spider)
+        ):
+            return
+        if not self.entries:
+            return
+        tmp_path = self._spider_path(spider) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self._spider_path(spider))
+
+    def process_spider_output(self, response, result, spider):
+        replayed = self._replay(response, spider)
+        if replayed is not None:
+            yield from replayed
+            return
+        for output in result:
+            yield self._record(response, output)
+
+    async def process_spider_output_async(self, response, result, spider):
+        replayed = self._replay(response, spider)
+        if replayed is not None:
+            for item in replayed:
+                yield item
+            return
+        async for output in result:
+            yield self._record(response, output)
+
+    def _replay(self, response, spider):
+        """Return the stored meetings for an unchanged listing, otherwise None"""
+        if not response.meta.get("listing_fingerprint"):
+            return
+        fingerprint = self._fingerprint(response, spider)
+        if fingerprint is None:
+            return
+        stored = self.stored_entries.get(response.url)
+        if (
+            stored is not None
+            and stored["fingerprint"] == fingerprint
+            and datetime.fromisoformat(stored["stored_at"])
+            > datetime.now() - self.max_age
+        ):
+            self.stats.inc_value("listing_fingerprint/unchanged", spider=spider)
+            self.entries[response.url] = stored
+            return [self._load_meeting(item, spider) for item in stored["items"]] + [
+                self._load_request(request, spider)
+                for request in stored.get("requests", [])
+            ]
+        self.stats.inc_value("listing_fingerprint/changed", spider=spider)
+        self.entries[response.url] = {
+            "fingerprint": fingerprint,
+            "stored_at": datetime.now().isoformat(),
+            "items": [],
+            "requests": [],
+        }
+
+    def _record(self, response, output):
+        """Tag requests with the listing they came from and store its meetings"""
+        listing_url = response.meta.get("listing_fingerprint_url")
+        if response.meta.get("listing_fingerprint"):
+            listing_url = response.url
+        if listing_url not in self.entries:
+            return output
+        if isinstance(output, Request):
+            if output.meta.get("listing_fingerprint"):
+                # Other listings are replayed as requests, since their own entries
+                # decide whether they've changed
+                self.entries[listing_url].setdefault("requests", []).append(
+                    self._dump_request(output)
+                )
+            output.meta.setdefault("listing_fingerprint_url", listing_url)
+        elif isinstance(output, Meeting):
+            self.entries[listing_url]["items"].append(self._dump_meeting(output))
+        return output
+
+    def _fingerprint(self, response, spider):
+        css = getattr(spider, "listing_fingerprint_css", None)
+        if not css:
+            return
+        sections = response.css(css).xpath(".//text() | .//@href")
+        if not sections:
+            return
+        text = " ".join(" ".join(sections.getall()).split())
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _dump_meeting(self, meeting):
+        item = dict(meeting)
+        for key in ["start", "end"]:
+            if item.get(key):
+                item[key] = item[key].isoformat()
+        return item
+
+    def _dump_request(self, request):
+        return {
+            "url": request.url,
+            "callback": getattr(request.callback, "__name__", None),
+            "dont_filter": request.dont_filter,
+            "meta": {
+                key: value
+                for key, value in request.meta.items()
+                if isinstance(value, (str, int, float, bool))
+            },
+        }
+
+    def _load_request(self, request, spider):
+        callback = request["callback"]
+        return Request(
+            request["url"],
+            callback=getattr(spider, callback) if callback else None,
+            dont_filter=request["dont_filter"],
+            meta=request["meta"],
+        )
+
+    def _load_meeting(self, item, spider):
+        meeting = Meeting(**item)
+        for key in ["start", "end"]:
+            if meeting.get(key):
+                meeting[key] = datetime.fromisoformat(meeting[key])
+        if meeting.get("status") != CANCELLED:
+            meeting["status"] = spider._get_status(meeting)
+        return meeting
+
+    def _spider_path(self, spider):
+        return os.path.join(self.path, "{}.json".format(spider.name))
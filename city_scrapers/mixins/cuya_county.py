@@ -3,6 +3,8 @@ from datetime import datetime
 
 from city_scrapers_core.items import Meeting
 
+from city_scrapers.utils import in_listing_window
+
 
 class CuyaCountyMixin:
     timezone = "America/Detroit"
@@ -10,11 +12,17 @@ class CuyaCountyMixin:
         "name": "County Headquarters",
         "address": "2079 East 9th St Cleveland, OH 44115",
     }
+    listing_row_css = ".gridViewStyle tr"
 
     def parse(self, response):
-        for detail_link in response.css(
-            ".gridViewStyle td:nth-child(2) a::attr(href)"
-        ).extract():
+        """Follow detail links for meetings in the listing window, using the date
+        in the first column of each row"""
+        for row in response.css(self.listing_row_css):
+            detail_link = row.css("td:nth-child(2) a::attr(href)").extract_first()
+            if not detail_link or not in_listing_window(
+                self, row.css("td:nth-child(1)::text").extract_first()
+            ):
+                continue
             yield response.follow(
                 detail_link, callback=self._parse_detail, dont_filter=True
             )
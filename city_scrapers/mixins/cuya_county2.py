@@ -2,8 +2,12 @@ import re
 from datetime import datetime, time
 
 import dateutil.parser
+import scrapy
 from city_scrapers_core.items import Meeting
 
+from city_scrapers.utils import in_listing_window
+from city_scrapers.utils.year_archive import spider_years_in_horizon
+
 
 class CuyaCountyMixin2:
     """
@@ -14,21 +18,87 @@ class CuyaCountyMixin2:
     """
 
     timezone = "America/Detroit"
+    listing_fingerprint_css = ".bceventgrid"
+    # Set to ".bcyeargrid a" for boards that only list the current year's meetings
+    # and link to earlier years
+    year_link_css = None
+
+    def start_requests(self):
+        """
+        All of the boards are on the same county CMS, so listing and detail pages
+        are marked to be shared between spiders running in the same process. See
+        SharedResponseMiddleware. Meetings are replayed without crawling detail
+        pages if the listing is unchanged, see ListingFingerprintMiddleware.
+        """
+        for url in self.start_urls:
+            yield scrapy.Request(
+                url,
+                dont_filter=True,
+                meta={"shared_response": True, "listing_fingerprint": True},
+            )
 
     def parse(self, response):
-        links = response.css(
-            ".row.bceventgrid > table > tbody > tr > td:nth-child(2) > a::attr(href)"
-        ).extract()
-        for link in links:
-            yield response.follow(link, callback=self._parse_detail, dont_filter=True)
+        """Follow detail links for meetings in the listing window, using the date
+        in the first column of each row. See in_listing_window."""
+        listed_years = set()
+        for row in response.css(".row.bceventgrid > table > tbody > tr"):
+            link = row.css("td:nth-child(2) > a::attr(href)").extract_first()
+            date_str = row.css("td:nth-child(1)::text").extract_first()
+            listed_years.update(re.findall(r"\d{4}", date_str or ""))
+            if not link or not in_listing_window(self, date_str):
+                continue
+            yield response.follow(
+                link,
+                callback=self._parse_detail,
+                dont_filter=True,
+                meta={"shared_response": True, "past_meeting_cache": True},
+            )
+        if self.year_link_css and "year_listing" not in response.meta:
+            yield from self._parse_year_links(response, listed_years)
+
+    def _parse_year_links(self, response, listed_years):
+        """
+        Follow links to earlier years' listings, skipping years already shown on
+        this page and years outside the year archive horizon. See
+        spider_years_in_horizon.
+        """
+        year_links = {}
+        for year_link in response.css(self.year_link_css):
+            year = (year_link.css("::text").extract_first() or "").strip()
+            if year not in listed_years:
+                year_links.setdefault(year, year_link.attrib["href"])
+        for year in spider_years_in_horizon(self, list(year_links)):
+            yield response.follow(
+                year_links[year],
+                callback=self.parse,
+                meta={
+                    "shared_response": True,
+                    "listing_fingerprint": True,
+                    "year_listing": True,
+                },
+            )
 
     def _parse_detail(self, response):
         main_el = response.css("div.moudle")
+        if not main_el.css("[itemprop='startDate']"):
+            # Some listing links go to an intermediate page that links to the
+            # meeting's detail page
+            detail_link = response.css(".title a::attr(href)").extract_first()
+            if not detail_link:
+                raise ValueError(f"Unexpected detail page: {response.url}")
+            yield response.follow(
+                detail_link,
+                callback=self._parse_detail,
+                dont_filter=True,
+                meta={"shared_response": True, "past_meeting_cache": True},
+            )
+            return
         start_date, end_date = self._parse_dates(main_el)
+        title = self._parse_title(main_el)
         meeting = Meeting(
-            title=self._parse_title(main_el),
+            title=title,
             description=self._parse_description(main_el),
-            classification=self.classification,
+            classification=self._parse_classification(title),
             start=start_date,
             end=end_date,
             time_notes="",
@@ -45,6 +115,9 @@ class CuyaCountyMixin2:
         title_str = selector.css("h1.title::text").extract_first().strip()
         return title_str
 
+    def _parse_classification(self, title):
+        return self.classification
+
     def _parse_description(self, selector):
         texts = selector.css(".content ::text").extract()
         cleaned_texts = [text.strip() for text in texts if text.strip()]
@@ -14,5 +14,6 @@ EXTENSIONS = {
 }
 
 SPIDER_MIDDLEWARES = {
+    **SPIDER_MIDDLEWARES,  # noqa: F405
     "city_scrapers.middleware.CityScrapersWaybackMiddleware": 500,
 }
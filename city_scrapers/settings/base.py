@@ -35,11 +35,23 @@ ITEM_PIPELINES = {
 # See http://scrapy.readthedocs.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
     "scrapy.downloadermiddlewares.robotstxt.RobotsTxtMiddleware": 543,
+    "city_scrapers.middleware.PastMeetingCacheMiddleware": 920,
+    "city_scrapers.middleware.SharedResponseMiddleware": 940,
+    "city_scrapers.middleware.HostThrottleMiddleware": 950,
+    "city_scrapers.middleware.ConditionalRequestMiddleware": 960,
 }
 
-# Use commands from city_scrapers_core package
+# Maximum number of responses kept for requests shared between spiders
+SHARED_RESPONSE_MAX_ENTRIES = 500
 
-COMMANDS_MODULE = "city_scrapers_core.commands"
+# Use project commands, which include the commands from city_scrapers_core
+
+COMMANDS_MODULE = "city_scrapers.commands"
+
+# Number of spiders the crawlall command runs at the same time
+CITY_SCRAPERS_MAX_CONCURRENT_SPIDERS = int(
+    os.getenv("CITY_SCRAPERS_MAX_CONCURRENT_SPIDERS", 8)
+)
 
 EXTENSIONS = {
     "scrapy.extensions.closespider.CloseSpider": None,
@@ -55,6 +67,70 @@ AUTOTHROTTLE_TARGET_CONCURRENCY = float(
     os.getenv("AUTOTHROTTLE_TARGET_CONCURRENCY", 1.0)
 )
 
-SPIDER_MIDDLEWARES = {}
+# Share a per-host budget of in-flight requests and a minimum delay between
+# requests across all spiders in a process, since AutoThrottle is per spider
+HOST_THROTTLE_ENABLED = True
+HOST_THROTTLE_CONCURRENCY = int(os.getenv("HOST_THROTTLE_CONCURRENCY", 4))
+HOST_THROTTLE_DELAY = float(os.getenv("HOST_THROTTLE_DELAY", 0.25))
+HOST_THROTTLE_HOSTS = {
+    "cuyahogacounty.gov": {"concurrency": 2, "delay": 1.0},
+    "cuyahogacounty.us": {"concurrency": 2, "delay": 1.0},
+}
+
+SPIDER_MIDDLEWARES = {
+    "city_scrapers.middleware.PastMeetingCacheSpiderMiddleware": 600,
+    "city_scrapers.middleware.ListingFingerprintMiddleware": 650,
+}
+
+# Serve detail pages for meetings that happened more than
+# PAST_MEETING_CACHE_MIN_AGE_DAYS ago from a persistent cache
+PAST_MEETING_CACHE_ENABLED = True
+PAST_MEETING_CACHE_DIR = "past_meeting_cache"
+PAST_MEETING_CACHE_MIN_AGE_DAYS = float(
+    os.getenv("PAST_MEETING_CACHE_MIN_AGE_DAYS", 30)
+)
+PAST_MEETING_CACHE_MAX_BYTES = int(
+    os.getenv("PAST_MEETING_CACHE_MAX_BYTES", 200 * 1024 * 1024)
+)
+
+# Revalidate listing pages marked with the "conditional_request" meta key using the
+# ETag and Last-Modified headers stored from the previous run
+CONDITIONAL_REQUEST_ENABLED = True
+CONDITIONAL_REQUEST_DIR = "conditional_request"
+CONDITIONAL_REQUEST_MAX_BYTES = int(
+    os.getenv("CONDITIONAL_REQUEST_MAX_BYTES", 50 * 1024 * 1024)
+)
+
+# Replay the meetings from the last successful run for listing pages marked with the
+# "listing_fingerprint" meta key that haven't changed
+LISTING_FINGERPRINT_ENABLED = True
+LISTING_FINGERPRINT_DIR = "listing_fingerprint"
+LISTING_FINGERPRINT_MAX_AGE_DAYS = float(
+    os.getenv("LISTING_FINGERPRINT_MAX_AGE_DAYS", 7)
+)
+
+# Only request detail pages for meetings listed within LISTING_WINDOW_DAYS of today,
+# or upcoming. Set LISTING_BACKFILL to request every meeting listed.
+LISTING_WINDOW_DAYS = float(os.getenv("LISTING_WINDOW_DAYS", 180))
+LISTING_BACKFILL = os.getenv("LISTING_BACKFILL", "False")
+
+# Year-paginated archives are crawled for the current year and this many previous
+# years, or every year with LISTING_BACKFILL. See years_in_horizon.
+YEAR_ARCHIVE_YEARS = int(os.getenv("YEAR_ARCHIVE_YEARS", 1))
+
+# Worker processes, seconds per document and page limit (0 for every page) for PDF
+# text extraction, which runs outside of the reactor. See PdfExtractor.
+PDF_EXTRACTION_WORKERS = int(os.getenv("PDF_EXTRACTION_WORKERS", 2))
+PDF_EXTRACTION_TIMEOUT = float(os.getenv("PDF_EXTRACTION_TIMEOUT", 60))
+PDF_EXTRACTION_MAX_PAGES = int(os.getenv("PDF_EXTRACTION_MAX_PAGES", 0))
+
+# Cache extracted PDF text by the hash of the PDF and the extraction options
+PDF_TEXT_CACHE_ENABLED = True
+PDF_TEXT_CACHE_DIR = "pdf_text_cache"
+PDF_TEXT_CACHE_MAX_BYTES = int(os.getenv("PDF_TEXT_CACHE_MAX_BYTES", 20 * 1024 * 1024))
+
+# Manifest written by scripts/probe_render.py of URL patterns that need a browser
+# ("browser") or can be fetched with a plain request ("http")
+RENDER_ROUTES_PATH = os.getenv("RENDER_ROUTES_PATH", "render_routes.json")
 
 logging.getLogger("pdfminer").propagate = False
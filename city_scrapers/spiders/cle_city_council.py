@@ -1,5 +1,6 @@
 from collections import defaultdict
 
+import scrapy
 from city_scrapers_core.constants import CITY_COUNCIL, COMMITTEE
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import LegistarSpider
@@ -12,6 +13,13 @@ class CleCityCouncilSpider(LegistarSpider):
     start_urls = ["https://cityofcleveland.legistar.com/Calendar.aspx"]
     link_types = []
 
+    def start_requests(self):
+        """Revalidate the calendar page, see ConditionalRequestMiddleware"""
+        for url in self.start_urls:
+            yield scrapy.Request(
+                url, dont_filter=True, meta={"conditional_request": True}
+            )
+
     def _parse_legistar_events(self, response):
         events_table = response.css("table.rgMasterTable")[0]
 
@@ -34,7 +34,9 @@ class CleCpcSpider(CityScrapersSpider):
                 unique_links.append(link)
 
         for link in unique_links:
-            yield response.follow(link, callback=self._parse_detail)
+            yield response.follow(
+                link, callback=self._parse_detail, meta={"past_meeting_cache": True}
+            )
 
     def _parse_detail(self, response):
         """
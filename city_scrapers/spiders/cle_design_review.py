@@ -2,6 +2,7 @@ import re
 import time
 from datetime import datetime, timedelta
 
+import scrapy
 from city_scrapers_core.constants import ADVISORY_COMMITTEE
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
@@ -17,6 +18,20 @@ class CleDesignReviewSpider(CityScrapersSpider):
         "https://planning.clevelandohio.gov/designreview/schedule.php"  # noqa
     ]
     description = "Cleveland Planning Commission conducts virtual meetings in a limited capacity using the WebEx Platform. To request access to WebEx meetings, email "  # noqa
+    listing_fingerprint_css = "div.mt-3, div.mt-3 + div.dropdown"
+
+    def start_requests(self):
+        """
+        Revalidate the schedule page, see ConditionalRequestMiddleware, and replay
+        meetings if the committee listings are unchanged, see
+        ListingFingerprintMiddleware
+        """
+        for url in self.start_urls:
+            yield scrapy.Request(
+                url,
+                dont_filter=True,
+                meta={"conditional_request": True, "listing_fingerprint": True},
+            )
 
     def parse(self, response):
         """
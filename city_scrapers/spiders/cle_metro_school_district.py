@@ -1,6 +1,7 @@
 import re
 from datetime import datetime
 
+import scrapy
 from city_scrapers_core.constants import BOARD, FORUM
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
@@ -13,6 +14,13 @@ class CleMetroSchoolDistrictSpider(CityScrapersSpider):
     start_urls = ["https://www.boarddocs.com/oh/cmsd/board.nsf/XML-ActiveMeetings"]
     custom_settings = {"ROBOTSTXT_OBEY": False}
 
+    def start_requests(self):
+        """Revalidate the meetings feed, see ConditionalRequestMiddleware"""
+        for url in self.start_urls:
+            yield scrapy.Request(
+                url, dont_filter=True, meta={"conditional_request": True}
+            )
+
     def parse(self, response):
         """
         `parse` should always `yield` Meeting items.
@@ -1,10 +1,17 @@
 from collections import defaultdict
 from datetime import datetime
 
+import scrapy
 from city_scrapers_core.constants import BOARD
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.utils.year_archive import (
+    parse_year,
+    spider_years_in_horizon,
+    year_horizon,
+)
+
 
 class CleZoningAppealsSpider(CityScrapersSpider):
     name = "cle_zoning_appeals"
@@ -16,14 +23,29 @@ class CleZoningAppealsSpider(CityScrapersSpider):
         "address": "601 Lakeside Ave, Room 516, Cleveland OH 44114",
     }
 
+    base_url = "http://planning.city.cleveland.oh.us/bza/cpc.html"
+
     @property
     def start_urls(self):
-        base_url = "http://planning.city.cleveland.oh.us/bza/cpc.html"
-        return [
-            base_url,
-            "{}?ID={}&btn=Change+Year".format(base_url, datetime.now().year - 1),
+        """The current year's page and previous years' pages in the horizon, which
+        are requested together. See years_in_horizon."""
+        this_year = datetime.now().year
+        previous_years, _ = year_horizon(self)
+        return [self.base_url] + [
+            self._year_url(year)
+            for year in range(this_year - 1, this_year - previous_years - 1, -1)
         ]
 
+    def _year_url(self, year):
+        return "{}?ID={}&btn=Change+Year".format(self.base_url, year)
+
+    def start_requests(self):
+        """Revalidate the listing pages, see ConditionalRequestMiddleware"""
+        for url in self.start_urls:
+            yield scrapy.Request(
+                url, dont_filter=True, meta={"conditional_request": True}
+            )
+
     def parse(self, response):
         """
         `parse` should always `yield` Meeting items.
@@ -31,6 +53,8 @@ class CleZoningAppealsSpider(CityScrapersSpider):
         Change the `_parse_title`, `_parse_start`, etc methods to fit your scraping
         needs.
         """
+        if response.url == self.base_url:
+            yield from self._parse_year_requests(response)
         materials_map = self._parse_materials(response)
         for item in response.css("#jumpMenu option"):
             start = self._parse_start(item)
@@ -52,6 +76,17 @@ class CleZoningAppealsSpider(CityScrapersSpider):
 
             yield meeting
 
+    def _parse_year_requests(self, response):
+        """Request the years in the horizon that aren't start URLs, like older
+        years when backfilling. The base URL lists the current year."""
+        start_urls = self.start_urls
+        years = response.css("select#ID option::attr(value)").extract()
+        for year in spider_years_in_horizon(self, years):
+            url = self._year_url(year)
+            if parse_year(year) in [None, datetime.now().year] or url in start_urls:
+                continue
+            yield scrapy.Request(url, meta={"conditional_request": True})
+
     def _parse_start(self, item):
         """Parse start datetime as a naive datetime object."""
         date_str = item.css("*::text").extract_first()
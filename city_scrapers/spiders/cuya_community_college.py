@@ -1,12 +1,22 @@
 import re
 from datetime import datetime
-from io import BytesIO, StringIO
 
 from city_scrapers_core.constants import BOARD
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
-from pdfminer.high_level import extract_text_to_fp
-from pdfminer.layout import LAParams
+from scrapy.utils.defer import maybe_deferred_to_future
+
+from city_scrapers.utils.pdf import PdfExtractor, extract_pdf_text, find_in_pdf_pages
+
+LAPARAMS = {"line_margin": 5.0}
+
+
+def match_agenda_date(page_text):
+    """Return the first date in a page of the agenda. Defined at the module level
+    so it can be sent to PdfExtractor workers."""
+    date_match = re.search(r"[A-Z][a-z]{2,8} \d{1,2},? \d{4}", page_text)
+    if date_match:
+        return date_match.group()
 
 
 class CuyaCommunityCollegeSpider(CityScrapersSpider):
@@ -38,31 +48,47 @@ class CuyaCommunityCollegeSpider(CityScrapersSpider):
             )
         else:
             yield response.follow(
-                self.calendar_url, callback=self._parse_calendar, dont_filter=True
+                self.calendar_url, callback=self._parse_calendar_res, dont_filter=True
             )
 
-    def _parse_agenda_res(self, response):
-        self._parse_agenda(response)
+    async def _parse_agenda_res(self, response):
+        extractor = PdfExtractor.from_settings(self.settings)
+        date_str = await maybe_deferred_to_future(
+            extractor.find_in_pages(
+                response.body, match_agenda_date, LAPARAMS, stats=self.crawler.stats
+            )
+        )
+        self._parse_agenda(response, date_str)
         yield response.follow(
-            self.calendar_url, callback=self._parse_calendar, dont_filter=True
+            self.calendar_url, callback=self._parse_calendar_res, dont_filter=True
+        )
+
+    async def _parse_calendar_res(self, response):
+        pdf_text = await self._extract_pdf_text(response)
+        for meeting in self._parse_calendar(response, pdf_text):
+            yield meeting
+
+    async def _extract_pdf_text(self, response):
+        """Extract PDF text in the shared worker pool, or read it from the cache"""
+        extractor = PdfExtractor.from_settings(self.settings)
+        return await maybe_deferred_to_future(
+            extractor.extract_text(
+                response.body, laparams=LAPARAMS, stats=self.crawler.stats
+            )
         )
 
-    def _parse_agenda(self, response):
-        lp = LAParams(line_margin=5.0)
-        out_str = StringIO()
-        extract_text_to_fp(BytesIO(response.body), out_str, laparams=lp)
-        pdf_text = out_str.getvalue()
-        date_match = re.search(r"[A-Z][a-z]{2,8} \d{1,2},? \d{4}", pdf_text)
-        if date_match:
-            date_str = date_match.group().replace(",", "")
-            date_obj = datetime.strptime(date_str, "%B %d %Y").date()
+    def _parse_agenda(self, response, date_str=None):
+        """Map the agenda to its date, which is read from the first page with one
+        unless provided"""
+        if date_str is None:
+            date_str = find_in_pdf_pages(response.body, match_agenda_date, LAPARAMS)
+        if date_str:
+            date_obj = datetime.strptime(date_str.replace(",", ""), "%B %d %Y").date()
             self.agenda_map[date_obj] = [{"title": "Agenda", "href": response.url}]
 
-    def _parse_calendar(self, response):
-        lp = LAParams(line_margin=5.0)
-        out_str = StringIO()
-        extract_text_to_fp(BytesIO(response.body), out_str, laparams=lp)
-        pdf_text = out_str.getvalue()
+    def _parse_calendar(self, response, pdf_text=None):
+        if pdf_text is None:
+            pdf_text = extract_pdf_text(response.body, laparams=LAPARAMS)
         split_dates = re.split(
             r"([A-Z][a-z]{2,8}\s+\d{1,2}, \d{4}[ \n$])", pdf_text, flags=re.M
         )
@@ -24,7 +24,11 @@ class CuyaElectionsSpider(CityScrapersSpider):
             # many links on the page are for community events,
             # we only want board meetings
             if "meeting" in link.css("::text").get().lower():
-                yield response.follow(link.attrib["href"], callback=self._parse_detail)
+                yield response.follow(
+                    link.attrib["href"],
+                    callback=self._parse_detail,
+                    meta={"past_meeting_cache": True},
+                )
 
     def _parse_detail(self, item) -> Meeting:
         start, end = self._parse_start_end(item)
@@ -19,7 +19,10 @@ class CuyaMetrohealthSpider(CityScrapersSpider):
     def parse(self, response):
         for detail_link in response.css(".gen-content li a::attr(href)").extract():
             yield response.follow(
-                detail_link, callback=self._parse_detail, dont_filter=True
+                detail_link,
+                callback=self._parse_detail,
+                dont_filter=True,
+                meta={"past_meeting_cache": True},
             )
 
     def _parse_detail(self, response):
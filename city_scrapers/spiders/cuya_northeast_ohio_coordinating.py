@@ -6,6 +6,11 @@ from city_scrapers_core.constants import ADVISORY_COMMITTEE, BOARD, COMMITTEE
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.utils.render_routes import RenderRoutes
+from city_scrapers.utils.resource_blocking import ResourcePolicy
+
+RESOURCE_POLICY = ResourcePolicy.from_env()
+
 
 class CuyaNortheastOhioCoordinatingSpider(CityScrapersSpider):
     name = "cuya_northeast_ohio_coordinating"
@@ -23,6 +28,11 @@ class CuyaNortheastOhioCoordinatingSpider(CityScrapersSpider):
             "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
         },
         "PLAYWRIGHT_BROWSER_TYPE": "firefox",
+        # Skip images, fonts, analytics and video embeds. Set by path so that
+        # copying the settings doesn't copy the policy and its counts.
+        "PLAYWRIGHT_ABORT_REQUEST": (
+            "city_scrapers.spiders.cuya_northeast_ohio_coordinating.RESOURCE_POLICY"
+        ),
         # other scrapy settings to help avoid bot detection
         "DOWNLOAD_DELAY": 1,
         "ROBOTSTXT_OBEY": False,
@@ -34,18 +44,32 @@ class CuyaNortheastOhioCoordinatingSpider(CityScrapersSpider):
         Parse the agency's meeting materials page. We use a headless
         browser (scrapy-playwright) to handle our requests because
         the city uses Cloudflare to detect and block requests from obvious
-        bots.
+        bots. URLs routed to "http" in the render routes manifest skip the browser.
         """
         for url in self.start_urls:
-            yield scrapy.Request(url, callback=self.parse, meta={"playwright": True})
+            yield scrapy.Request(
+                url, callback=self.parse, meta={"playwright": self._use_browser(url)}
+            )
+
+    def _use_browser(self, url):
+        if not hasattr(self, "render_routes"):
+            path = None
+            if hasattr(self, "crawler"):
+                path = self.settings.get("RENDER_ROUTES_PATH")
+            self.render_routes = RenderRoutes.load(path)
+        return self.render_routes.uses_browser(url)
+
+    def closed(self, reason):
+        RESOURCE_POLICY.record_stats(self.crawler.stats)
 
     def parse(self, response):
         for link in response.css(".title_column a")[1:]:
-            yield response.follow(
-                link.attrib["href"],
+            url = response.urljoin(link.attrib["href"])
+            yield scrapy.Request(
+                url,
                 callback=self._parse_detail,
                 dont_filter=True,
-                meta={"playwright": True},
+                meta={"playwright": self._use_browser(url)},
             )
 
     def _parse_detail(self, response):
@@ -13,14 +13,7 @@ class CuyaPublicDefendersCommissionSpider(CuyaCountyMixin, CityScrapersSpider):
         "address": "310 Lakeside Ave, Suite 400, Cleveland, OH 44113",
     }
     classification = COMMISSION
-
-    def parse(self, response):
-        for detail_link in response.css(
-            ".SearchResults td:nth-child(2) a::attr(href)"
-        ).extract():
-            yield response.follow(
-                detail_link, callback=self._parse_detail, dont_filter=True
-            )
+    listing_row_css = ".SearchResults tr"
 
     def _parse_title(self, response):
         return "Public Defenders Commission"
@@ -1 +1,3 @@
+from .listing_window import in_listing_window  # noqa
 from .meeting_date_calculator import calculate_upcoming_meeting_days  # noqa
+from .response_store import ResponseStore  # noqa
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+from scrapy.settings import BaseSettings
+
+
+def parse_backfill(value):
+    """
+    Parse a LISTING_BACKFILL value the way Scrapy's Settings.getbool does, for
+    Harambe scrapers reading it from the environment, so they backfill exactly
+    when the spiders do. "1", "0", "true", "false", "True" and "False" are
+    accepted, and anything else raises ValueError.
+    """
+    return BaseSettings({"LISTING_BACKFILL": value}).getbool("LISTING_BACKFILL")
+
+
+def in_listing_window(spider, date_str, date_format="%m/%d/%Y"):
+    """
+    Checks whether a meeting date shown on a listing page falls within the window
+    of meetings that should be crawled, so detail pages for old meetings aren't
+    requested. The window starts LISTING_WINDOW_DAYS before today and includes all
+    upcoming meetings.
+
+    Every meeting is in the window if LISTING_BACKFILL is set, if the window is 0
+    days, if the spider isn't bound to a crawler (and so has no settings), or if
+    the date can't be parsed.
+
+    Parameters:
+    spider (Spider): the spider requesting the meeting
+    date_str (str): the date shown on the listing
+    date_format (str): the format of date_str
+
+    Returns:
+    bool: whether the meeting's detail page should be requested
+    """
+    settings = getattr(spider, "settings", None)
+    if settings is None or settings.getbool("LISTING_BACKFILL"):
+        return True
+    window_days = settings.getfloat("LISTING_WINDOW_DAYS")
+    if not window_days:
+        return True
+    try:
+        meeting_date = datetime.strptime((date_str or "").strip(), date_format)
+    except ValueError:
+        return True
+    return meeting_date.date() >= (datetime.now() - timedelta(days=window_days)).date()
@@ -0,0 +1,315 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO, StringIO
+
+from pdfminer.high_level import extract_pages, extract_text_to_fp
+from pdfminer.layout import LAParams, LTTextContainer
+from scrapy.utils.project import data_path
+from twisted.internet import defer
+
+# Separates pages in cached text, as in pdfminer's extract_text_to_fp output
+PAGE_BREAK = "\f"
+
+
+def extract_pdf_text(body, laparams=None, max_pages=0, timeout=None):
+    """
+    Extract the text of a PDF with pdfminer.
+
+    Parameters:
+    body (bytes): the PDF file
+    laparams (dict): keyword arguments for pdfminer's LAParams
+    max_pages (int): the maximum number of pages to extract, or 0 for all pages
+    timeout (float): seconds to allow for the extraction before raising
+        TimeoutError. Only used in a process's main thread, like in PdfExtractor
+        workers.
+
+    Returns:
+    str: the text of the PDF
+    """
+    with _time_limit(timeout):
+        out_str = StringIO()
+        extract_text_to_fp(
+            BytesIO(body),
+            out_str,
+            laparams=LAParams(**(laparams or {})),
+            maxpages=max_pages,
+        )
+        return out_str.getvalue()
+
+
+def find_in_pdf_pages(body, predicate, laparams=None, max_pages=0, timeout=None):
+    """
+    Lay out a PDF one page at a time, stopping at the first page where a predicate
+    matches. Useful when only a detail near the start of a document is needed, like
+    the date of an agenda, since later pages are never parsed.
+
+    Parameters:
+    body (bytes): the PDF file
+    predicate (callable): called with the text of each page, returning a truthy
+        value when it matches. Must be picklable (defined at the top level of a
+        module) to be used with PdfExtractor.
+    laparams (dict): keyword arguments for pdfminer's LAParams
+    max_pages (int): the maximum number of pages to check, or 0 for all pages
+    timeout (float): seconds to allow before raising TimeoutError, as in
+        extract_pdf_text
+
+    Returns:
+    the first truthy value returned by the predicate, or None
+    """
+    with _time_limit(timeout):
+        for page_text in _page_texts(body, laparams, max_pages):
+            result = predicate(page_text)
+            if result:
+                return result
+
+
+def read_pdf_pages_until(body, predicate, laparams=None, max_pages=0, timeout=None):
+    """
+    Like find_in_pdf_pages, but return the text of every page laid out: the pages up
+    to and including the first one where the predicate matches, or every page if
+    none does. PdfExtractor caches these so a search can be repeated without
+    layout analysis.
+
+    Returns:
+    list: the text of each page
+    """
+    pages = []
+    with _time_limit(timeout):
+        for page_text in _page_texts(body, laparams, max_pages):
+            pages.append(page_text)
+            if predicate(page_text):
+                break
+    return pages
+
+
+def _page_texts(body, laparams, max_pages):
+    for page in extract_pages(
+        BytesIO(body), laparams=LAParams(**(laparams or {})), maxpages=max_pages
+    ):
+        yield "".join(
+            element.get_text()
+            for element in page
+            if isinstance(element, LTTextContainer)
+        )
+
+
+def _first_match(pages, predicate):
+    for page_text in pages:
+        result = predicate(page_text)
+        if result:
+            return result
+
+
+@contextmanager
+def _time_limit(timeout):
+    if timeout:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("PDF extraction timed out")
+
+
+class PdfTextCache:
+    """
+    On-disk cache of extracted PDF text, keyed by the SHA-256 of the PDF along with
+    the extraction options, so a PDF that hasn't changed doesn't need layout
+    analysis again. Each entry is a text file, and its modification time is
+    updated on reads so the least recently used entries are removed first once the
+    cache is over `max_bytes`.
+    """
+
+    def __init__(self, path, max_bytes=None):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def key(self, body, laparams=None, max_pages=0, predicate=None):
+        """The key for a PDF's text. Text from a page-bounded search depends on where
+        it stopped, so it's keyed by the predicate as well."""
+        options = [laparams or {}, max_pages]
+        if predicate is not None:
+            options.append(f"{predicate.__module__}.{predicate.__qualname__}")
+        options = json.dumps(options, sort_keys=True)
+        return hashlib.sha256(
+            hashlib.sha256(body).digest() + options.encode()
+        ).hexdigest()
+
+    def get(self, key):
+        """Return the cached text for a key, or None"""
+        entry_path = self._entry_path(key)
+        if not os.path.exists(entry_path):
+            return None
+        os.utime(entry_path)
+        with open(entry_path, encoding="utf-8") as f:
+            return f.read()
+
+    def set(self, key, text):
+        """Store the text for a key, returning the number of entries evicted"""
+        entry_path = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        tmp_path = entry_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, entry_path)
+        return self._evict()
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return 0
+        entries = []
+        for dirpath, _, filenames in os.walk(self.path):
+            for filename in filenames:
+                entry_stat = os.stat(os.path.join(dirpath, filename))
+                entries.append(
+                    (
+                        entry_stat.st_mtime,
+                        entry_stat.st_size,
+                        os.path.join(dirpath, filename),
+                    )
+                )
+        total_bytes = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            os.remove(entry_path)
+            total_bytes -= size
+            evicted += 1
+        return evicted
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, key[:2], key + ".txt")
+
+
+class PdfExtractor:
+    """
+    Runs PDF text extraction in a pool of worker processes so that layout analysis
+    doesn't block the reactor, and every other spider running in the process, while
+    a PDF is parsed. Extractors are shared by configuration through
+    `PdfExtractor.from_settings`, so spiders in the same process share one pool.
+
+    The pool is configured with PDF_EXTRACTION_WORKERS, PDF_EXTRACTION_TIMEOUT
+    (seconds per document) and PDF_EXTRACTION_MAX_PAGES (0 extracts every page).
+    If PDF_TEXT_CACHE_ENABLED is set, text is read from and written to a
+    PdfTextCache in PDF_TEXT_CACHE_DIR.
+    """
+
+    _extractors = {}
+
+    def __init__(self, workers=2, timeout=None, max_pages=0, cache=None):
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.cache = cache
+        # Forking a process with the reactor's threads running isn't safe
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Return the extractor for the PDF_EXTRACTION_* settings"""
+        config = (
+            settings.getint("PDF_EXTRACTION_WORKERS", 2),
+            settings.getfloat("PDF_EXTRACTION_TIMEOUT") or None,
+            settings.getint("PDF_EXTRACTION_MAX_PAGES"),
+            settings.getbool("PDF_TEXT_CACHE_ENABLED")
+            and settings.get("PDF_TEXT_CACHE_DIR"),
+            settings.getint("PDF_TEXT_CACHE_MAX_BYTES") or None,
+        )
+        if config not in cls._extractors:
+            workers, timeout, max_pages, cache_dir, cache_max_bytes = config
+            cache = None
+            if cache_dir:
+                cache = PdfTextCache(
+                    data_path(cache_dir, createdir=True), max_bytes=cache_max_bytes
+                )
+            cls._extractors[config] = cls(workers, timeout, max_pages, cache=cache)
+        return cls._extractors[config]
+
+    def extract_text(self, body, laparams=None, stats=None):
+        """Returns a Deferred that fires with the text of a PDF, or fails with
+        TimeoutError if extraction takes longer than the timeout. Cache activity is
+        counted in the `stats` collector if provided."""
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(body, laparams, self.max_pages)
+            text = self.cache.get(key)
+            if stats is not None:
+                stats.inc_value(
+                    "pdf_text_cache/{}".format("miss" if text is None else "hit")
+                )
+            if text is not None:
+                return defer.succeed(text)
+
+        d = self._submit(extract_pdf_text, body, laparams, self.max_pages)
+        if key is not None:
+            d.addCallback(self._cache_text, key, stats)
+        return d
+
+    def find_in_pages(self, body, predicate, laparams=None, stats=None):
+        """Returns a Deferred that fires with the first match of a predicate on the
+        text of each page, laying out only the pages up to the match. See
+        find_in_pdf_pages. With a cache, the text of the pages laid out is stored
+        under the PDF, the predicate and the page limit, and the predicate is run on
+        it again instead of the PDF."""
+        if self.cache is None:
+            return self._submit(
+                find_in_pdf_pages, body, predicate, laparams, self.max_pages
+            )
+
+        key = self.cache.key(body, laparams, self.max_pages, predicate=predicate)
+        text = self.cache.get(key)
+        if stats is not None:
+            stats.inc_value(
+                "pdf_text_cache/{}".format("miss" if text is None else "hit")
+            )
+        if text is not None:
+            return defer.succeed(_first_match(text.split(PAGE_BREAK), predicate))
+
+        d = self._submit(
+            read_pdf_pages_until, body, predicate, laparams, self.max_pages
+        )
+        d.addCallback(
+            lambda pages: self._cache_text(PAGE_BREAK.join(pages), key, stats)
+        )
+        d.addCallback(lambda text: _first_match(text.split(PAGE_BREAK), predicate))
+        return d
+
+    def _submit(self, fn, *args):
+        """Run a function in the pool with the timeout, returning a Deferred"""
+        from twisted.internet import reactor
+
+        d = defer.Deferred()
+        future = self.executor.submit(fn, *args, timeout=self.timeout)
+        future.add_done_callback(
+            lambda f: reactor.callFromThread(self._fire_deferred, d, f)
+        )
+        return d
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def _cache_text(self, text, key, stats):
+        evicted = self.cache.set(key, text)
+        if stats is not None:
+            stats.inc_value("pdf_text_cache/store")
+            stats.inc_value("pdf_text_cache/evicted", evicted)
+        return text
+
+    def _fire_deferred(self, d, future):
+        exception = future.exception()
+        if exception is not None:
+            d.errback(exception)
+        else:
+            d.callback(future.result())
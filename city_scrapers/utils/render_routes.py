@@ -0,0 +1,89 @@
+import json
+import os
+from datetime import datetime
+from fnmatch import fnmatch
+from urllib.parse import urlparse
+
+HTTP = "http"
+BROWSER = "browser"
+# Used by Harambe scrapers, which don't have Scrapy settings
+RENDER_ROUTES_PATH = os.getenv("RENDER_ROUTES_PATH", "render_routes.json")
+
+
+def url_pattern(url):
+    """
+    The pattern a URL is grouped under in a routing manifest: its scheme, host and
+    first path segment, so pages of the same kind on a site share a route
+    """
+    parsed = urlparse(url)
+    segments = [segment for segment in parsed.path.split("/") if segment]
+    if len(segments) > 1:
+        return f"{parsed.scheme}://{parsed.netloc}/{segments[0]}/*"
+    return f"{parsed.scheme}://{parsed.netloc}/*"
+
+
+class RenderRoutes:
+    """
+    A routing manifest mapping URL patterns (shell-style wildcards) to how pages
+    should be fetched: "http" for a plain request, or "browser" where JavaScript
+    changes what the extractor reads. It's written by scripts/probe_render.py, and
+    URLs without a matching route use the scraper's default.
+    """
+
+    def __init__(self, routes=None, path=None):
+        self.routes = routes or {}
+        self.path = path
+
+    @classmethod
+    def load(cls, path):
+        """Load a manifest, or return an empty one if the file doesn't exist"""
+        routes = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                routes = json.load(f).get("routes", {})
+        return cls(routes, path=path)
+
+    def fetch_for(self, url, default=BROWSER):
+        """Return "http" or "browser" for a URL. The longest matching pattern wins."""
+        matches = [pattern for pattern in self.routes if fnmatch(url, pattern)]
+        if not matches:
+            return default
+        return self.routes[max(matches, key=len)]["fetch"]
+
+    def uses_browser(self, url, default=True):
+        return self.fetch_for(url, BROWSER if default else HTTP) == BROWSER
+
+    def set(self, pattern, fetch, **details):
+        self.routes[pattern] = {
+            "fetch": fetch,
+            "checked_at": datetime.now().isoformat(timespec="seconds"),
+            **details,
+        }
+
+    def set_probe(self, pattern, name, fetch, samples=0, differences=()):
+        """
+        Record what probing one scraper found for a pattern. Scrapers can share a
+        pattern, so each one's result is kept under "probes" and the route uses a
+        browser if any of them needs one.
+        """
+        probes = self.routes.get(pattern, {}).get("probes", {})
+        probes[name] = {
+            "fetch": fetch,
+            "samples": samples,
+            "differences": sorted(differences),
+        }
+        self.set(
+            pattern,
+            BROWSER if any(p["fetch"] == BROWSER for p in probes.values()) else HTTP,
+            samples=sum(p["samples"] for p in probes.values()),
+            differences=sorted({d for p in probes.values() for d in p["differences"]}),
+            probes=probes,
+        )
+
+    def save(self, path=None):
+        path = path or self.path
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"routes": self.routes}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, path)
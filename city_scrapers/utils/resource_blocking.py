@@ -0,0 +1,130 @@
+import os
+from collections import Counter
+from fnmatch import fnmatch
+from urllib.parse import urlparse
+
+# Resource types that scrapers never read. Stylesheets aren't included by default
+# because hiding elements with CSS changes the text returned by inner_text().
+BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+# Analytics, ads and video embeds. A host also matches its subdomains.
+BLOCKED_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "connect.facebook.com",
+    "hotjar.com",
+    "youtube.com",
+    "youtube-nocookie.com",
+    "ytimg.com",
+    "vimeo.com",
+    "vimeocdn.com",
+]
+
+
+def _env_list(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class ResourcePolicy:
+    """
+    Decides which requests made by a browser page are aborted, by resource type
+    (as reported by Playwright) and by host. Host patterns can use shell-style
+    wildcards, and a plain host also matches its subdomains. Allow rules take
+    precedence over block rules, and main frame navigations are never blocked.
+    Blocked requests are counted by resource type in `blocked`.
+
+    The same policy works with Harambe scrapers, through `route` or `attach`, and
+    with scrapy-playwright, by setting PLAYWRIGHT_ABORT_REQUEST to the policy.
+    """
+
+    def __init__(
+        self,
+        block_types=(),
+        block_hosts=(),
+        allow_types=(),
+        allow_hosts=(),
+        enabled=True,
+    ):
+        self.block_types = set(block_types)
+        self.block_hosts = list(block_hosts)
+        self.allow_types = set(allow_types)
+        self.allow_hosts = list(allow_hosts)
+        self.enabled = enabled
+        self.blocked = Counter()
+
+    @classmethod
+    def from_env(cls, block_types=(), block_hosts=(), allow_types=(), allow_hosts=()):
+        """
+        The policy set by RESOURCE_BLOCKING_TYPES and RESOURCE_BLOCKING_HOSTS
+        (comma-separated, defaulting to BLOCKED_RESOURCE_TYPES and BLOCKED_HOSTS),
+        or a policy that blocks nothing if RESOURCE_BLOCKING_ENABLED is "False".
+        Scrapers can add to the blocked types and hosts, or exempt some with the
+        allow arguments.
+        """
+        return cls(
+            block_types=_env_list("RESOURCE_BLOCKING_TYPES", BLOCKED_RESOURCE_TYPES)
+            + list(block_types),
+            block_hosts=_env_list("RESOURCE_BLOCKING_HOSTS", BLOCKED_HOSTS)
+            + list(block_hosts),
+            allow_types=allow_types,
+            allow_hosts=allow_hosts,
+            enabled=os.getenv("RESOURCE_BLOCKING_ENABLED", "True") != "False",
+        )
+
+    def should_block(self, resource_type, url, main_frame=False):
+        """Whether to block a request. Navigations of the main frame never are,
+        but documents in frames, like video embeds, can be blocked by host."""
+        if not self.enabled or main_frame:
+            return False
+        host = urlparse(url).hostname or ""
+        if resource_type in self.allow_types or self._matches(host, self.allow_hosts):
+            return False
+        return resource_type in self.block_types or self._matches(
+            host, self.block_hosts
+        )
+
+    def _matches(self, host, patterns):
+        return any(
+            host == pattern or host.endswith("." + pattern) or fnmatch(host, pattern)
+            for pattern in patterns
+        )
+
+    def __call__(self, request):
+        """Whether to abort a Playwright request, for PLAYWRIGHT_ABORT_REQUEST"""
+        main_frame = (
+            request.is_navigation_request() and request.frame.parent_frame is None
+        )
+        if self.should_block(request.resource_type, request.url, main_frame):
+            self.blocked[request.resource_type] += 1
+            return True
+        return False
+
+    async def route(self, route):
+        """A Playwright route handler, for `page.route("**/*", policy.route)`"""
+        if self(route.request):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    async def attach(self, page):
+        """Apply the policy to every request from a page"""
+        await page.route("**/*", self.route)
+
+    def record_stats(self, stats, prefix="resource_blocking/blocked"):
+        """Add the blocked request counts to a Scrapy stats collector"""
+        for resource_type, count in self.blocked.items():
+            stats.set_value(f"{prefix}/{resource_type}", count)
+
+    def summary(self):
+        """A line describing the blocked requests, for scraper output"""
+        total = sum(self.blocked.values())
+        details = ", ".join(
+            f"{resource_type} {count}"
+            for resource_type, count in self.blocked.most_common()
+        )
+        return f"Blocked {total} requests" + (f" ({details})" if details else "")
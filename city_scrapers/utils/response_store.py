@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import time
+
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+
+
+class ResponseStore:
+    """
+    Disk-backed store of responses keyed by URL. Bodies are written once under the
+    SHA-256 of their content so pages with identical bodies share a file, and an
+    index maps each URL to its body hash, status, headers and any extra metadata
+    (like the start of the meeting parsed from the page).
+
+    The index is kept in memory and written on `save`, which also evicts the least
+    recently used entries until the bodies fit within `max_bytes`. Stores are
+    shared by path through `ResponseStore.open` so that every spider in a process
+    uses the same index.
+    """
+
+    _open_stores = {}
+
+    def __init__(self, path, max_bytes=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(path, "index.json")
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    @classmethod
+    def open(cls, path, max_bytes=None):
+        """Return the store for a path, creating it if it isn't already open"""
+        path = os.path.abspath(path)
+        if path not in cls._open_stores:
+            cls._open_stores[path] = cls(path, max_bytes=max_bytes)
+        return cls._open_stores[path]
+
+    def get(self, url):
+        """Return the index entry for a URL if its body is available"""
+        entry = self.index.get(url)
+        if entry is None or not os.path.exists(self._object_path(entry["sha256"])):
+            return None
+        entry["accessed_at"] = time.time()
+        return entry
+
+    def retrieve_response(self, url):
+        """Build a response from the stored entry for a URL"""
+        entry = self.get(url)
+        if entry is None:
+            return None
+        with open(self._object_path(entry["sha256"]), "rb") as f:
+            body = f.read()
+        headers = Headers(entry["headers"])
+        respcls = responsetypes.from_args(headers=headers, url=url, body=body)
+        return respcls(
+            url=url,
+            status=entry["status"],
+            headers=headers,
+            body=body,
+            flags=["cached"],
+        )
+
+    def store_response(self, url, response, **metadata):
+        """Store a response's body and headers, keeping existing metadata"""
+        sha256 = hashlib.sha256(response.body).hexdigest()
+        object_path = self._object_path(sha256)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            with open(object_path, "wb") as f:
+                f.write(response.body)
+        entry = self.index.get(url, {})
+        entry.update(
+            {
+                "sha256": sha256,
+                "size": len(response.body),
+                "status": response.status,
+                "headers": {
+                    key.decode("latin-1"): [v.decode("latin-1") for v in values]
+                    for key, values in response.headers.items()
+                },
+                "stored_at": time.time(),
+                "accessed_at": time.time(),
+                **metadata,
+            }
+        )
+        self.index[url] = entry
+        return entry
+
+    def update(self, url, **metadata):
+        """Set metadata on an existing entry"""
+        if url in self.index:
+            self.index[url].update(metadata)
+
+    def save(self):
+        """Evict entries over the size cap and write the index. Returns the number
+        of entries evicted."""
+        evicted = self._evict()
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+        return evicted
+
+    def _evict(self):
+        evicted = 0
+        if self.max_bytes is not None:
+            by_access = sorted(self.index, key=lambda u: self.index[u]["accessed_at"])
+            while by_access and self._total_bytes() > self.max_bytes:
+                del self.index[by_access.pop(0)]
+                evicted += 1
+        referenced = {entry["sha256"] for entry in self.index.values()}
+        objects_dir = os.path.join(self.path, "objects")
+        for dirpath, _, filenames in os.walk(objects_dir):
+            for filename in filenames:
+                if filename not in referenced:
+                    os.remove(os.path.join(dirpath, filename))
+        return evicted
+
+    def _total_bytes(self):
+        return sum(
+            entry["size"]
+            for entry in {e["sha256"]: e for e in self.index.values()}.values()
+        )
+
+    def _object_path(self, sha256):
+        return os.path.join(self.path, "objects", sha256[:2], sha256)
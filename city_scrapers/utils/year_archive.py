@@ -0,0 +1,63 @@
+import os
+import re
+from datetime import datetime
+
+from city_scrapers.utils.listing_window import parse_backfill
+
+# Used by Harambe scrapers, which don't have Scrapy settings
+YEAR_ARCHIVE_YEARS = int(os.getenv("YEAR_ARCHIVE_YEARS", 1))
+YEAR_ARCHIVE_BACKFILL = parse_backfill(os.getenv("LISTING_BACKFILL", "False"))
+
+
+def parse_year(value):
+    """The first four-digit year in a value like "2024" or "page?year=2024" """
+    match = re.search(r"(?<!\d)(19|20)\d{2}(?!\d)", str(value or ""))
+    return int(match.group()) if match else None
+
+
+def years_in_horizon(
+    values, previous_years=YEAR_ARCHIVE_YEARS, backfill=YEAR_ARCHIVE_BACKFILL
+):
+    """
+    Filters the years of a year-paginated archive (or the URLs of its year pages)
+    to the current year, the `previous_years` before it and any later years, so
+    the depth of an archive doesn't decide how long a crawl takes. Values without
+    a year are kept, and so is everything when `backfill` is set.
+
+    Parameters:
+    values (list): years, or strings containing them like "bbs.html?ID=2024"
+    previous_years (int): how many years before the current one to include
+    backfill (bool): include every year
+
+    Returns:
+    list: the values in the horizon, in their original order
+    """
+    if backfill:
+        return list(values)
+    first_year = datetime.now().year - previous_years
+    return [
+        value
+        for value in values
+        if parse_year(value) is None or parse_year(value) >= first_year
+    ]
+
+
+def year_horizon(spider):
+    """
+    The (previous_years, backfill) horizon from the YEAR_ARCHIVE_YEARS and
+    LISTING_BACKFILL settings of a spider, or the defaults if it isn't bound to a
+    crawler
+    """
+    settings = getattr(spider, "settings", None)
+    if settings is None:
+        return YEAR_ARCHIVE_YEARS, YEAR_ARCHIVE_BACKFILL
+    return (
+        settings.getint("YEAR_ARCHIVE_YEARS", YEAR_ARCHIVE_YEARS),
+        settings.getbool("LISTING_BACKFILL"),
+    )
+
+
+def spider_years_in_horizon(spider, values):
+    """years_in_horizon with the horizon of a spider. See year_horizon."""
+    previous_years, backfill = year_horizon(spider)
+    return years_in_horizon(values, previous_years=previous_years, backfill=backfill)
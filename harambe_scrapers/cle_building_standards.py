@@ -1,7 +1,6 @@
 import asyncio
 import json
 import re
-from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -9,7 +8,12 @@ from harambe import SDK
 from harambe.contrib import playwright_harness
 from playwright.async_api import Page
 
+from city_scrapers.utils.resource_blocking import ResourcePolicy
+from city_scrapers.utils.year_archive import years_in_horizon
+from harambe_scrapers.concurrency import map_year_pages
 from harambe_scrapers.observers import DataCollector
+from harambe_scrapers.runner import context_harness
+from harambe_scrapers.snapshot import snapshot
 from harambe_scrapers.utils import create_ocd_event
 
 START_URL = "https://planning.clevelandohio.gov/bza/bbs.html"
@@ -17,6 +21,8 @@ OUTPUT_DIR = Path("harambe_scrapers/output")
 SCRAPER_NAME = "cle_building_standards"
 AGENCY_NAME = "Cleveland Board of Building Standards and Building Appeals"
 TIMEZONE = "America/Detroit"
+# Year pages are loaded with map_year_pages, see scraper_pages
+YEAR_ARCHIVE = True
 
 
 async def scrape(
@@ -107,13 +113,29 @@ async def scrape(
     if form:
         await form.scroll_into_view_if_needed()
 
-    main_title_el = await page.query_selector(".mb-0.text-danger")
-    main_title = await main_title_el.inner_text() if main_title_el else None
+    # Read everything used from the current year's page in one round trip
+    current = await snapshot(
+        page,
+        {
+            "title": ".mb-0.text-danger",
+            "time": "ul:nth-child(8) li:nth-child(1)",
+            "dropdown_items": {
+                "selector": 'form[name="form2"] .dropdown-menu a.dropdown-item',
+                "all": True,
+                "fields": {"href": {"attribute": "href"}, "text": {}},
+            },
+            "years": {
+                "selector": "select#ID option",
+                "all": True,
+                "attribute": "value",
+            },
+        },
+    )
+    main_title = current["title"]
 
     # 1. Extract the time string from the selector
-    time_element = await page.query_selector("ul:nth-child(8) li:nth-child(1)")
-    if time_element:
-        time_text = await time_element.inner_text()
+    time_text = current["time"]
+    if time_text is not None:
         # 2. Use regex to extract the time (e.g., "9:30 a.m." or "9:30 AM")
         match = re.search(
             "(\\d{1,2}:\\d{2}\\s*[ap]\\.?m\\.?)", time_text, re.IGNORECASE
@@ -134,15 +156,11 @@ async def scrape(
     except Exception:
         time_24hr = "0000"  # fallback
 
-    # Get all dropdown items
-    dropdown_items = await page.query_selector_all(
-        'form[name="form2"] .dropdown-menu a.dropdown-item'
-    )
     current_year = str(datetime.now().year)
 
-    for item in dropdown_items:
-        link_url = await item.get_attribute("href")
-        link_text = await item.inner_text()
+    for item in current["dropdown_items"]:
+        link_url = item["href"]
+        link_text = item["text"]
         # Try to extract month and day from link_text
         # e.g. "January 15" or "April 23"
         try:
@@ -193,28 +211,46 @@ async def scrape(
 
     # For different years when they're available on the page:
 
-    year_elements = await page.query_selector_all("select#ID option")
-    years = []
-    for year_element in year_elements:
-        years.append(await year_element.get_attribute("value"))
+    # map_year_pages only prints errors, so location changes are collected and
+    # raised once every year page has been read
+    moved_years = []
 
-    for year in years:
+    async def read_year(year_page, year):
         url = f"https://planning.city.cleveland.oh.us/bza/bbs.html?ID={year}"
-
-        location = None
-        await page.goto(url)
+        await year_page.goto(url)
 
         # Validate location
-        content = await page.content()
+        content = await year_page.content()
         if "516" not in content:
-            raise ValueError("Meeting location has changed")
-        main_title_el = await page.query_selector(".mb-0.text-danger")
-        main_title = await main_title_el.inner_text() if main_title_el else None
+            moved_years.append(year)
+            return None
+        return url, await snapshot(
+            year_page,
+            {
+                "title": ".mb-0.text-danger",
+                "options": {
+                    "selector": "#jumpMenu option",
+                    "all": True,
+                    "attribute": "value",
+                },
+            },
+        )
 
-        options = await page.locator("#jumpMenu option").all()
+    # Year pages in the horizon are loaded on separate pages at the same time
+    years = years_in_horizon(current["years"])
+    year_results = await map_year_pages(page, years, read_year)
+    if moved_years:
+        raise ValueError(
+            f"Meeting location has changed ({', '.join(sorted(map(str, moved_years)))})"
+        )
+    for year_result in year_results:
+        if year_result is None:
+            continue
+        url, year_page = year_result
+        location = None
+        main_title = year_page["title"]
 
-        for option in options:
-            value = await option.get_attribute("value")
+        for value in year_page["options"]:
             if not value:
                 continue
 
@@ -241,7 +277,7 @@ async def scrape(
             await sdk.save_data(meeting)
 
 
-async def main():
+async def main(context=None):
     print("=" * 70)
     print("Cleveland Board of Building Standards and Building Appeals")
     print("=" * 70)
@@ -252,50 +288,60 @@ async def main():
     print(f"Scraping: {START_URL}")
     print()
 
-    observer = DataCollector(scraper_name=SCRAPER_NAME, timezone=TIMEZONE)
+    observer = DataCollector(
+        scraper_name=SCRAPER_NAME, timezone=TIMEZONE, output_dir=OUTPUT_DIR
+    )
+    resource_policy = ResourcePolicy.from_env()
 
+    complete = False
+    error = None
     try:
         await SDK.run(
             scrape,
             START_URL,
             observer=observer,
-            harness=playwright_harness,
+            harness=context_harness(context) if context else playwright_harness,
             headless=True,
+            # Replaces the harness's own blocking of images, media and fonts
+            abort_unnecessary_requests=False,
+            on_new_page=resource_policy.attach,
         )
+        complete = True
     except Exception as e:
+        error = e
         print(f"✗ Error: {e}")
         import traceback
 
         traceback.print_exc()
 
+    # Upload meetings still buffered for Azure, and finish the output file if the
+    # run completed
+    output_file = await observer.close(complete=complete)
+
     print()
     print("=" * 70)
-    print(f"COMPLETE: {len(observer.data)} meetings collected")
+    print(f"COMPLETE: {observer.count} meetings collected")
+    print(resource_policy.summary())
     print("=" * 70)
 
-    if observer.data:
-        fname = f"cle_building_standards_{datetime.now():%Y%m%d_%H%M%S}.json"
-        output_file = OUTPUT_DIR / fname
-        # Write JSONLINES format - one JSON object per line
-        with open(output_file, "w") as f:
-            for meeting in observer.data:
-                # Remove __url field if it exists (added by Harambe SDK)
-                if "__url" in meeting:
-                    del meeting["__url"]
-                f.write(json.dumps(meeting, ensure_ascii=False) + "\n")
-
-        print(f"✓ Saved local backup to: {output_file}")
+    if observer.count:
+        if output_file:
+            print(f"✓ Saved local backup to: {output_file}")
 
-        if observer.azure_client:
-            print(f"✓ Uploaded {len(observer.data)} meetings to Azure Blob Storage")
+        if observer.storage:
+            print(f"✓ {observer.upload_summary()}")
 
         print()
         print("Sample meeting:")
         print("-" * 70)
-        print(json.dumps(observer.data[0], indent=2))
+        print(json.dumps(observer.sample, indent=2))
     else:
         print("⚠ No meetings collected")
 
+    # Fail the run (and the runner) once the output is written
+    if error is not None:
+        raise error
+
 
 if __name__ == "__main__":
     asyncio.run(main())
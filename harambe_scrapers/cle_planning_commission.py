@@ -2,7 +2,6 @@ import asyncio
 import json
 import logging
 import re
-from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -10,7 +9,10 @@ from harambe import SDK
 from harambe.contrib import playwright_harness
 from playwright.async_api import Page
 
+from city_scrapers.utils.resource_blocking import ResourcePolicy
 from harambe_scrapers.observers import DataCollector
+from harambe_scrapers.runner import context_harness
+from harambe_scrapers.snapshot import snapshot
 from harambe_scrapers.utils import create_ocd_event
 
 logger = logging.getLogger(__name__)
@@ -203,14 +205,9 @@ async def scrape(
         date_str = " ".join([day.strftime("%Y %B %d"), time_str])
         return datetime.strptime(date_str, "%Y %B %d %I:%M%p")
 
-    async def parse_links(agenda, presentations, page):
-        links = [
-            {
-                "title": "Agenda",
-                "url": await page.evaluate("(item) => item.href", agenda),
-            }
-        ]
-        key = await dropdown_to_key(agenda)
+    def parse_links(agenda, presentations):
+        links = [{"title": "Agenda", "url": agenda["url"]}]
+        key = dropdown_to_key(agenda)
         if key in presentations:
             links.append(
                 {
@@ -220,28 +217,21 @@ async def scrape(
             )
         return links
 
-    async def parse_year_from_link(item):
-        link = await item.get_attribute("href")
-        year_match = re.search("/(20\\d{2})/", link)
+    def parse_year_from_link(item):
+        year_match = re.search("/(20\\d{2})/", item["href"])
         if year_match:
             return year_match.group(1)
         return str(datetime.today().year)
 
-    async def parse_presentations(items):
+    def parse_presentations(presentation_items):
         presentations = {}
-        presentation_items = await items.query_selector_all(
-            "div.dropdown-menu a.dropdown-item"
-        )
         for presentation in presentation_items:
-            key = await dropdown_to_key(presentation)
-            href = await presentation.get_attribute("href")
-            presentations[key] = href
+            presentations[dropdown_to_key(presentation)] = presentation["href"]
         return presentations
 
-    async def dropdown_to_key(item):
-        text = await item.text_content()
-        month_str, day_str = text.strip().split(" ")[:2]
-        year = await parse_year_from_link(item)
+    def dropdown_to_key(item):
+        month_str, day_str = item["text"].strip().split(" ")[:2]
+        year = parse_year_from_link(item)
         if int(day_str) < 10:
             day_str = "0" + str(day_str) if "0" != day_str[0] else day_str
         return f"{year}-{month_str}-{day_str}"
@@ -262,10 +252,31 @@ async def scrape(
 
     most_recent_start = datetime.today()
 
-    title_el = await page.query_selector(".mb-2.mt-2")
-    main_title = await title_el.inner_text() if title_el else None
-    time_loc_el = await page.query_selector(".text-center.mb-0")
-    time_loc_text = await time_loc_el.inner_text() if time_loc_el else None
+    # Read everything used from the schedule page in one round trip
+    schedule = await snapshot(
+        page,
+        {
+            "title": ".mb-2.mt-2",
+            "time_loc": ".text-center.mb-0",
+            "dropdowns": {
+                "selector": "div.container div.container div.container div.dropdown",
+                "all": True,
+                "fields": {
+                    "items": {
+                        "selector": "div.dropdown-menu a.dropdown-item",
+                        "all": True,
+                        "fields": {
+                            "text": {"text": "content"},
+                            "href": {"attribute": "href"},
+                            "url": {"url": "href"},
+                        },
+                    }
+                },
+            },
+        },
+    )
+    main_title = schedule["title"]
+    time_loc_text = schedule["time_loc"]
     d_time = (
         time_loc_text.split("at")[1].split(",")[0].replace(" ", "")
         if time_loc_text
@@ -302,19 +313,12 @@ async def scrape(
 
     classification = await parse_classification(main_title)
 
-    dropdowns = await page.query_selector_all(
-        "div.container div.container div.container div.dropdown"
-    )
-    commission_agendas = dropdowns[0]
-    commission_presentations = await parse_presentations(dropdowns[1])
+    dropdowns = schedule["dropdowns"]
+    commission_presentations = parse_presentations(dropdowns[1]["items"])
 
-    agenda_items = await commission_agendas.query_selector_all(
-        "div.dropdown-menu a.dropdown-item"
-    )
-    for agenda in agenda_items:
-        agenda_text = await agenda.text_content()
-        month_str, day_str = agenda_text.strip().split(" ")[:2]
-        year_str = await parse_year_from_link(agenda)
+    for agenda in dropdowns[0]["items"]:
+        month_str, day_str = agenda["text"].strip().split(" ")[:2]
+        year_str = parse_year_from_link(agenda)
 
         start = parse_start(year_str, month_str, day_str, time_str)
         most_recent_start = max(most_recent_start, start)
@@ -329,7 +333,7 @@ async def scrape(
                 description="",
                 classification=classification,
                 location=location,
-                links=await parse_links(agenda, commission_presentations, page),
+                links=parse_links(agenda, commission_presentations),
                 end_time=None,
                 is_cancelled=True if "cancel" in main_title.lower() else False,
                 source_url=START_URL,
@@ -361,7 +365,7 @@ async def scrape(
         await sdk.save_data(meeting)
 
 
-async def main():
+async def main(context=None):
     print("=" * 70)
     print("Cleveland City Planning Commission")
     print("=" * 70)
@@ -372,47 +376,51 @@ async def main():
     print(f"Scraping: {START_URL}")
     print()
 
-    observer = DataCollector(scraper_name=SCRAPER_NAME, timezone=TIMEZONE)
+    observer = DataCollector(
+        scraper_name=SCRAPER_NAME, timezone=TIMEZONE, output_dir=OUTPUT_DIR
+    )
+    resource_policy = ResourcePolicy.from_env()
 
+    complete = False
     try:
         await SDK.run(
             scrape,
             START_URL,
             observer=observer,
-            harness=playwright_harness,
+            harness=context_harness(context) if context else playwright_harness,
             headless=True,
+            # Replaces the harness's own blocking of images, media and fonts
+            abort_unnecessary_requests=False,
+            on_new_page=resource_policy.attach,
         )
+        complete = True
     except Exception as e:
         print(f"✗ Error: {e}")
         import traceback
 
         traceback.print_exc()
 
+    # Upload meetings still buffered for Azure, and finish the output file if the
+    # run completed
+    output_file = await observer.close(complete=complete)
+
     print()
     print("=" * 70)
-    print(f"COMPLETE: {len(observer.data)} meetings collected")
+    print(f"COMPLETE: {observer.count} meetings collected")
+    print(resource_policy.summary())
     print("=" * 70)
 
-    if observer.data:
-        fname = f"cle_planning_commission_{datetime.now():%Y%m%d_%H%M%S}.json"
-        output_file = OUTPUT_DIR / fname
-        # Write JSONLINES format - one JSON object per line
-        with open(output_file, "w") as f:
-            for meeting in observer.data:
-                # Remove __url field if it exists (added by Harambe SDK)
-                if "__url" in meeting:
-                    del meeting["__url"]
-                f.write(json.dumps(meeting, ensure_ascii=False) + "\n")
-
-        print(f"✓ Saved local backup to: {output_file}")
+    if observer.count:
+        if output_file:
+            print(f"✓ Saved local backup to: {output_file}")
 
-        if observer.azure_client:
-            print(f"✓ Uploaded {len(observer.data)} meetings to Azure Blob Storage")
+        if observer.storage:
+            print(f"✓ {observer.upload_summary()}")
 
         print()
         print("Sample meeting:")
         print("-" * 70)
-        print(json.dumps(observer.data[0], indent=2))
+        print(json.dumps(observer.sample, indent=2))
     else:
         print("⚠ No meetings collected")
 
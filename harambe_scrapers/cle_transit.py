@@ -4,184 +4,39 @@ Orchestrates listing->detail scrapers with Azure upload support.
 """
 
 import asyncio
-import json
-from datetime import datetime
-from pathlib import Path
-from typing import Optional
-
-from playwright.async_api import async_playwright
 
 from harambe_scrapers.extractor.cle_transit.detail import scrape as detail_scrape
 from harambe_scrapers.extractor.cle_transit.listing import scrape as listing_scrape
-from harambe_scrapers.observers import DataCollector
-from harambe_scrapers.utils import create_ocd_event
+from harambe_scrapers.orchestrator import (  # noqa: F401
+    DetailSDK,
+    ListingSDK,
+    Orchestrator,
+    Stage,
+)
 
-OUTPUT_DIR = Path("harambe_scrapers/output")
 SCRAPER_NAME = "cle_transit"
 AGENCY_NAME = "Greater Cleveland Regional Transit Authority"
 TIMEZONE = "America/Detroit"
 START_URL = "http://www.riderta.com/about"
 
 
-class ListingSDK:
-    def __init__(self, page, event_urls: list, event_contexts: dict):
-        self.page = page
-        self.event_urls = event_urls
-        self.event_contexts = event_contexts
-
-    async def enqueue(self, url: str, context: dict = None):
-        self.event_urls.append(url)
-        if context:
-            self.event_contexts[url] = context
-
-    async def save_data(self, data: dict):
-        pass
-
-
-class DetailSDK:
-    def __init__(self, page):
-        self.page = page
-        self.data = None
-
-    async def enqueue(self, url: str):
-        pass
-
-    async def save_data(self, data: dict):
-        self.data = data
-
-
-class GCRTAOrchestrator:
-    def __init__(self, headless: bool = True, max_items: Optional[int] = None):
-        self.headless = headless
-        self.max_items = max_items
-        self.event_urls = []
-        self.event_contexts = {}
-        self.observer = DataCollector(SCRAPER_NAME, TIMEZONE)
-        self.current_url = None
-
-    async def run_listing_stage(self, page):
-        print("\n" + "=" * 60)
-        print("[Stage 1/2] Listing Stage - Fetching event URLs")
-        print("=" * 60)
-
-        listing_sdk = ListingSDK(page, self.event_urls, self.event_contexts)
-        await listing_scrape(listing_sdk, START_URL, {})
-
-        print(f"\nFound {len(self.event_urls)} event URLs to process")
-        return self.event_urls
-
-    async def run_detail_stage(self, page, event_url: str) -> Optional[dict]:
-        try:
-            self.current_url = "https://www.riderta.com" + event_url
-
-            # Pass the context to the detail scraper
-            context = self.event_contexts.get(event_url, {})
-
-            await page.goto(
-                self.current_url, wait_until="domcontentloaded", timeout=30000
-            )
-            detail_sdk = DetailSDK(page)
-            await detail_scrape(detail_sdk, self.current_url, context)
-            return detail_sdk.data
-        except Exception as e:
-            print(f"    ✗ Error extracting {event_url}: {e}")
-            return None
-
-    def transform_to_ocd_format(self, raw_data: dict) -> dict:
-        all_day = raw_data.get("is_all_day_event")
-        if all_day is None:
-            all_day = False
-
-        location = raw_data.get("location") or {}
-
-        return create_ocd_event(
-            title=raw_data.get("title") or "GCRTA Meeting",
-            start_time=raw_data["start_time"],
-            scraper_name=SCRAPER_NAME,
-            agency_name=AGENCY_NAME,
-            timezone=TIMEZONE,
-            description=raw_data.get("description") or "",
-            classification=raw_data.get("classification"),
-            location=location,
-            links=raw_data.get("links") or [],
-            end_time=raw_data.get("end_time"),
-            is_cancelled=raw_data.get("is_cancelled", False),
-            source_url=self.current_url,
-            all_day=all_day,
-        )
-
-    async def run(self):
-        print("=" * 70)
-        print(AGENCY_NAME)
-        print("=" * 70)
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            context = await browser.new_context()
-            page = await context.new_page()
-
-            try:
-                await self.run_listing_stage(page)
-
-                print("\n" + "=" * 60)
-                print("[Stage 2/2] Detail Stage - Extracting meeting data")
-                print("=" * 60)
-
-                total_events = len(self.event_urls)
-                if self.max_items:
-                    self.event_urls = self.event_urls[: self.max_items]
-                    total_events = len(self.event_urls)
-                    print(
-                        f"\nProcessing {total_events} events "
-                        f"(limited to {self.max_items})..."
-                    )
-                else:
-                    print(f"\nProcessing {total_events} events...")
-
-                for i, event_url in enumerate(self.event_urls, 1):
-                    print(f"\n[{i}/{total_events}] {event_url}")
-
-                    raw_data = await self.run_detail_stage(page, event_url)
-
-                    if raw_data and raw_data.get("start_time"):
-                        ocd_event = self.transform_to_ocd_format(raw_data)
-                        await self.observer.on_save_data(ocd_event)
-                        print(f"  ✓ Saved: {ocd_event['name']}")
-                    else:
-                        print("  ✗ Skipped (missing data)")
-
-                print("\n" + "=" * 70)
-                print(f"Scraping Complete: {len(self.observer.data)} meetings")
-                print("=" * 70)
-
-                if self.observer.data:
-                    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    output_file = OUTPUT_DIR / f"{SCRAPER_NAME}_{timestamp}.json"
-
-                    with open(output_file, "w", encoding="utf-8") as f:
-                        for meeting in self.observer.data:
-                            if "__url" in meeting:
-                                del meeting["__url"]
-                            f.write(json.dumps(meeting, ensure_ascii=False) + "\n")
-
-                    print(f"\n✓ Data saved to: {output_file}")
+class GCRTAOrchestrator(Orchestrator):
+    scraper_name = SCRAPER_NAME
+    agency_name = AGENCY_NAME
+    timezone = TIMEZONE
+    start_url = START_URL
+    default_title = "GCRTA Meeting"
 
-                    if self.observer.azure_client:
-                        print("✓ Data uploaded to Azure Blob Storage")
-                    else:
-                        print(
-                            "ℹ Azure upload not configured "
-                            "(set AZURE_* environment variables)"
-                        )
+    listing = Stage(listing_scrape, "Fetching event URLs")
+    detail = Stage(detail_scrape, "Extracting meeting details", browser=False)
 
-            finally:
-                await browser.close()
+    def get_source_url(self, event_url: str) -> str:
+        return "https://www.riderta.com" + event_url
 
 
-async def main():
+async def main(context=None):
     orchestrator = GCRTAOrchestrator(headless=True, max_items=None)
-    await orchestrator.run()
+    await orchestrator.run(context)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,229 @@
+"""
+Concurrency helpers shared by the Harambe orchestrators.
+
+Detail pages are independent of each other, so instead of visiting them one at a
+time on a single page, orchestrators run them over a small pool of pages. Detail
+pages are fetched while the listing stage is still running, with URLs passed
+through a bounded queue as they are found.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+DETAIL_CONCURRENCY = int(os.getenv("HARAMBE_DETAIL_CONCURRENCY", 4))
+LISTING_CONCURRENCY = int(os.getenv("HARAMBE_LISTING_CONCURRENCY", 2))
+YEAR_CONCURRENCY = int(os.getenv("HARAMBE_YEAR_CONCURRENCY", 3))
+# Maximum number of URLs waiting for a detail page before the listing stage waits
+QUEUE_SIZE = int(os.getenv("HARAMBE_QUEUE_SIZE", 20))
+
+
+class PagePool:
+    """
+    A fixed number of Playwright pages shared by concurrent workers. Pages are
+    opened in the given browser context as they are needed, up to `size`, and
+    reused afterwards so a stage never has more than `size` pages open.
+    """
+
+    def __init__(self, context, size: int = DETAIL_CONCURRENCY):
+        self.context = context
+        self.size = max(1, size)
+        self.pages = []
+        self.opened = 0
+        self.idle = asyncio.Queue()
+
+    @asynccontextmanager
+    async def page(self, url: Optional[str] = None):
+        """A page from the pool. `url` is the page that will be loaded, which
+        RoutedPagePool uses to pick a pool."""
+        if self.idle.empty() and self.opened < self.size:
+            self.opened += 1
+            try:
+                page = await self.context.new_page()
+            except Exception:
+                # Free the slot so a later call can try again
+                self.opened -= 1
+                raise
+            self.pages.append(page)
+        else:
+            page = await self.idle.get()
+        try:
+            yield page
+        finally:
+            self.idle.put_nowait(page)
+
+    @classmethod
+    def for_page(cls, page):
+        """A pool of one page that is already open, which the pool won't close"""
+        pool = cls(None, size=1)
+        pool.opened = 1
+        pool.idle.put_nowait(page)
+        return pool
+
+    async def close(self):
+        for page in self.pages:
+            await page.close()
+        self.pages = []
+
+
+class RoutedPagePool:
+    """
+    Pages from a browser pool or a static (browserless) pool, chosen for each URL by
+    a RenderRoutes manifest, falling back to `default` ("http" or "browser").
+    `resolve` turns the URLs passed to `page` into the absolute URLs that routes
+    match.
+    """
+
+    def __init__(
+        self,
+        routes,
+        browser_pool: PagePool,
+        static_pool: PagePool,
+        default: str,
+        resolve: Optional[Callable[[str], str]] = None,
+    ):
+        self.routes = routes
+        self.browser_pool = browser_pool
+        self.static_pool = static_pool
+        self.default = default
+        self.resolve = resolve or (lambda url: url)
+        self.size = max(browser_pool.size, static_pool.size)
+
+    def page(self, url: Optional[str] = None):
+        fetch = self.default
+        if url:
+            fetch = self.routes.fetch_for(self.resolve(url), self.default)
+        pool = self.browser_pool if fetch == "browser" else self.static_pool
+        return pool.page(url)
+
+    async def close(self):
+        await self.browser_pool.close()
+        await self.static_pool.close()
+
+
+async def map_with_pages(
+    pool: PagePool,
+    items: Sequence[Any],
+    fn: Callable[[Any, Any], Awaitable[Any]],
+) -> list:
+    """
+    Run `fn(page, item)` for every item with at most `pool.size` running at once,
+    returning the results in the same order as `items`. If `fn` raises for an item
+    the error is printed and its result is None, so other items still run.
+    """
+    queue = asyncio.Queue()
+    for index, item in enumerate(items):
+        queue.put_nowait((index, item))
+    results = [None] * len(items)
+
+    async def worker():
+        while not queue.empty():
+            index, item = queue.get_nowait()
+            async with pool.page(item) as page:
+                try:
+                    results[index] = await fn(page, item)
+                except Exception as e:
+                    print(f"    ✗ Error extracting {item}: {e}")
+
+    await asyncio.gather(*(worker() for _ in range(min(pool.size, len(items)))))
+    return results
+
+
+async def map_year_pages(
+    page,
+    years: Sequence[Any],
+    fn: Callable[[Any, Any], Awaitable[Any]],
+    concurrency: int = YEAR_CONCURRENCY,
+) -> list:
+    """
+    Run `fn(year_page, year)` for the years of a year-paginated archive on up to
+    `concurrency` new pages in the browser context of `page`, like
+    map_with_pages. Filter the years with years_in_horizon first.
+    """
+    pool = PagePool(page.context, concurrency)
+    try:
+        return await map_with_pages(pool, years, fn)
+    finally:
+        await pool.close()
+
+
+class DetailStream:
+    """
+    Connects a listing stage to a detail stage. URLs passed to `enqueue` are put
+    on a queue of at most `queue_size` items, so the listing stage waits when the
+    detail stage falls behind, and up to `pool.size` workers run
+    `fn(page, url)` on them as they arrive. Duplicate URLs and URLs past
+    `max_items` are ignored.
+
+    Results are passed to `on_result(url, result)` in the order the URLs were
+    enqueued. If `fn` raises for a URL, or a page can't be opened for it, the error
+    is printed and its result is None, and errors from `on_result` are printed
+    without stopping the stream.
+    """
+
+    def __init__(
+        self,
+        pool: PagePool,
+        fn: Callable[[Any, str], Awaitable[Any]],
+        on_result: Callable[[str, Any], Awaitable[None]],
+        queue_size: int = QUEUE_SIZE,
+        max_items: Optional[int] = None,
+    ):
+        self.pool = pool
+        self.fn = fn
+        self.on_result = on_result
+        self.max_items = max_items
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.seen = set()
+        self.finished = {}
+        self.next_index = 0
+        self.flush_lock = asyncio.Lock()
+
+    async def enqueue(self, url: str, *args: Any, **kwargs: Any):
+        if url in self.seen or (self.max_items and len(self.seen) >= self.max_items):
+            return
+        index = len(self.seen)
+        self.seen.add(url)
+        await self.queue.put((index, url))
+
+    async def run(self, produce: Callable[[Callable], Awaitable[Any]]):
+        """Run `produce(enqueue)`, then wait for every enqueued URL to finish"""
+        workers = [asyncio.create_task(self._work()) for _ in range(self.pool.size)]
+        try:
+            await produce(self.enqueue)
+            await self.queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _work(self):
+        while True:
+            index, url = await self.queue.get()
+            try:
+                result = None
+                try:
+                    async with self.pool.page(url) as page:
+                        try:
+                            result = await self.fn(page, url)
+                        except Exception as e:
+                            print(f"    ✗ Error extracting {url}: {e}")
+                except Exception as e:
+                    # Still record a result, or every later result is held back
+                    print(f"    ✗ Error opening a page for {url}: {e}")
+                self.finished[index] = (url, result)
+                await self._flush()
+            finally:
+                self.queue.task_done()
+
+    async def _flush(self):
+        """Pass on results in enqueue order as they become available"""
+        async with self.flush_lock:
+            while self.next_index in self.finished:
+                url, result = self.finished.pop(self.next_index)
+                self.next_index += 1
+                try:
+                    await self.on_result(url, result)
+                except Exception as e:
+                    print(f"    ✗ Error saving {url}: {e}")
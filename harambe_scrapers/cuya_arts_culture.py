@@ -1,7 +1,6 @@
 import asyncio
 import json
 import re
-from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -9,7 +8,9 @@ from harambe import SDK
 from harambe.contrib import playwright_harness
 from playwright.async_api import Page
 
+from city_scrapers.utils.resource_blocking import ResourcePolicy
 from harambe_scrapers.observers import DataCollector
+from harambe_scrapers.runner import context_harness
 from harambe_scrapers.utils import create_ocd_event
 
 START_URL = "https://www.cacgrants.org/about-us/meet-our-board/board-meeting-schedule/"
@@ -200,7 +201,7 @@ async def scrape(
     await fetch_schedule(page, links_dict)
 
 
-async def main():
+async def main(context=None):
     print("=" * 70)
     print("Cuyahoga County Arts & Culture - Board Meeting Schedule")
     print("=" * 70)
@@ -211,47 +212,51 @@ async def main():
     print(f"Scraping: {START_URL}")
     print()
 
-    observer = DataCollector(scraper_name=SCRAPER_NAME, timezone=TIMEZONE)
+    observer = DataCollector(
+        scraper_name=SCRAPER_NAME, timezone=TIMEZONE, output_dir=OUTPUT_DIR
+    )
+    resource_policy = ResourcePolicy.from_env()
 
+    complete = False
     try:
         await SDK.run(
             scrape,
             START_URL,
             observer=observer,
-            harness=playwright_harness,
+            harness=context_harness(context) if context else playwright_harness,
             headless=True,
+            # Replaces the harness's own blocking of images, media and fonts
+            abort_unnecessary_requests=False,
+            on_new_page=resource_policy.attach,
         )
+        complete = True
     except Exception as e:
         print(f"✗ Error: {e}")
         import traceback
 
         traceback.print_exc()
 
+    # Upload meetings still buffered for Azure, and finish the output file if the
+    # run completed
+    output_file = await observer.close(complete=complete)
+
     print()
     print("=" * 70)
-    print(f"COMPLETE: {len(observer.data)} meetings collected")
+    print(f"COMPLETE: {observer.count} meetings collected")
+    print(resource_policy.summary())
     print("=" * 70)
 
-    if observer.data:
-        fname = f"cuya_arts_culture_{datetime.now():%Y%m%d_%H%M%S}.json"
-        output_file = OUTPUT_DIR / fname
-        # Write JSONLINES format - one JSON object per line
-        with open(output_file, "w") as f:
-            for meeting in observer.data:
-                # Remove __url field if it exists (added by Harambe SDK)
-                if "__url" in meeting:
-                    del meeting["__url"]
-                f.write(json.dumps(meeting, ensure_ascii=False) + "\n")
-
-        print(f"✓ Saved local backup to: {output_file}")
+    if observer.count:
+        if output_file:
+            print(f"✓ Saved local backup to: {output_file}")
 
-        if observer.azure_client:
-            print(f"✓ Uploaded {len(observer.data)} meetings to Azure Blob Storage")
+        if observer.storage:
+            print(f"✓ {observer.upload_summary()}")
 
         print()
         print("Sample meeting:")
         print("-" * 70)
-        print(json.dumps(observer.data[0], indent=2))
+        print(json.dumps(observer.sample, indent=2))
     else:
         print("⚠ No meetings collected")
 
@@ -7,6 +7,8 @@ from harambe import SDK
 from harambe.contrib import playwright_harness
 from playwright.async_api import Page, TimeoutError
 
+from harambe_scrapers.snapshot import snapshot
+
 
 async def scrape(
     sdk: SDK, current_url: str, context: dict[str, Any], *args: Any, **kwargs: Any
@@ -42,9 +44,17 @@ async def scrape(
             "views-field-field-event-location-administrative-area",
             "views-field-field-event-location-postal-code",
         ]
+        # Read all of the address parts in one round trip
+        address_parts = await snapshot(
+            page,
+            {
+                selector: {"selector": f".{selector} strong", "text": "content"}
+                for selector in location_selectors
+            },
+        )
         address = ""
         for selector in location_selectors:
-            address_part = await page.locator(f".{selector} strong").text_content()
+            address_part = address_parts[selector]
             if address_part:
                 if "address-line1" in selector:
                     address = address + address_part + ", "
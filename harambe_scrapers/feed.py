@@ -0,0 +1,83 @@
+"""
+The combined meeting feed that Harambe output is merged into.
+
+latest.json holds every scraper's meetings sorted by start time, and
+upcoming.json the ones starting after yesterday, as written by Scrapy's
+combinefeeds command. FeedIndex partitions the feed by the scraper slug at the
+start of each meeting's cityscrapers id, so a scraper's new output replaces its
+partition without checking every other meeting, and writes both files in one
+pass.
+"""
+
+import heapq
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+START_TIME_KEY = "start_time"
+
+
+def scraper_slug(meeting: Dict) -> str:
+    """The scraper name from an id like "cle_transit/202501150900/x/board" """
+    extras = meeting.get("extras") or {}
+    meeting_id = extras.get("cityscrapers/id") or extras.get("cityscrapers.org/id")
+    return (meeting_id or "").split("/")[0]
+
+
+def upcoming_cutoff(now: Optional[datetime] = None) -> str:
+    """Meetings starting after this ISO timestamp (a day ago) are upcoming"""
+    return ((now or datetime.now()) - timedelta(days=1)).isoformat()[:19]
+
+
+def is_upcoming(meeting: Dict, cutoff: str) -> bool:
+    return meeting[START_TIME_KEY][:19] > cutoff
+
+
+class FeedIndex:
+    """
+    Meetings partitioned by scraper slug.
+
+    Usage:
+        feed = FeedIndex(JsonLinesReader(storage.stream("latest.json")))
+        feed.replace("cle_transit", new_meetings)
+        latest, upcoming = feed.latest_and_upcoming()
+    """
+
+    def __init__(self, meetings: Iterable[Dict] = ()):
+        self.partitions: Dict[str, List[Dict]] = {}
+        for meeting in meetings:
+            self.add(meeting)
+
+    def __len__(self) -> int:
+        return sum(len(partition) for partition in self.partitions.values())
+
+    def add(self, meeting: Dict):
+        self.partitions.setdefault(scraper_slug(meeting), []).append(meeting)
+
+    def partition(self, slug: str) -> List[Dict]:
+        return self.partitions.get(slug, [])
+
+    def replace(self, slug: str, meetings: List[Dict]) -> int:
+        """Replace every meeting from a scraper. Returns how many were removed."""
+        removed = len(self.partition(slug))
+        self.partitions[slug] = list(meetings)
+        return removed
+
+    def meetings(self) -> Iterator[Dict]:
+        """Every meeting, sorted by start time"""
+        for partition in self.partitions.values():
+            # Partitions from latest.json are already sorted, so this is linear
+            partition.sort(key=itemgetter(START_TIME_KEY))
+        return heapq.merge(*self.partitions.values(), key=itemgetter(START_TIME_KEY))
+
+    def latest_and_upcoming(
+        self, now: Optional[datetime] = None
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """The meetings for latest.json and upcoming.json, in one pass"""
+        cutoff = upcoming_cutoff(now)
+        latest, upcoming = [], []
+        for meeting in self.meetings():
+            latest.append(meeting)
+            if is_upcoming(meeting, cutoff):
+                upcoming.append(meeting)
+        return latest, upcoming
@@ -0,0 +1,104 @@
+"""
+JSON lines files for Harambe scrapers and the scripts that publish them.
+
+Meetings are written to disk as they're scraped instead of being collected in
+memory and written at the end, so memory stays flat on large backfills. Blobs
+like latest.json are read back the same way, one meeting at a time from a
+stream of chunks.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Union
+
+PARTIAL_SUFFIX = ".partial"
+
+
+class JsonLinesSink:
+    """
+    Writes one JSON object per line to `path`, through a temporary file next to it
+    that's renamed to `path` when the sink is committed. Each line is flushed as
+    it's written, so if a run crashes the meetings scraped so far are left in the
+    `.partial` file. Nothing is written until the first item, and a sink closed
+    without items leaves no file.
+
+    Usage:
+        sink = JsonLinesSink(OUTPUT_DIR / "cle_transit_20250115_090000.json")
+        sink.write(meeting)
+        sink.close()
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.partial_path = self.path.with_name(self.path.name + PARTIAL_SUFFIX)
+        self.file = None
+        self.count = 0
+        self.closed = False
+        self.output_file = None
+
+    def write(self, item: dict[str, Any]):
+        if self.closed:
+            raise ValueError(f"{self.path} is already closed")
+        if self.file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(self.partial_path, "w", encoding="utf-8")
+        self.file.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.count += 1
+
+    def close(self, commit: bool = True) -> Optional[Path]:
+        """
+        Close the file, and rename it to `path` if `commit` is set. Returns the path
+        of the complete file, or None if it wasn't committed or nothing was written.
+        """
+        if not self.closed:
+            self.closed = True
+            if self.file is not None:
+                self.file.close()
+                if commit:
+                    os.replace(self.partial_path, self.path)
+                    self.output_file = self.path
+        return self.output_file
+
+
+class JsonLinesReader:
+    """
+    Iterates over the JSON objects in a stream of JSON lines chunks, like
+    BlobStorage.stream, without holding more than a chunk and its partial last
+    line. Lines that aren't valid JSON are skipped and counted in `bad_lines`.
+
+    Usage:
+        reader = JsonLinesReader(storage.stream("latest.json"))
+        for meeting in reader:
+            ...
+        print(f"{reader.count} meetings, {reader.bad_lines} invalid lines")
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = chunks
+        self.count = 0
+        self.bad_lines = 0
+
+    def _parse(self, line: bytes) -> Iterator[dict[str, Any]]:
+        line = line.strip()
+        if not line:
+            return
+        try:
+            item = json.loads(line)
+        except ValueError:  # Includes JSONDecodeError and UnicodeDecodeError
+            self.bad_lines += 1
+            return
+        self.count += 1
+        yield item
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        pending = b""
+        for chunk in self.chunks:
+            # UTF-8 never has a newline byte inside a character, so splitting the
+            # bytes is safe
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield from self._parse(line)
+        yield from self._parse(pending)
@@ -1,14 +1,26 @@
 """
 Simple data collection observers for Harambe scrapers.
 
-Collects scraped data and optionally uploads to Azure Blob Storage
-in a format compatible with Scrapy infrastructure.
+Collects scraped data and optionally uploads to Azure Blob Storage (or the
+local backend, see harambe_scrapers.storage) in a format compatible with Scrapy
+infrastructure.
 """
 
+import asyncio
 import json
 import os
+import time
 from datetime import datetime
-from typing import Any
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from harambe_scrapers.jsonl import JsonLinesSink
+from harambe_scrapers.storage import (
+    BLOB_STORAGE,
+    DEFAULT_CONTAINER,
+    MAX_APPEND_BLOCK_BYTES,
+    storage_from_env,
+)
 
 try:
     from azure.storage.blob import BlobServiceClient
@@ -18,84 +30,177 @@ except ImportError:
     AZURE_AVAILABLE = False
 
 
+# Buffered meetings are appended to the run's blob once this many bytes are waiting,
+# or this many seconds after the last append, and when the observer is closed
+AZURE_FLUSH_BYTES = int(os.getenv("HARAMBE_AZURE_FLUSH_BYTES", 256 * 1024))
+AZURE_FLUSH_SECONDS = float(os.getenv("HARAMBE_AZURE_FLUSH_SECONDS", 30))
+
+
 class DataCollector:
     """
-    Simple observer that collects data and optionally uploads to Azure.
+    Simple observer that writes data as it's scraped and optionally uploads to
+    Azure.
+
+    With `output_dir`, meetings are streamed to a JSON lines file there (see
+    JsonLinesSink) rather than kept in memory. Only the count and the first
+    meeting are kept, for scraper output. Meetings for Azure are buffered and
+    appended to an append blob in batches, so each upload only sends new
+    meetings. Uploads run in a thread, so scrapers sharing the event loop keep
+    running. Await `close` after the run to upload the rest and finish the file.
 
     Usage:
         observer = DataCollector(
             scraper_name="cle_planning_commission",
-            timezone="America/Detroit"
+            timezone="America/Detroit",
+            output_dir=OUTPUT_DIR,
         )
         await SDK.run(
             scrape_func, url, observer=observer, harness=playwright_harness
         )
+        await observer.close()
     """
 
-    def __init__(self, scraper_name: str, timezone: str = "America/Detroit"):
+    def __init__(
+        self,
+        scraper_name: str,
+        timezone: str = "America/Detroit",
+        flush_bytes: int = AZURE_FLUSH_BYTES,
+        flush_seconds: float = AZURE_FLUSH_SECONDS,
+        output_dir: Optional[Union[str, Path]] = None,
+    ):
         self.scraper_name = scraper_name
         self.timezone = timezone
-        self.data = []
-        self.azure_client = self._init_azure()
+        self.count = 0
+        self.sample = None
+        self.storage = self._init_storage()
         # Store run start time to ensure all meetings go to same blob
         self.run_start_time = datetime.now()
-
-    def _init_azure(self):
-        """Initialize Azure client if credentials available."""
-        if not AZURE_AVAILABLE:
+        self.sink = None
+        if output_dir is not None:
+            self.sink = JsonLinesSink(
+                Path(output_dir)
+                / f"{scraper_name}_{self.run_start_time:%Y%m%d_%H%M%S}.json"
+            )
+        self.output_file = None
+        self.flush_bytes = flush_bytes
+        self.flush_seconds = flush_seconds
+        self.buffer = []
+        self.buffered_bytes = 0
+        self.last_flush = time.monotonic()
+        self.flush_lock = asyncio.Lock()
+        self.uploads = 0
+        self.uploaded_bytes = 0
+
+    def _init_storage(self):
+        """The blob storage for uploads, if it's configured."""
+        if BLOB_STORAGE == "local":
+            return storage_from_env(os.getenv("AZURE_CONTAINER", DEFAULT_CONTAINER))
+        if not AZURE_AVAILABLE or not os.getenv("AZURE_CONTAINER"):
             return None
-
-        account_name = os.getenv("AZURE_ACCOUNT_NAME")
-        account_key = os.getenv("AZURE_ACCOUNT_KEY")
-        container = os.getenv("AZURE_CONTAINER")
-
-        if account_name and account_key and container:
-            try:
-                conn_str = (
-                    f"DefaultEndpointsProtocol=https;"
-                    f"AccountName={account_name};"
-                    f"AccountKey={account_key};"
-                    f"EndpointSuffix=core.windows.net"
-                )
-                return BlobServiceClient.from_connection_string(
-                    conn_str
-                ).get_container_client(container)
-            except Exception as e:
-                print(f"Azure init failed: {e}")
+        try:
+            return storage_from_env(os.getenv("AZURE_CONTAINER"), BlobServiceClient)
+        except ValueError:  # Credentials aren't set
+            return None
+        except Exception as e:
+            print(f"Azure init failed: {e}")
         return None
 
+    @property
+    def blob_path(self) -> str:
+        # Use run start time so all meetings from this run go to same blob
+        return (
+            f"{self.run_start_time.year}/{self.run_start_time.month:02d}/"
+            f"{self.run_start_time.day:02d}/"
+            f"{self.run_start_time.hour:02d}{self.run_start_time.minute:02d}/"
+            f"{self.scraper_name}.json"
+        )
+
     async def on_save_data(self, data: dict[str, Any]):
-        """Save data and upload to Azure if configured."""
-        self.data.append(data)
+        """Write data to the output file and buffer it for Azure if configured."""
+        # Remove __url field if it exists (added by Harambe SDK)
+        clean_data = {k: v for k, v in data.items() if k != "__url"}
+        self.count += 1
+        if self.sample is None:
+            self.sample = clean_data
         print(f"  ✓ {data.get('start_time', '')[:10]} - {data.get('name', 'Unknown')}")
 
-        if self.azure_client:
-            self._upload_to_azure(data)
-
-    def _upload_to_azure(self, data: dict[str, Any]):
-        """Upload to Azure in jsonlines format matching Scrapy pattern."""
+        if self.sink:
+            self.sink.write(clean_data)
+        if self.storage:
+            await self._buffer_for_azure(clean_data)
+
+    async def _buffer_for_azure(self, data: dict[str, Any]):
+        """Buffer a meeting in jsonlines format matching Scrapy pattern."""
+        json_line = (json.dumps(data, ensure_ascii=False) + "\n").encode()
+        self.buffer.append(json_line)
+        self.buffered_bytes += len(json_line)
+
+        # Meetings saved during a flush wait for the next one
+        if not self.flush_lock.locked() and (
+            self.buffered_bytes >= self.flush_bytes
+            or time.monotonic() - self.last_flush >= self.flush_seconds
+        ):
+            await self.flush()
+
+    async def flush(self):
+        """Append buffered meetings to the run's blob. They're kept in the buffer if
+        the upload fails, and tried again on the next flush."""
+        async with self.flush_lock:
+            self.last_flush = time.monotonic()
+            if not self.storage or not self.buffer:
+                return
+            lines, self.buffer = self.buffer, []
+            self.buffered_bytes -= sum(len(line) for line in lines)
+            uploaded = await asyncio.to_thread(self._upload, lines)
+            # Failed lines go back ahead of meetings saved during the upload
+            self.buffer[:0] = lines[uploaded:]
+            self.buffered_bytes += sum(len(line) for line in lines[uploaded:])
+
+    def _upload(self, lines: list) -> int:
+        """Append lines to the run's blob, returning how many were uploaded"""
+        uploaded = 0
         try:
-            # Use run start time so all meetings from this run go to same blob
-            blob_path = (
-                f"{self.run_start_time.year}/{self.run_start_time.month:02d}/"
-                f"{self.run_start_time.day:02d}/"
-                f"{self.run_start_time.hour:02d}{self.run_start_time.minute:02d}/"
-                f"{self.scraper_name}.json"
-            )
-            blob_client = self.azure_client.get_blob_client(blob_path)
-
-            # Remove __url field if it exists (added by Harambe SDK)
-            clean_data = {k: v for k, v in data.items() if k != "__url"}
-
-            # Jsonlines format
-            json_line = json.dumps(clean_data, ensure_ascii=False) + "\n"
-            try:
-                existing = blob_client.download_blob().readall().decode("utf-8")
-                blob_client.upload_blob(existing + json_line, overwrite=True)
-            except Exception:  # Blob doesn't exist yet
-                blob_client.upload_blob(json_line)
+            # Split into blocks between lines, so a failed block doesn't
+            # duplicate meetings when it's retried
+            while uploaded < len(lines):
+                block_lines, block_bytes = [], 0
+                for line in lines[uploaded:]:
+                    if block_lines and block_bytes + len(line) > MAX_APPEND_BLOCK_BYTES:
+                        break
+                    block_lines.append(line)
+                    block_bytes += len(line)
+                self.uploads += self.storage.append(
+                    self.blob_path, b"".join(block_lines)
+                )
+                self.uploaded_bytes += block_bytes
+                uploaded += len(block_lines)
         except Exception as e:
             print(f"  Azure upload failed: {e}")
+        return uploaded
+
+    async def close(self, complete: bool = True) -> Optional[Path]:
+        """
+        Upload any buffered meetings and close the output file. The file is only
+        moved into place if the run is `complete`, otherwise it's left with a
+        .partial suffix. Returns the output file, if there is one.
+        """
+        await self.flush()
+        if self.buffer:
+            print(f"  ✗ {len(self.buffer)} meetings weren't uploaded to Azure")
+        if self.sink:
+            self.output_file = self.sink.close(commit=complete)
+            if not complete and self.sink.count:
+                print(f"  ✗ Partial output left in {self.sink.partial_path}")
+        return self.output_file
+
+    def upload_summary(self) -> str:
+        """A line describing the Azure uploads, for scraper output"""
+        if not self.storage:
+            return "ℹ Azure upload not configured (set AZURE_* environment variables)"
+        return (
+            f"Uploaded {self.count - len(self.buffer)} meetings to Azure Blob "
+            f"Storage in {self.uploads} uploads ({self.uploaded_bytes} bytes)"
+        )
 
     async def on_queue_url(self, url, context, options):
         pass
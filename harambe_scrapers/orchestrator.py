@@ -0,0 +1,400 @@
+"""
+Shared engine for Harambe scrapers that run separate extractor stages.
+
+A scraper subclasses Orchestrator and declares its stages: an optional category
+stage that finds listing pages, a listing stage that finds detail pages, and a
+detail stage that extracts a meeting from each one. The engine owns the browser,
+runs each stage over a page pool, streams listing URLs to detail workers, retries
+failed detail pages, and writes the output.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from playwright.async_api import async_playwright
+
+from city_scrapers.utils.render_routes import (
+    BROWSER,
+    HTTP,
+    RENDER_ROUTES_PATH,
+    RenderRoutes,
+)
+from city_scrapers.utils.resource_blocking import ResourcePolicy
+from city_scrapers.utils.year_archive import years_in_horizon
+from harambe_scrapers.concurrency import (
+    DETAIL_CONCURRENCY,
+    LISTING_CONCURRENCY,
+    DetailStream,
+    PagePool,
+    RoutedPagePool,
+    map_with_pages,
+)
+from harambe_scrapers.observers import DataCollector
+from harambe_scrapers.static_page import StaticContext
+from harambe_scrapers.utils import create_ocd_event
+
+OUTPUT_DIR = Path("harambe_scrapers/output")
+DETAIL_RETRIES = int(os.getenv("HARAMBE_DETAIL_RETRIES", 1))
+PAGE_TIMEOUT = 30000
+
+
+class ListingSDK:
+    """SDK passed to category and listing extractors, which enqueue URLs"""
+
+    def __init__(self, page, urls: list, contexts: dict = None, on_enqueue=None):
+        self.page = page
+        self.urls = urls
+        self.contexts = contexts if contexts is not None else {}
+        self.on_enqueue = on_enqueue
+
+    async def enqueue(self, url: str, context: dict = None):
+        self.urls.append(url)
+        if context:
+            self.contexts[url] = context
+        if self.on_enqueue:
+            await self.on_enqueue(url)
+
+    async def save_data(self, data: dict):
+        pass
+
+
+CategorySDK = ListingSDK
+
+
+class DetailSDK:
+    """SDK passed to detail extractors, which save the data for one meeting"""
+
+    def __init__(self, page):
+        self.page = page
+        self.data = None
+
+    async def enqueue(self, url: str):
+        pass
+
+    async def save_data(self, data: dict):
+        self.data = data
+
+
+@dataclass
+class Stage:
+    """
+    An extractor `scrape(sdk, url, context)` and how to report and run it. Stages
+    with `browser=False` get StaticPages instead of browser pages, for extractors
+    that only read server-rendered HTML. Routes in the render routes manifest
+    override this for the URLs they match.
+    """
+
+    scrape: Callable[..., Awaitable[None]]
+    description: str = ""
+    concurrency: Optional[int] = None
+    browser: bool = True
+
+
+class Orchestrator:
+    """
+    Runs a scraper's category, listing and detail stages.
+
+    Subclasses set `scraper_name`, `agency_name`, `timezone`, `start_url` and
+    `default_title`, and declare `listing` and `detail` stages (plus `category`
+    if listing pages have to be discovered first). `get_listing_url` and
+    `get_source_url` turn the URLs enqueued by extractors into absolute URLs.
+    Requests for resources the extractors don't need are blocked by a
+    ResourcePolicy, which `resource_blocking` can adjust. If the category stage
+    finds one listing page per year, `year_archive` limits them to the years in
+    the horizon (see years_in_horizon).
+    """
+
+    scraper_name = None
+    agency_name = None
+    timezone = "America/Detroit"
+    start_url = None
+    default_title = "Meeting"
+
+    category: Optional[Stage] = None
+    listing: Stage = None
+    detail: Stage = None
+    # Keyword arguments for ResourcePolicy.from_env, like allow_types=["stylesheet"]
+    resource_blocking = {}
+    year_archive = False
+
+    def __init__(
+        self,
+        headless: bool = True,
+        max_items: Optional[int] = None,
+        detail_concurrency: int = DETAIL_CONCURRENCY,
+        listing_concurrency: int = LISTING_CONCURRENCY,
+        retries: int = DETAIL_RETRIES,
+        routes: Optional[RenderRoutes] = None,
+    ):
+        self.headless = headless
+        self.max_items = max_items
+        self.detail_concurrency = detail_concurrency
+        self.listing_concurrency = listing_concurrency
+        self.retries = retries
+        self.listing_urls = []
+        self.event_urls = []
+        self.event_contexts = {}
+        self.observer = DataCollector(
+            self.scraper_name, self.timezone, output_dir=OUTPUT_DIR
+        )
+        self.resource_policy = ResourcePolicy.from_env(**self.resource_blocking)
+        self.routes = routes or RenderRoutes.load(RENDER_ROUTES_PATH)
+        self.stats = {"saved": 0, "skipped": 0, "errors": 0}
+        self.timings = {}
+        self.started_at = None
+
+    def get_listing_url(self, listing_url: str) -> str:
+        return listing_url
+
+    def get_source_url(self, event_url: str) -> str:
+        return event_url
+
+    def print_stage(self, name: str, stage: Stage):
+        stages = [s for s in ["category", "listing", "detail"] if getattr(self, s)]
+        print("\n" + "=" * 60)
+        print(
+            f"[Stage {stages.index(name) + 1}/{len(stages)}] "
+            f"{name.title()} Stage - {stage.description}"
+        )
+        print("=" * 60)
+
+    async def run_category_stage(self, page):
+        self.print_stage("category", self.category)
+        started = time.monotonic()
+
+        category_sdk = CategorySDK(page, self.listing_urls)
+        await self.category.scrape(category_sdk, self.start_url, {})
+        if self.year_archive:
+            found = len(self.listing_urls)
+            # The SDK holds this list, so it's filtered in place
+            self.listing_urls[:] = years_in_horizon(self.listing_urls)
+            print(f"\n{len(self.listing_urls)} of {found} years are in the horizon")
+
+        self.timings["category"] = time.monotonic() - started
+        print(f"\nFound {len(self.listing_urls)} listing URLs")
+        return self.listing_urls
+
+    async def run_listing_stage(self, page, on_enqueue=None, pool=None):
+        """
+        Run the listing extractor on the start URL, or on each URL found by the
+        category stage using `pool` (or just `page`) for the listing pages
+        """
+        self.print_stage("listing", self.listing)
+        started = time.monotonic()
+
+        if not self.category:
+            listing_sdk = ListingSDK(
+                page, self.event_urls, self.event_contexts, on_enqueue=on_enqueue
+            )
+            await self.listing.scrape(listing_sdk, self.start_url, {})
+        else:
+            self.listing_urls = [self.get_listing_url(u) for u in self.listing_urls]
+            print(f"\nProcessing {len(self.listing_urls)} listing pages...")
+
+            async def scrape_listing_page(listing_page, listing_url):
+                await listing_page.goto(
+                    listing_url, wait_until="domcontentloaded", timeout=PAGE_TIMEOUT
+                )
+                listing_sdk = ListingSDK(
+                    listing_page,
+                    self.event_urls,
+                    self.event_contexts,
+                    on_enqueue=on_enqueue,
+                )
+                await self.listing.scrape(listing_sdk, listing_url, {})
+                print(f"  ✓ {listing_url}")
+
+            await map_with_pages(
+                pool or PagePool.for_page(page), self.listing_urls, scrape_listing_page
+            )
+
+        self.event_urls = list(dict.fromkeys(self.event_urls))
+        self.timings["listing"] = time.monotonic() - started
+        print(f"\nFound {len(self.event_urls)} unique event URLs")
+        return self.event_urls
+
+    async def run_detail_stage(self, page, event_url: str) -> Optional[dict]:
+        """Extract the data for an event, retrying failures. Returns None if every
+        attempt fails, and an empty dict if the extractor saved nothing."""
+        source_url = self.get_source_url(event_url)
+        context = self.event_contexts.get(event_url, {})
+        for attempt in range(self.retries + 1):
+            try:
+                await page.goto(
+                    source_url, wait_until="domcontentloaded", timeout=PAGE_TIMEOUT
+                )
+                detail_sdk = DetailSDK(page)
+                await self.detail.scrape(detail_sdk, source_url, context)
+                return detail_sdk.data or {}
+            except Exception as e:
+                if attempt < self.retries:
+                    print(f"    ↻ Retrying {event_url}: {e}")
+                    await asyncio.sleep(2**attempt)
+                else:
+                    print(f"    ✗ Error extracting {event_url}: {e}")
+        return None
+
+    def transform_to_ocd_format(self, raw_data: dict, source_url: str) -> dict:
+        all_day = raw_data.get("is_all_day_event")
+        if all_day is None:
+            all_day = False
+
+        location = raw_data.get("location") or {}
+
+        return create_ocd_event(
+            title=raw_data.get("title") or self.default_title,
+            start_time=raw_data["start_time"],
+            scraper_name=self.scraper_name,
+            agency_name=self.agency_name,
+            timezone=self.timezone,
+            description=raw_data.get("description") or "",
+            classification=raw_data.get("classification"),
+            location=location,
+            links=raw_data.get("links") or [],
+            end_time=raw_data.get("end_time"),
+            is_cancelled=raw_data.get("is_cancelled", False),
+            source_url=source_url,
+            all_day=all_day,
+        )
+
+    async def save_detail(self, event_url: str, raw_data: Optional[dict]):
+        processed = sum(self.stats.values()) + 1
+        print(f"\n[{processed}] {event_url}")
+
+        if raw_data is None:
+            # Every attempt failed, or a page couldn't be opened for it
+            self.stats["errors"] += 1
+            print("  ✗ Failed")
+        elif raw_data.get("start_time"):
+            ocd_event = self.transform_to_ocd_format(
+                raw_data, self.get_source_url(event_url)
+            )
+            await self.observer.on_save_data(ocd_event)
+            if "first_item" not in self.timings:
+                self.timings["first_item"] = time.monotonic() - self.started_at
+            self.stats["saved"] += 1
+            print(f"  ✓ Saved: {ocd_event['name']}")
+        else:
+            self.stats["skipped"] += 1
+            print("  ✗ Skipped (missing start_time)")
+
+    @classmethod
+    def max_pages(cls) -> int:
+        """The number of browser pages open at once with the default concurrency and
+        each stage's default routing"""
+        pages = 0
+        if (cls.category or cls.listing).browser:
+            pages += 1
+        if cls.category and cls.listing.browser:
+            pages += cls.listing.concurrency or LISTING_CONCURRENCY
+        if cls.detail.browser:
+            pages += cls.detail.concurrency or DETAIL_CONCURRENCY
+        return pages
+
+    async def run(self, context=None):
+        """Run every stage in a browser context, launching a browser for a new
+        context if one isn't given"""
+        if context is not None:
+            await self.run_in_context(context)
+            return
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=self.headless)
+            try:
+                context = await browser.new_context()
+                await self.run_in_context(context)
+            finally:
+                await browser.close()
+
+    async def run_in_context(self, context):
+        """Run every stage in a browser context, then write the output"""
+        print("=" * 70)
+        print(self.agency_name)
+        print("=" * 70)
+
+        self.started_at = time.monotonic()
+        await context.route("**/*", self.resource_policy.route)
+        static_context = StaticContext()
+
+        def stage_pool(stage, size, resolve):
+            return RoutedPagePool(
+                self.routes,
+                PagePool(context, size),
+                PagePool(static_context, size),
+                BROWSER if stage.browser else HTTP,
+                resolve=resolve,
+            )
+
+        first_stage = self.category or self.listing
+        if self.routes.uses_browser(self.start_url, first_stage.browser):
+            page = await context.new_page()
+        else:
+            page = await static_context.new_page()
+        listing_pool = stage_pool(
+            self.listing,
+            self.listing.concurrency or self.listing_concurrency,
+            self.get_listing_url,
+        )
+        detail_pool = stage_pool(
+            self.detail,
+            self.detail.concurrency or self.detail_concurrency,
+            self.get_source_url,
+        )
+        complete = False
+        try:
+            if self.category:
+                await self.run_category_stage(page)
+
+            # Detail pages are fetched as the listing stage finds them
+            detail_started = time.monotonic()
+            stream = DetailStream(
+                detail_pool,
+                self.run_detail_stage,
+                self.save_detail,
+                max_items=self.max_items,
+            )
+            await stream.run(
+                lambda enqueue: self.run_listing_stage(
+                    page, on_enqueue=enqueue, pool=listing_pool
+                )
+            )
+            self.timings["detail"] = time.monotonic() - detail_started
+            complete = True
+        finally:
+            await listing_pool.close()
+            await detail_pool.close()
+            await page.close()
+            await static_context.close()
+            # Upload meetings still buffered for Azure, even if the run failed. The
+            # output file is only completed if the run finished.
+            await self.observer.close(complete=complete)
+        self.timings["total"] = time.monotonic() - self.started_at
+
+        print("\n" + "=" * 70)
+        print(f"Scraping Complete: {self.observer.count} meetings")
+        print(
+            f"Saved {self.stats['saved']}, skipped {self.stats['skipped']}, "
+            f"errors {self.stats['errors']}"
+        )
+        print(self.resource_policy.summary())
+        print(
+            "Timing: "
+            + ", ".join(f"{name} {secs:.1f}s" for name, secs in self.timings.items())
+        )
+        print("=" * 70)
+
+        self.write_output()
+
+    def write_output(self) -> Optional[Path]:
+        """Report where the meetings were written as JSON lines"""
+        output_file = self.observer.output_file
+        if output_file is None:
+            return None
+        print(f"\n✓ Data saved to: {output_file}")
+
+        print(self.observer.upload_summary())
+        return output_file
@@ -0,0 +1,185 @@
+"""
+Runs every Harambe scraper in one process with one shared browser.
+
+Each scraper gets its own BrowserContext, so cookies and storage stay isolated,
+but only one Chromium is started. Pages across all scrapers are limited by a
+global page budget (HARAMBE_PAGE_BUDGET): a scraper starts once the pages it
+needs are free, and one that needs more than the whole budget runs by itself.
+
+Usage:
+    python -m harambe_scrapers.runner [scraper_name ...]
+"""
+
+import argparse
+import asyncio
+import importlib
+import os
+import pkgutil
+import sys
+import time
+import traceback
+from contextlib import asynccontextmanager
+
+from harambe.contrib.playwright.harness import DEFAULT_VIEWPORT
+from harambe.user_agent import compute_user_agent, random_user_agent
+from playwright.async_api import async_playwright
+
+import harambe_scrapers
+from harambe_scrapers.concurrency import YEAR_CONCURRENCY
+from harambe_scrapers.orchestrator import Orchestrator
+
+PAGE_BUDGET = int(os.getenv("HARAMBE_PAGE_BUDGET", 8))
+
+
+def context_harness(context):
+    """
+    A Harambe harness that opens pages in an existing browser context instead of
+    launching a browser, for passing to `SDK.run(..., harness=...)`. Like
+    playwright_harness, it applies the `headers` and `cookies` options to the
+    context and calls the `on_new_page` option with each new page.
+    """
+
+    @asynccontextmanager
+    async def harness(on_new_page=None, headers=None, cookies=(), **harness_options):
+        if headers:
+            await context.set_extra_http_headers(headers)
+        if cookies:
+            await context.add_cookies(cookies)
+
+        async def page_factory(*args, **kwargs):
+            page = await context.new_page()
+            if on_new_page:
+                await on_new_page(page)
+            return page
+
+        yield page_factory
+
+    return harness
+
+
+class PageBudget:
+    """Pages that can be open at once across every scraper in a run"""
+
+    def __init__(self, size: int = PAGE_BUDGET):
+        self.size = max(1, size)
+        self.available = self.size
+        self.condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def reserve(self, pages: int):
+        pages = min(max(1, pages), self.size)
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.available >= pages)
+            self.available -= pages
+        try:
+            yield pages
+        finally:
+            async with self.condition:
+                self.available += pages
+                self.condition.notify_all()
+
+
+def discover_scrapers(names=None) -> list:
+    """Import the scraper modules in this package, which define SCRAPER_NAME and an
+    async `main(context=None)`. If names are given, only those are returned.
+    Otherwise scrapers that set SCRAPY_SPIDER are skipped."""
+    modules = []
+    for module_info in pkgutil.iter_modules(harambe_scrapers.__path__):
+        if module_info.ispkg or module_info.name == "runner":
+            continue
+        module = importlib.import_module(f"harambe_scrapers.{module_info.name}")
+        if not hasattr(module, "SCRAPER_NAME") or not hasattr(module, "main"):
+            continue
+        if names and module.SCRAPER_NAME not in names:
+            continue
+        if not names and getattr(module, "SCRAPY_SPIDER", None):
+            # Covered by a Scrapy spider in the regular crawl
+            continue
+        modules.append(module)
+    return modules
+
+
+def orchestrator_class(module):
+    """The Orchestrator subclass defined in a scraper module, or None"""
+    for value in vars(module).values():
+        if (
+            isinstance(value, type)
+            and issubclass(value, Orchestrator)
+            and value.__module__ == module.__name__
+        ):
+            return value
+    return None
+
+
+def scraper_pages(module) -> int:
+    """The number of pages a scraper can have open at once. SDK scrapers use one
+    page, plus YEAR_CONCURRENCY pages if they set YEAR_ARCHIVE (see
+    map_year_pages)."""
+    orchestrator_cls = orchestrator_class(module)
+    if orchestrator_cls:
+        return orchestrator_cls.max_pages()
+    return 1 + (YEAR_CONCURRENCY if getattr(module, "YEAR_ARCHIVE", False) else 0)
+
+
+async def new_scraper_context(browser):
+    """A browser context with the options playwright_harness gives its own"""
+    return await browser.new_context(
+        viewport=DEFAULT_VIEWPORT,
+        ignore_https_errors=True,
+        user_agent=await compute_user_agent(random_user_agent),
+    )
+
+
+async def run_scraper(browser, budget: PageBudget, module) -> dict:
+    name = module.SCRAPER_NAME
+    async with budget.reserve(scraper_pages(module)) as pages:
+        print(f"Starting: {name} ({pages} pages)")
+        started = time.monotonic()
+        context = await new_scraper_context(browser)
+        error = None
+        try:
+            await module.main(context)
+        except Exception as e:
+            error = e
+            print(f"✗ {name} failed: {e}")
+            traceback.print_exc()
+        finally:
+            await context.close()
+    return {"name": name, "seconds": time.monotonic() - started, "error": error}
+
+
+async def run_scrapers(modules, headless: bool = True, page_budget: int = PAGE_BUDGET):
+    budget = PageBudget(page_budget)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            results = await asyncio.gather(
+                *(run_scraper(browser, budget, module) for module in modules)
+            )
+        finally:
+            await browser.close()
+
+    print("\n" + "=" * 70)
+    print("Harambe run complete")
+    print("=" * 70)
+    for result in results:
+        status = "failed" if result["error"] else "ok"
+        print(f"{result['name']:<40} {status:<8} {result['seconds']:>7.1f}s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Harambe scrapers")
+    parser.add_argument("scrapers", nargs="*", help="scraper names (default: all)")
+    parser.add_argument("--page-budget", type=int, default=PAGE_BUDGET)
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run_scrapers(discover_scrapers(args.scrapers), page_budget=args.page_budget)
+    )
+    if any(result["error"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Read many fields from a page in one round trip.
+
+Each `await locator.text_content()` or `element.get_attribute(...)` in an
+extractor is a separate call to the browser, so reading a few fields for every
+item in a list adds up to hundreds of calls per page. `snapshot` takes a
+declarative spec of the fields to read and resolves it inside a single
+`page.evaluate`, returning plain JSON. On a StaticPage the same spec is resolved
+with parsel, so extractors can use it in browserless stages too.
+
+A spec maps names to fields. A field is either a CSS selector string, which reads
+the innerText of the first match, or a dict with:
+
+    selector   CSS selector, relative to the enclosing element. Omit it to read
+               the enclosing element itself.
+    text       "inner" (innerText, the default) or "content" (textContent)
+    attribute  read this attribute instead of text
+    url        read this attribute resolved to an absolute URL, like the `href`
+               property
+    all        return a list with a value for every match instead of the first
+    fields     a nested spec resolved for each match, returning dicts
+
+Missing elements and attributes are None, or [] for fields with `all`.
+
+    data = await snapshot(page, {
+        "title": "h1.title",
+        "links": {
+            "selector": ".attachments a",
+            "all": True,
+            "fields": {"title": {"text": "content"}, "url": {"url": "href"}},
+        },
+    })
+"""
+
+from typing import Any, Union
+from urllib.parse import urljoin
+
+from harambe_scrapers.static_page import StaticPage, _inner_text
+
+SNAPSHOT_JS = """
+(spec) => {
+  const readValue = (element, field) => {
+    if (field.fields) {
+      return readSpec(element, field.fields);
+    }
+    if (field.url) {
+      const value = element.getAttribute(field.url);
+      if (value === null) {
+        return null;
+      }
+      try {
+        return new URL(value, document.baseURI).href;
+      } catch (e) {
+        // Like the href property, which is the attribute if it can't be resolved
+        return value;
+      }
+    }
+    if (field.attribute) {
+      return element.getAttribute(field.attribute);
+    }
+    return field.text === "content" ? element.textContent : element.innerText;
+  };
+  const readField = (root, field) => {
+    if (typeof field === "string") {
+      field = { selector: field };
+    }
+    if (field.all) {
+      const matches = field.selector
+        ? Array.from(root.querySelectorAll(field.selector))
+        : [root];
+      return matches.map((element) => readValue(element, field));
+    }
+    const element = field.selector ? root.querySelector(field.selector) : root;
+    return element ? readValue(element, field) : null;
+  };
+  const readSpec = (root, fields) => {
+    const data = {};
+    for (const [name, field] of Object.entries(fields)) {
+      data[name] = readField(root, field);
+    }
+    return data;
+  };
+  return readSpec(document, spec);
+}
+"""
+
+
+def _read_value(element, field: dict, base_url: str) -> Any:
+    if field.get("fields"):
+        return _read_spec(element, field["fields"], base_url)
+    if field.get("url"):
+        value = element.attrib.get(field["url"])
+        return None if value is None else urljoin(base_url, value)
+    if field.get("attribute"):
+        return element.attrib.get(field["attribute"])
+    if field.get("text") == "content":
+        return "".join(element.xpath(".//text()").getall())
+    return _inner_text(element.root)
+
+
+def _read_field(root, field: Union[str, dict], base_url: str) -> Any:
+    if isinstance(field, str):
+        field = {"selector": field}
+    matches = root.css(field["selector"]) if field.get("selector") else [root]
+    if field.get("all"):
+        return [_read_value(element, field, base_url) for element in matches]
+    return _read_value(matches[0], field, base_url) if matches else None
+
+
+def _read_spec(root, spec: dict, base_url: str) -> dict:
+    return {name: _read_field(root, field, base_url) for name, field in spec.items()}
+
+
+async def snapshot(page, spec: dict) -> dict:
+    """Resolve a field spec against the current document of `page`"""
+    if isinstance(page, StaticPage):
+        return _read_spec(page.document, spec, page.url)
+    return await page.evaluate(SNAPSHOT_JS, spec)
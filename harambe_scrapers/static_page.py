@@ -0,0 +1,350 @@
+"""
+A browserless stand-in for the parts of Playwright's Page API that extractors use
+on server-rendered pages.
+
+StaticPage fetches pages over HTTP and runs selectors with parsel, so an extractor
+that only reads the DOM (query_selector, inner_text, get_attribute,
+locator(...).text_content(), wait_for_selector and so on) runs the same way
+without a browser. Nothing is rendered and no JavaScript runs, so pages that build
+their content in the browser still need Playwright.
+
+StaticContext has the `new_page` and `close` methods of a BrowserContext, so it can
+back a PagePool, and `static_harness` can be passed to `SDK.run(..., harness=...)`.
+"""
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from typing import Optional
+from urllib.parse import urljoin
+
+import aiohttp
+from lxml.html import tostring
+from parsel import Selector, SelectorList
+from playwright.async_api import Error, TimeoutError
+
+# Playwright's default navigation timeout, in milliseconds
+NAVIGATION_TIMEOUT = 30000
+# Elements whose text isn't rendered
+HIDDEN_TAGS = {"head", "script", "style", "noscript", "template", "title"}
+# Elements rendered on their own lines by inner_text()
+BLOCK_TAGS = {
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "fieldset",
+    "figcaption",
+    "figure",
+    "footer",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "main",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "tr",
+    "ul",
+}
+
+
+def _inner_text(root) -> str:
+    """
+    Approximate a browser's innerText for an lxml element: hidden elements are
+    skipped, whitespace is collapsed, and block elements and <br> start new lines
+    """
+    parts = []
+
+    def walk(element):
+        tag = element.tag if isinstance(element.tag, str) else None
+        if tag in HIDDEN_TAGS:
+            return
+        if tag == "br":
+            parts.append("\n")
+        elif tag in BLOCK_TAGS:
+            parts.append("\n")
+        if tag and element.text:
+            parts.append(element.text)
+        for child in element:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+
+    walk(root)
+    lines = [
+        re.sub(r"[ \t\r\f\v]+", " ", line).strip()
+        for line in "".join(parts).split("\n")
+    ]
+    return "\n".join(line for line in lines if line)
+
+
+class StaticElementHandle:
+    """An element of a StaticPage, with the reading methods of an ElementHandle"""
+
+    def __init__(self, selector: Selector):
+        self.selector = selector
+
+    async def inner_text(self) -> str:
+        return _inner_text(self.selector.root)
+
+    async def text_content(self) -> str:
+        return "".join(self.selector.xpath(".//text()").getall())
+
+    async def inner_html(self) -> str:
+        root = self.selector.root
+        return (root.text or "") + "".join(
+            tostring(child, encoding=str, method="html") for child in root
+        )
+
+    async def get_attribute(self, name: str) -> Optional[str]:
+        return self.selector.attrib.get(name)
+
+    async def query_selector(self, selector: str) -> Optional["StaticElementHandle"]:
+        matches = self.selector.css(selector)
+        return StaticElementHandle(matches[0]) if matches else None
+
+    async def query_selector_all(self, selector: str) -> list:
+        return [StaticElementHandle(match) for match in self.selector.css(selector)]
+
+    async def wait_for_selector(self, selector: str, **kwargs) -> "StaticElementHandle":
+        element = await self.query_selector(selector)
+        if element is None:
+            raise TimeoutError(f"No element matches {selector!r}")
+        return element
+
+    async def is_visible(self) -> bool:
+        return True
+
+    async def scroll_into_view_if_needed(self, **kwargs):
+        pass
+
+
+class StaticLocator:
+    """
+    A locator on a StaticPage. As in Playwright, methods that read a single element
+    raise TimeoutError when nothing matches and Error when several elements do.
+    """
+
+    def __init__(self, root, selector: str, index: Optional[int] = None):
+        self.root = root
+        self.selector = selector
+        self.index = index
+
+    def _matches(self) -> list:
+        matches = self.root.css(self.selector)
+        if self.index is None:
+            return list(matches)
+        try:
+            return [matches[self.index]]
+        except IndexError:
+            return []
+
+    def _element(self) -> StaticElementHandle:
+        matches = self._matches()
+        if not matches:
+            raise TimeoutError(f"No element matches {self.selector!r}")
+        if len(matches) > 1:
+            raise Error(
+                f"strict mode violation: {self.selector!r} resolved to "
+                f"{len(matches)} elements"
+            )
+        return StaticElementHandle(matches[0])
+
+    def nth(self, index: int) -> "StaticLocator":
+        matches = self.root.css(self.selector)
+        if index < 0:
+            index += len(matches)
+        return StaticLocator(self.root, self.selector, index)
+
+    @property
+    def first(self) -> "StaticLocator":
+        return self.nth(0)
+
+    @property
+    def last(self) -> "StaticLocator":
+        return self.nth(-1)
+
+    def locator(self, selector: str) -> "StaticLocator":
+        return StaticLocator(SelectorList(self._matches()), selector)
+
+    async def count(self) -> int:
+        return len(self._matches())
+
+    async def all(self) -> list:
+        return [self.nth(index) for index in range(len(self._matches()))]
+
+    async def text_content(self, **kwargs) -> str:
+        return await self._element().text_content()
+
+    async def inner_text(self, **kwargs) -> str:
+        return await self._element().inner_text()
+
+    async def inner_html(self, **kwargs) -> str:
+        return await self._element().inner_html()
+
+    async def get_attribute(self, name: str, **kwargs) -> Optional[str]:
+        return await self._element().get_attribute(name)
+
+    async def all_text_contents(self) -> list:
+        return [
+            await StaticElementHandle(match).text_content() for match in self._matches()
+        ]
+
+    async def all_inner_texts(self) -> list:
+        return [
+            await StaticElementHandle(match).inner_text() for match in self._matches()
+        ]
+
+    async def is_visible(self, **kwargs) -> bool:
+        return bool(self._matches())
+
+    async def wait_for(self, **kwargs):
+        self._element()
+
+
+class StaticResponse:
+    def __init__(self, status: int, headers: dict, url: str):
+        self.status = status
+        self.headers = headers
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+class StaticPage:
+    """
+    The reading parts of Playwright's Page API over HTML fetched with `session`
+    (an aiohttp ClientSession) or set with `set_content`
+    """
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        self.session = session
+        self.url = "about:blank"
+        self.closed = False
+        self.document = Selector(text="<html></html>")
+
+    async def goto(
+        self, url: str, timeout: Optional[float] = None, **kwargs
+    ) -> StaticResponse:
+        """Fetch a page. `timeout` is in milliseconds like Playwright's, with 0 for
+        no timeout, and raises TimeoutError when it's exceeded."""
+        url = urljoin(self.url, url)
+        timeout = NAVIGATION_TIMEOUT if timeout is None else timeout
+        client_timeout = aiohttp.ClientTimeout(
+            total=timeout / 1000 if timeout else None
+        )
+        try:
+            async with self.session.get(url, timeout=client_timeout) as response:
+                html = await response.text()
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(
+                f"Timeout {timeout:g}ms exceeded navigating to {url}"
+            ) from e
+        self.url = str(response.url)
+        self.document = Selector(text=html, base_url=self.url)
+        return StaticResponse(response.status, dict(response.headers), self.url)
+
+    async def set_content(self, html: str, **kwargs):
+        self.document = Selector(text=html, base_url=self.url)
+
+    async def content(self) -> str:
+        return self.document.get()
+
+    async def title(self) -> str:
+        return self.document.css("title::text").get(default="").strip()
+
+    async def query_selector(self, selector: str) -> Optional[StaticElementHandle]:
+        matches = self.document.css(selector)
+        return StaticElementHandle(matches[0]) if matches else None
+
+    async def query_selector_all(self, selector: str) -> list:
+        return [StaticElementHandle(match) for match in self.document.css(selector)]
+
+    def locator(self, selector: str) -> StaticLocator:
+        return StaticLocator(self.document, selector)
+
+    async def wait_for_selector(self, selector: str, **kwargs) -> StaticElementHandle:
+        """Returns the first match, or raises TimeoutError right away since a static
+        page won't change"""
+        element = await self.query_selector(selector)
+        if element is None:
+            raise TimeoutError(f"No element matches {selector!r}")
+        return element
+
+    async def inner_text(self, selector: str, **kwargs) -> str:
+        return await (await self.wait_for_selector(selector)).inner_text()
+
+    async def text_content(self, selector: str, **kwargs) -> str:
+        return await (await self.wait_for_selector(selector)).text_content()
+
+    async def get_attribute(self, selector: str, name: str, **kwargs) -> Optional[str]:
+        return await (await self.wait_for_selector(selector)).get_attribute(name)
+
+    async def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+    async def wait_for_timeout(self, timeout: float):
+        pass
+
+    async def route(self, url, handler):
+        """Nothing is loaded besides the document, so there's nothing to route"""
+
+    async def close(self):
+        self.closed = True
+
+
+class StaticContext:
+    """Opens StaticPages that share one HTTP session, like a BrowserContext"""
+
+    def __init__(self, headers: Optional[dict] = None):
+        self.headers = headers
+        self.session = None
+
+    async def new_page(self) -> StaticPage:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(headers=self.headers)
+        return StaticPage(self.session)
+
+    async def route(self, url, handler):
+        pass
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+@asynccontextmanager
+async def static_harness(headers: Optional[dict] = None, on_new_page=None, **options):
+    """A Harambe harness that opens StaticPages instead of launching a browser"""
+    context = StaticContext(headers=headers)
+    try:
+
+        async def page_factory(*args, **kwargs):
+            page = await context.new_page()
+            if on_new_page:
+                await on_new_page(page)
+            return page
+
+        yield page_factory
+    finally:
+        await context.close()
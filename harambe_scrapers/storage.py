@@ -0,0 +1,226 @@
+"""
+Blob storage for the Harambe publish path.
+
+The observers, merge and archive scripts read and write blobs through a
+BlobStorage, so the same code runs against an Azure container or a local
+directory. BLOB_STORAGE picks the backend:
+
+    BLOB_STORAGE=azure  (default) the container in AZURE_CONTAINER, or the
+                        script's default, with AZURE_ACCOUNT_NAME and
+                        AZURE_ACCOUNT_KEY
+    BLOB_STORAGE=local  a directory for each container under BLOB_STORAGE_DIR,
+                        for running the publish path offline
+"""
+
+import os
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+BLOB_STORAGE = os.getenv("BLOB_STORAGE", "azure")
+BLOB_STORAGE_DIR = os.getenv("BLOB_STORAGE_DIR", "blob_storage")
+DEFAULT_CONTAINER = "meetings-feed-cle"
+# Azure's limit for a single append block
+MAX_APPEND_BLOCK_BYTES = 4 * 1024 * 1024
+STREAM_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+class BlobNotFound(Exception):
+    pass
+
+
+def _is_not_found(error: Exception) -> bool:
+    # azure-storage-blob is optional, so its exception isn't imported
+    return type(error).__name__ == "ResourceNotFoundError"
+
+
+def _to_bytes(data: Union[bytes, str]) -> bytes:
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+class BlobStorage:
+    """Reads and writes named blobs in one container"""
+
+    def get(self, name: str) -> bytes:
+        """The content of a blob. Raises BlobNotFound if it doesn't exist."""
+        raise NotImplementedError
+
+    def put(self, name: str, data: Union[bytes, str]):
+        """Create or replace a blob"""
+        raise NotImplementedError
+
+    def append(self, name: str, data: Union[bytes, str]) -> int:
+        """Append to a blob, creating it if needed. Returns the number of uploads."""
+        raise NotImplementedError
+
+    def list(self, prefix: str = "") -> List[str]:
+        """The names of blobs starting with `prefix`"""
+        raise NotImplementedError
+
+    def stream(
+        self, name: str, chunk_size: int = STREAM_CHUNK_BYTES
+    ) -> Iterator[bytes]:
+        """The content of a blob in chunks, without reading it all into memory"""
+        raise NotImplementedError
+
+
+class AzureBlobStorage(BlobStorage):
+    def __init__(self, container_client):
+        self.container_client = container_client
+        self.append_blobs = set()
+
+    @classmethod
+    def from_env(cls, container: str, service_client_cls):
+        """
+        Connect with AZURE_ACCOUNT_NAME and AZURE_ACCOUNT_KEY. Callers pass in
+        BlobServiceClient, which is optional in some environments.
+        """
+        if service_client_cls is None:
+            raise ImportError("azure-storage-blob is required")
+
+        account_name = os.getenv("AZURE_ACCOUNT_NAME")
+        account_key = os.getenv("AZURE_ACCOUNT_KEY")
+
+        if not account_name or not account_key:
+            raise ValueError("AZURE_ACCOUNT_NAME and AZURE_ACCOUNT_KEY required")
+
+        conn_str = (
+            f"DefaultEndpointsProtocol=https;"
+            f"AccountName={account_name};"
+            f"AccountKey={account_key};"
+            f"EndpointSuffix=core.windows.net"
+        )
+        blob_service = service_client_cls.from_connection_string(conn_str)
+        return cls(blob_service.get_container_client(container))
+
+    def get(self, name: str) -> bytes:
+        try:
+            return self.container_client.get_blob_client(name).download_blob().readall()
+        except Exception as e:
+            if _is_not_found(e):
+                raise BlobNotFound(name) from e
+            raise
+
+    def put(self, name: str, data: Union[bytes, str]):
+        self.container_client.get_blob_client(name).upload_blob(data, overwrite=True)
+        self.append_blobs.discard(name)
+
+    def _open_append_blob(self, blob_client):
+        """
+        Create the append blob. A blob already at the path is kept, and converted
+        if it isn't an append blob.
+        """
+        existing = b""
+        try:
+            if blob_client.get_blob_properties().blob_type == "AppendBlob":
+                return 0
+            existing = blob_client.download_blob().readall()
+        except Exception as e:
+            # Anything but a missing blob could mean replacing existing output
+            if not _is_not_found(e):
+                raise
+        blob_client.create_append_blob()
+        return self._append_blocks(blob_client, existing)
+
+    def _append_blocks(self, blob_client, data: bytes) -> int:
+        uploads = 0
+        for offset in range(0, len(data), MAX_APPEND_BLOCK_BYTES):
+            blob_client.append_block(data[offset : offset + MAX_APPEND_BLOCK_BYTES])
+            uploads += 1
+        return uploads
+
+    def append(self, name: str, data: Union[bytes, str]) -> int:
+        blob_client = self.container_client.get_blob_client(name)
+        uploads = 0
+        if name not in self.append_blobs:
+            uploads += self._open_append_blob(blob_client)
+            self.append_blobs.add(name)
+        return uploads + self._append_blocks(blob_client, _to_bytes(data))
+
+    def list(self, prefix: str = "") -> List[str]:
+        return [
+            blob.name
+            for blob in self.container_client.list_blobs(name_starts_with=prefix)
+        ]
+
+    def stream(
+        self, name: str, chunk_size: int = STREAM_CHUNK_BYTES
+    ) -> Iterator[bytes]:
+        blob_client = self.container_client.get_blob_client(name)
+        try:
+            downloader = blob_client.download_blob(max_chunk_get_size=chunk_size)
+        except Exception as e:
+            if _is_not_found(e):
+                raise BlobNotFound(name) from e
+            raise
+        yield from downloader.chunks()
+
+
+class LocalBlobStorage(BlobStorage):
+    """Blobs as files under a directory, with "/" in names as subdirectories"""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    @classmethod
+    def from_env(cls, container: str):
+        return cls(Path(BLOB_STORAGE_DIR) / container)
+
+    def _path(self, name: str) -> Path:
+        return self.root / name
+
+    def get(self, name: str) -> bytes:
+        try:
+            return self._path(name).read_bytes()
+        except FileNotFoundError as e:
+            raise BlobNotFound(name) from e
+
+    def put(self, name: str, data: Union[bytes, str]):
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Replace the file at once, like an upload, so readers never see part of it
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(_to_bytes(data))
+        os.replace(tmp_path, path)
+
+    def append(self, name: str, data: Union[bytes, str]) -> int:
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(_to_bytes(data))
+        return 1
+
+    def list(self, prefix: str = "") -> List[str]:
+        if not self.root.exists():
+            return []
+        names = (
+            path.relative_to(self.root).as_posix()
+            for path in self.root.rglob("*")
+            if path.is_file() and not path.name.endswith(".tmp")
+        )
+        return sorted(name for name in names if name.startswith(prefix))
+
+    def stream(
+        self, name: str, chunk_size: int = STREAM_CHUNK_BYTES
+    ) -> Iterator[bytes]:
+        try:
+            f = open(self._path(name), "rb")
+        except FileNotFoundError as e:
+            raise BlobNotFound(name) from e
+        with f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+
+def storage_from_env(
+    container: str, service_client_cls=None, backend: Optional[str] = None
+) -> BlobStorage:
+    """
+    The BlobStorage for a container, using BLOB_STORAGE unless `backend` is given.
+    `service_client_cls` is azure's BlobServiceClient, for the Azure backend.
+    """
+    backend = backend or BLOB_STORAGE
+    if backend == "local":
+        return LocalBlobStorage.from_env(container)
+    if backend == "azure":
+        return AzureBlobStorage.from_env(container, service_client_cls)
+    raise ValueError(f"Unknown BLOB_STORAGE backend: {backend}")
@@ -1,14 +1,16 @@
 """Archive Harambe scraper URLs to Wayback Machine."""
 
 import asyncio
-import json
-import os
 import random
 from urllib.parse import quote, unquote, urlparse
 
 import aiohttp
 from azure.storage.blob import BlobServiceClient
 
+from harambe_scrapers.feed import scraper_slug
+from harambe_scrapers.jsonl import JsonLinesReader
+from harambe_scrapers.storage import storage_from_env
+
 CITY = "cle"
 CONTAINER = f"meetings-feed-{CITY}"
 WAYBACK_URL = "https://web.archive.org/save/"
@@ -23,49 +25,25 @@ HARAMBE_SCRAPERS = [
     "cle_transit",
     "cuya_arts_culture",
     "cuya_county_council",
-    "cuya_emergency_services_advisory",
 ]
 
 
-def download_latest_json(container=CONTAINER):
-    """Download latest.json from Azure."""
-    account_name = os.getenv("AZURE_ACCOUNT_NAME")
-    account_key = os.getenv("AZURE_ACCOUNT_KEY")
-
-    if not account_name or not account_key:
-        raise ValueError("AZURE_ACCOUNT_NAME and AZURE_ACCOUNT_KEY required")
-
-    conn_str = (
-        f"DefaultEndpointsProtocol=https;"
-        f"AccountName={account_name};"
-        f"AccountKey={account_key};"
-        f"EndpointSuffix=core.windows.net"
+def stream_latest_json(container=CONTAINER):
+    """Stream the meetings in latest.json from blob storage."""
+    return JsonLinesReader(
+        storage_from_env(container, BlobServiceClient).stream("latest.json")
     )
 
-    blob_service = BlobServiceClient.from_connection_string(conn_str)
-    blob_client = blob_service.get_container_client(container).get_blob_client(
-        "latest.json"
-    )
 
-    content = blob_client.download_blob().readall().decode("utf-8")
-    return [json.loads(line) for line in content.strip().split("\n") if line]
+def download_latest_json(container=CONTAINER):
+    """Download latest.json from blob storage."""
+    return list(stream_latest_json(container))
 
 
 def filter_harambe_meetings(meetings, scrapers=HARAMBE_SCRAPERS):
     """Filter to only Harambe scraper meetings."""
-    return [
-        m
-        for m in meetings
-        if any(
-            s
-            in (
-                m.get("extras", {}).get("cityscrapers/id")
-                or m.get("extras", {}).get("cityscrapers.org/id")
-                or ""
-            )
-            for s in scrapers
-        )
-    ]
+    scrapers = set(scrapers)
+    return [m for m in meetings if scraper_slug(m) in scrapers]
 
 
 def is_valid_url(url):
@@ -158,10 +136,12 @@ async def archive_batch(urls):
 def main():
     print(f"Harambe Archive - {CITY.upper()}", flush=True)
 
-    meetings = download_latest_json()
-    print(f"Downloaded {len(meetings)} meetings", flush=True)
-
+    # Only Harambe meetings are kept while latest.json is streamed
+    meetings = stream_latest_json()
     harambe_meetings = filter_harambe_meetings(meetings)
+    print(f"Downloaded {meetings.count} meetings", flush=True)
+    if meetings.bad_lines:
+        print(f"Skipped {meetings.bad_lines} invalid JSON lines", flush=True)
     print(f"Found {len(harambe_meetings)} Harambe meetings", flush=True)
 
     all_urls = []
@@ -0,0 +1,63 @@
+"""Compare full-text and page-bounded extraction of the Tri-C agenda date."""
+
+import argparse
+import re
+import time
+import tracemalloc
+from io import BytesIO, StringIO
+
+from pdfminer.high_level import extract_text_to_fp
+from pdfminer.layout import LAParams
+
+from city_scrapers.spiders.cuya_community_college import LAPARAMS, match_agenda_date
+from city_scrapers.utils.pdf import find_in_pdf_pages
+
+DEFAULT_PDF = "tests/files/cuya_community_college_agenda.pdf"
+
+
+def full_text_date(body):
+    """The previous approach: lay out every page, then search the text"""
+    out_str = StringIO()
+    extract_text_to_fp(BytesIO(body), out_str, laparams=LAParams(**LAPARAMS))
+    date_match = re.search(r"[A-Z][a-z]{2,8} \d{1,2},? \d{4}", out_str.getvalue())
+    return date_match.group() if date_match else None
+
+
+def page_bounded_date(body):
+    return find_in_pdf_pages(body, match_agenda_date, LAPARAMS)
+
+
+def measure(fn, body, runs):
+    """Return the result, mean seconds per run and peak traced memory in bytes"""
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = fn(body)
+    elapsed = (time.perf_counter() - start) / runs
+
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default=DEFAULT_PDF)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.path, "rb") as f:
+        body = f.read()
+
+    print(f"{'method':<14} {'date':<20} {'ms/run':>8} {'peak KiB':>9}")
+    for name, fn in [
+        ("full text", full_text_date),
+        ("page bounded", page_bounded_date),
+    ]:
+        result, elapsed, peak = measure(fn, body, args.runs)
+        print(f"{name:<14} {result!s:<20} {elapsed * 1000:>8.1f} {peak / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
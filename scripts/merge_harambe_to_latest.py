@@ -1,6 +1,5 @@
 import json
 import os
-from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List
 
@@ -12,62 +11,67 @@ except ImportError:
     AZURE_AVAILABLE = False
     print("Warning: azure-storage-blob not installed")
 
-DEFAULT_CONTAINER = "meetings-feed-cle"
+from harambe_scrapers.feed import FeedIndex, is_upcoming, scraper_slug, upcoming_cutoff
+from harambe_scrapers.jsonl import JsonLinesReader
+from harambe_scrapers.storage import DEFAULT_CONTAINER, BlobStorage, storage_from_env
+
 OUTPUT_BLOB = "latest.json"
 UPCOMING_BLOB = "upcoming.json"
 LOCAL_OUTPUT_DIR = "harambe_scrapers/output"
-START_TIME_KEY = "start_time"
-
-
-def get_azure_container_client(container_name: str = DEFAULT_CONTAINER):
-    """Get Azure container client."""
-    if not AZURE_AVAILABLE:
-        raise ImportError("azure-storage-blob is required")
 
-    account_name = os.getenv("AZURE_ACCOUNT_NAME")
-    account_key = os.getenv("AZURE_ACCOUNT_KEY")
 
-    if not account_name or not account_key:
-        raise ValueError("AZURE_ACCOUNT_NAME and AZURE_ACCOUNT_KEY required")
-
-    conn_str = (
-        f"DefaultEndpointsProtocol=https;"
-        f"AccountName={account_name};"
-        f"AccountKey={account_key};"
-        f"EndpointSuffix=core.windows.net"
+def get_blob_storage(container_name: str = DEFAULT_CONTAINER) -> BlobStorage:
+    """Get the blob storage for the container (Azure unless BLOB_STORAGE=local)."""
+    return storage_from_env(
+        container_name, BlobServiceClient if AZURE_AVAILABLE else None
     )
 
-    blob_service = BlobServiceClient.from_connection_string(conn_str)
-    return blob_service.get_container_client(container_name)
+
+def stream_blob_from_azure(
+    blob_name: str, container_name: str = DEFAULT_CONTAINER
+) -> JsonLinesReader:
+    """Stream the meetings in a JSON lines blob, one at a time."""
+    storage = get_blob_storage(container_name)
+    return JsonLinesReader(storage.stream(blob_name))
 
 
 def download_blob_from_azure(
     blob_name: str, container_name: str = DEFAULT_CONTAINER
 ) -> List[Dict]:
-    """Download a JSON blob from Azure blob storage."""
-    container_client = get_azure_container_client(container_name)
-    blob_client = container_client.get_blob_client(blob_name)
+    """Download a JSON blob from blob storage."""
+    reader = stream_blob_from_azure(blob_name, container_name)
 
     print(f"Downloading {blob_name} from {container_name}...")
 
     try:
-        content = blob_client.download_blob().readall().decode("utf-8")
-
-        data = []
-        for line in content.strip().split("\n"):
-            if line:
-                try:
-                    data.append(json.loads(line))
-                except json.JSONDecodeError as e:
-                    print(f"  Skipping invalid JSON line: {e}")
-                    continue
-
-        print(f"  Downloaded {len(data)} meetings")
-        return data
+        data = list(reader)
     except Exception as e:
         print(f"  Failed to download {blob_name}: {e}")
         return []
 
+    if reader.bad_lines:
+        print(f"  Skipped {reader.bad_lines} invalid JSON lines")
+    print(f"  Downloaded {len(data)} meetings")
+    return data
+
+
+def load_feed(blob_name: str, container_name: str = DEFAULT_CONTAINER) -> FeedIndex:
+    """Stream a JSON lines blob into a FeedIndex, which is empty if it fails."""
+    reader = stream_blob_from_azure(blob_name, container_name)
+
+    print(f"Downloading {blob_name} from {container_name}...")
+
+    try:
+        feed = FeedIndex(reader)
+    except Exception as e:
+        print(f"  Failed to download {blob_name}: {e}")
+        return FeedIndex()
+
+    if reader.bad_lines:
+        print(f"  Skipped {reader.bad_lines} invalid JSON lines")
+    print(f"  Downloaded {len(feed)} meetings")
+    return feed
+
 
 def read_harambe_from_local(output_dir: str = LOCAL_OUTPUT_DIR) -> List[Dict]:
     """Read latest Harambe scraper outputs from local files."""
@@ -125,21 +129,11 @@ def read_harambe_from_local(output_dir: str = LOCAL_OUTPUT_DIR) -> List[Dict]:
 
 def filter_out_scrapers(meetings: List[Dict], scraper_names: List[str]) -> List[Dict]:
     """Remove all meetings from specified scrapers."""
-    filtered = []
-    removed_count = 0
-
-    for meeting in meetings:
-        meeting_id = (
-            meeting.get("extras", {}).get("cityscrapers/id")
-            or meeting.get("extras", {}).get("cityscrapers.org/id")
-            or ""
-        )
-        is_harambe = any(scraper_name in meeting_id for scraper_name in scraper_names)
-
-        if not is_harambe:
-            filtered.append(meeting)
-        else:
-            removed_count += 1
+    scraper_names = set(scraper_names)
+    filtered = [
+        meeting for meeting in meetings if scraper_slug(meeting) not in scraper_names
+    ]
+    removed_count = len(meetings) - len(filtered)
 
     if removed_count > 0:
         print(f"  Removed {removed_count} old Harambe meetings")
@@ -152,14 +146,13 @@ def upload_to_azure(
     blob_name: str = OUTPUT_BLOB,
     container_name: str = DEFAULT_CONTAINER,
 ) -> None:
-    """Upload merged data to Azure blob storage."""
-    container_client = get_azure_container_client(container_name)
-    blob_client = container_client.get_blob_client(blob_name)
+    """Upload merged data to blob storage."""
+    storage = get_blob_storage(container_name)
 
     jsonlines_content = "\n".join(
         json.dumps(meeting, ensure_ascii=False) for meeting in data
     )
-    blob_client.upload_blob(jsonlines_content, overwrite=True)
+    storage.put(blob_name, jsonlines_content)
 
     print(f"  Uploaded to {blob_name} ({len(data)} meetings)")
 
@@ -168,14 +161,14 @@ def upload_scraper_files_to_azure(
     output_dir: str = LOCAL_OUTPUT_DIR,
     container_name: str = DEFAULT_CONTAINER,
 ) -> None:
-    """Upload individual Harambe scraper output files to Azure root level."""
+    """Upload individual Harambe scraper output files to the container root."""
     output_path = Path(output_dir)
 
     if not output_path.exists():
         print(f"  Local output directory not found: {output_dir}")
         return
 
-    container_client = get_azure_container_client(container_name)
+    storage = get_blob_storage(container_name)
 
     by_scraper = {}
     for json_file in output_path.glob("*.json"):
@@ -201,8 +194,7 @@ def upload_scraper_files_to_azure(
                 content = f.read()
 
             blob_name = f"{scraper_name}.json"
-            blob_client = container_client.get_blob_client(blob_name)
-            blob_client.upload_blob(content, overwrite=True)
+            storage.put(blob_name, content)
             print(f"  Uploaded {blob_name}")
         except Exception as e:
             print(f"  Failed to upload {scraper_name}.json: {e}")
@@ -210,13 +202,8 @@ def upload_scraper_files_to_azure(
 
 def filter_upcoming_meetings(meetings: List[Dict]) -> List[Dict]:
     """Filter meetings to only include future meetings (start_time > yesterday)."""
-    yesterday_iso = (datetime.now() - timedelta(days=1)).isoformat()[:19]
-
-    upcoming = [
-        meeting for meeting in meetings if meeting[START_TIME_KEY][:19] > yesterday_iso
-    ]
-
-    return upcoming
+    cutoff = upcoming_cutoff()
+    return [meeting for meeting in meetings if is_upcoming(meeting, cutoff)]
 
 
 def main():
@@ -238,14 +225,12 @@ def main():
         "cle_transit",
         "cuya_arts_culture",
         "cuya_county_council",
-        "cuya_emergency_services_advisory",
     ]
 
     print(f"Harambe scrapers to process: {len(harambe_scrapers)} scrapers")
     print()
 
-    existing_latest = download_blob_from_azure(OUTPUT_BLOB, container_name)
-    existing_upcoming = download_blob_from_azure(UPCOMING_BLOB, container_name)
+    feed = load_feed(OUTPUT_BLOB, container_name)
 
     harambe_meetings = read_harambe_from_local(LOCAL_OUTPUT_DIR)
 
@@ -255,26 +240,23 @@ def main():
         print("  Make sure Harambe scrapers have run before this merge step")
         exit(1)
 
-    print("\nCleaning old Harambe data from latest.json...")
-    cleaned_latest = filter_out_scrapers(existing_latest, harambe_scrapers)
-
-    print("Cleaning old Harambe data from upcoming.json...")
-    cleaned_upcoming = filter_out_scrapers(existing_upcoming, harambe_scrapers)
-
-    harambe_upcoming = filter_upcoming_meetings(harambe_meetings)
+    print("\nReplacing Harambe meetings in latest.json...")
+    harambe_feed = FeedIndex(harambe_meetings)
+    for scraper_name in harambe_scrapers:
+        if scraper_name not in harambe_feed.partitions:
+            # A scraper without new output (e.g. a failed run) keeps its meetings
+            kept = len(feed.partition(scraper_name))
+            print(f"  {scraper_name}: no new output, keeping {kept} meetings")
+            continue
+        meetings = harambe_feed.partition(scraper_name)
+        removed = feed.replace(scraper_name, meetings)
+        print(f"  {scraper_name}: replaced {removed} with {len(meetings)} meetings")
 
     print("\nMerging data...")
-    merged_latest = cleaned_latest + harambe_meetings
-    merged_upcoming = cleaned_upcoming + harambe_upcoming
+    merged_latest, merged_upcoming = feed.latest_and_upcoming()
 
-    print(
-        f"  latest.json: {len(cleaned_latest)} conventional + "
-        f"{len(harambe_meetings)} harambe = {len(merged_latest)} total"
-    )
-    print(
-        f"  upcoming.json: {len(cleaned_upcoming)} conventional + "
-        f"{len(harambe_upcoming)} harambe = {len(merged_upcoming)} total"
-    )
+    print(f"  latest.json: {len(merged_latest)} total")
+    print(f"  upcoming.json: {len(merged_upcoming)} total")
 
     print("\nUploading merged data...")
     upload_to_azure(merged_latest, OUTPUT_BLOB, container_name)
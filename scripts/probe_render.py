@@ -0,0 +1,273 @@
+"""
+Check which pages need a browser, and write the render routes manifest.
+
+Each Harambe scraper's extractors, and the callbacks of spiders that use
+scrapy-playwright, are run on a sample of their pages twice: once on the HTML from a
+plain HTTP request and once on the page rendered in a browser. URL patterns where
+every sample, from every scraper that uses them, extracts the same data are routed
+to "http", and the rest to "browser". Orchestrators and
+CuyaNortheastOhioCoordinatingSpider read the manifest at runtime.
+
+Usage:
+    python -m scripts.probe_render [--samples 3] [--output render_routes.json]
+        [scraper_name ...]
+"""
+
+import argparse
+import asyncio
+import json
+from collections import defaultdict
+
+import aiohttp
+from playwright.async_api import async_playwright
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from scrapy.spiderloader import SpiderLoader
+from scrapy.utils.project import get_project_settings
+
+from city_scrapers.utils.render_routes import (
+    BROWSER,
+    HTTP,
+    RENDER_ROUTES_PATH,
+    RenderRoutes,
+    url_pattern,
+)
+from harambe_scrapers.runner import discover_scrapers, orchestrator_class
+from harambe_scrapers.static_page import StaticPage
+
+
+class ProbeSDK:
+    """Collects everything an extractor saves or enqueues"""
+
+    def __init__(self, page):
+        self.page = page
+        self.data = []
+        self.urls = []
+        self.contexts = {}
+
+    async def save_data(self, data):
+        self.data.append(data)
+
+    async def enqueue(self, url, context=None):
+        self.urls.append(url)
+        if context:
+            self.contexts[url] = context
+
+
+def normalize(outputs):
+    """Make extractor or callback output comparable"""
+    normalized = []
+    for output in outputs:
+        if isinstance(output, Request):
+            normalized.append({"request": output.url})
+        else:
+            normalized.append(json.loads(json.dumps(dict(output), default=str)))
+    return normalized
+
+
+def diff_fields(raw, rendered):
+    """The fields that differ between raw and rendered outputs"""
+    if len(raw) != len(rendered):
+        return ["count"]
+    fields = set()
+    for raw_output, rendered_output in zip(raw, rendered):
+        for key in set(raw_output) | set(rendered_output):
+            if raw_output.get(key) != rendered_output.get(key):
+                fields.add(key)
+    return sorted(fields)
+
+
+class Probe:
+    def __init__(self, session, browser_page, samples, name):
+        self.session = session
+        self.name = name
+        self.browser_page = browser_page
+        self.samples = samples
+        self.results = defaultdict(list)
+
+    def record(self, url, raw, rendered, error=None):
+        fields = ["error"] if error else diff_fields(raw, rendered)
+        self.results[url_pattern(url)].append(fields)
+        print(f"  {'✗' if fields else '✓'} {url}" + (f" {fields}" if fields else ""))
+
+    async def run_extractor(self, page, scrape, url, context):
+        sdk = ProbeSDK(page)
+        response = await page.goto(url)
+        if response is not None and response.status >= 400:
+            raise ValueError(f"HTTP {response.status}")
+        await scrape(sdk, url, context)
+        return sdk
+
+    async def compare_extractor(self, scrape, url, context=None):
+        """Run an extractor both ways, returning the rendered run's SDK"""
+        rendered = await self.run_extractor(
+            self.browser_page, scrape, url, context or {}
+        )
+        try:
+            raw = await self.run_extractor(
+                StaticPage(self.session), scrape, url, context or {}
+            )
+        except Exception as e:
+            self.record(url, [], [], error=e)
+            return rendered
+        self.record(
+            url,
+            normalize(raw.data) + [{"request": u} for u in raw.urls],
+            normalize(rendered.data) + [{"request": u} for u in rendered.urls],
+        )
+        return rendered
+
+    async def probe_orchestrator(self, orchestrator_cls):
+        orchestrator = orchestrator_cls(routes=RenderRoutes())
+        first_stage = orchestrator.category or orchestrator.listing
+        found = await self.compare_extractor(first_stage.scrape, orchestrator.start_url)
+
+        listings = [found]
+        if orchestrator.category:
+            listings = []
+            for listing_url in found.urls[: self.samples]:
+                listings.append(
+                    await self.compare_extractor(
+                        orchestrator.listing.scrape,
+                        orchestrator.get_listing_url(listing_url),
+                    )
+                )
+
+        event_urls = [url for listing in listings for url in listing.urls]
+        contexts = {}
+        for listing in listings:
+            contexts.update(listing.contexts)
+        for event_url in list(dict.fromkeys(event_urls))[: self.samples]:
+            await self.compare_extractor(
+                orchestrator.detail.scrape,
+                orchestrator.get_source_url(event_url),
+                contexts.get(event_url),
+            )
+
+    async def fetch_response(self, request, rendered, headers):
+        if rendered:
+            response = await self.browser_page.goto(request.url)
+            status = response.status if response else 200
+            body = (await self.browser_page.content()).encode()
+            url = self.browser_page.url
+        else:
+            async with self.session.get(request.url, headers=headers) as response:
+                status = response.status
+                body = await response.read()
+                url = str(response.url)
+        return HtmlResponse(
+            url, status=status, body=body, encoding="utf-8", request=request
+        )
+
+    async def compare_callback(self, spider, request, headers):
+        """Run a request's callback on both responses, returning the rendered
+        output"""
+        callback = request.callback or spider.parse
+        rendered = list(callback(await self.fetch_response(request, True, headers)))
+        try:
+            raw_response = await self.fetch_response(request, False, headers)
+            if raw_response.status >= 400:
+                raise ValueError(f"HTTP {raw_response.status}")
+            raw = list(callback(raw_response))
+        except Exception as e:
+            self.record(request.url, [], [], error=e)
+            return rendered
+        self.record(request.url, normalize(raw), normalize(rendered))
+        return rendered
+
+    async def probe_spider(self, spider_cls):
+        spider = spider_cls()
+        headers = {}
+        if spider_cls.custom_settings.get("USER_AGENT"):
+            headers["User-Agent"] = spider_cls.custom_settings["USER_AGENT"]
+        for request in list(spider.start_requests())[: self.samples]:
+            outputs = await self.compare_callback(spider, request, headers)
+            follow = [output for output in outputs if isinstance(output, Request)]
+            for follow_request in follow[: self.samples]:
+                await self.compare_callback(spider, follow_request, headers)
+
+    def update_routes(self, routes):
+        for pattern, samples in self.results.items():
+            differences = sorted({field for fields in samples for field in fields})
+            routes.set_probe(
+                pattern,
+                self.name,
+                BROWSER if differences else HTTP,
+                samples=len(samples),
+                differences=differences,
+            )
+
+
+def playwright_spiders(names=None):
+    """Spiders that download pages with scrapy-playwright"""
+    loader = SpiderLoader.from_settings(get_project_settings())
+    spiders = []
+    for name in loader.list():
+        spider_cls = loader.load(name)
+        handlers = (spider_cls.custom_settings or {}).get("DOWNLOAD_HANDLERS", {})
+        if not any("scrapy_playwright" in handler for handler in handlers.values()):
+            continue
+        if names and name not in names:
+            continue
+        spiders.append(spider_cls)
+    return spiders
+
+
+async def probe(names=None, samples=3, output=RENDER_ROUTES_PATH):
+    routes = RenderRoutes.load(output)
+    async with async_playwright() as p, aiohttp.ClientSession() as session:
+        browsers = {}
+
+        async def browser_page(browser_type="chromium"):
+            if browser_type not in browsers:
+                browsers[browser_type] = await getattr(p, browser_type).launch()
+            return await browsers[browser_type].new_page()
+
+        try:
+            for module in discover_scrapers(names):
+                orchestrator_cls = orchestrator_class(module)
+                if orchestrator_cls is None:
+                    continue
+                print(f"Probing {module.SCRAPER_NAME}")
+                probe = Probe(
+                    session, await browser_page(), samples, module.SCRAPER_NAME
+                )
+                try:
+                    await probe.probe_orchestrator(orchestrator_cls)
+                except Exception as e:
+                    print(f"  ✗ {module.SCRAPER_NAME} failed: {e}")
+                probe.update_routes(routes)
+
+            for spider_cls in playwright_spiders(names):
+                print(f"Probing {spider_cls.name}")
+                browser_type = spider_cls.custom_settings.get(
+                    "PLAYWRIGHT_BROWSER_TYPE", "chromium"
+                )
+                probe = Probe(
+                    session, await browser_page(browser_type), samples, spider_cls.name
+                )
+                try:
+                    await probe.probe_spider(spider_cls)
+                except Exception as e:
+                    print(f"  ✗ {spider_cls.name} failed: {e}")
+                probe.update_routes(routes)
+        finally:
+            for browser in browsers.values():
+                await browser.close()
+
+    routes.save(output)
+    print(f"\n✓ Wrote {len(routes.routes)} routes to {output}")
+    return routes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Probe which pages need a browser")
+    parser.add_argument("names", nargs="*", help="scraper or spider names")
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--output", default=RENDER_ROUTES_PATH)
+    args = parser.parse_args()
+    asyncio.run(probe(args.names, args.samples, args.output))
+
+
+if __name__ == "__main__":
+    main()
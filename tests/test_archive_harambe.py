@@ -25,10 +25,11 @@ def test_download_latest_json(mock_blob_service):
     blob_service.get_container_client.return_value = mock_container_client
     mock_container_client.get_blob_client.return_value = mock_blob_client
 
-    jsonlines = '{"id": "m1"}\n{"id": "m2"}'
-    mock_blob_client.download_blob.return_value.readall.return_value = (
-        jsonlines.encode()
-    )
+    # latest.json is streamed in chunks that split lines
+    mock_blob_client.download_blob.return_value.chunks.return_value = [
+        b'{"id": "m1"}\n{"i',
+        b'd": "m2"}',
+    ]
 
     with patch.dict(
         os.environ, {"AZURE_ACCOUNT_NAME": "test", "AZURE_ACCOUNT_KEY": "key"}
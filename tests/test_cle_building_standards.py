@@ -2,6 +2,7 @@
 Unit tests for Cleveland Board of Building Standards scraper (Harambe-based).
 """
 
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -74,3 +75,28 @@ async def test_main_function():
                 assert "observer" in call_args[1]
                 assert "harness" in call_args[1]
                 assert call_args[1]["headless"] is True
+
+
+@pytest.mark.asyncio
+async def test_scrape_fails_when_year_location_changes():
+    """A year page without the meeting location fails the run"""
+    year = str(datetime.now().year)
+    year_page = MagicMock()
+    year_page.goto = AsyncMock()
+    year_page.content = AsyncMock(return_value="<p>Room 100</p>")
+    year_page.close = AsyncMock()
+    page = MagicMock()
+    page.query_selector = AsyncMock(return_value=None)
+    page.context.new_page = AsyncMock(return_value=year_page)
+    sdk = MagicMock()
+    sdk.save_data = AsyncMock()
+    sdk.page = page
+    current = {"title": None, "time": None, "dropdown_items": [], "years": [year]}
+
+    with patch(
+        "harambe_scrapers.cle_building_standards.snapshot",
+        AsyncMock(return_value=current),
+    ):
+        with pytest.raises(ValueError, match=f"location has changed \\({year}\\)"):
+            await scrape(sdk, START_URL, {})
+    sdk.save_data.assert_not_called()
@@ -0,0 +1,184 @@
+"""
+Unit tests for the page pool and detail stream used by the Harambe orchestrators.
+"""
+
+import asyncio
+
+import pytest
+
+from harambe_scrapers.concurrency import (
+    DetailStream,
+    PagePool,
+    map_with_pages,
+    map_year_pages,
+)
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+
+@pytest.mark.asyncio
+async def test_map_with_pages_keeps_order_and_bounds_pages():
+    """Results follow the input order even when later items finish first"""
+    context = FakeContext()
+    pool = PagePool(context, size=3)
+    running = []
+    max_running = 0
+
+    async def fetch(page, item):
+        nonlocal max_running
+        running.append(item)
+        max_running = max(max_running, len(running))
+        await asyncio.sleep(0.01 * (10 - item))
+        running.remove(item)
+        return item * 2
+
+    results = await map_with_pages(pool, list(range(10)), fetch)
+    await pool.close()
+
+    assert results == [item * 2 for item in range(10)]
+    assert max_running == 3
+    assert len(context.pages) == 3
+    assert all(page.closed for page in context.pages)
+
+
+@pytest.mark.asyncio
+async def test_map_with_pages_isolates_errors():
+    """A failing item returns None without stopping the others"""
+    pool = PagePool(FakeContext(), size=2)
+
+    async def fetch(page, item):
+        if item == "/bad":
+            raise ValueError("Timeout")
+        return {"url": item}
+
+    results = await map_with_pages(pool, ["/a", "/bad", "/b"], fetch)
+
+    assert results == [{"url": "/a"}, None, {"url": "/b"}]
+
+
+@pytest.mark.asyncio
+async def test_detail_stream_starts_before_listing_finishes():
+    """Detail pages are fetched while the listing is still producing URLs"""
+    events = []
+    saved = []
+
+    async def fetch(page, url):
+        events.append(f"detail {url}")
+        await asyncio.sleep(0.01 if url == "/1" else 0)
+        return {"url": url}
+
+    async def save(url, result):
+        saved.append((url, result))
+
+    async def produce(enqueue):
+        for url in ["/1", "/2", "/1", "/3"]:
+            events.append(f"listing {url}")
+            await enqueue(url)
+            await asyncio.sleep(0.005)
+
+    stream = DetailStream(PagePool(FakeContext(), size=2), fetch, save, queue_size=1)
+    await stream.run(produce)
+
+    assert events.index("detail /1") < events.index("listing /3")
+    assert saved == [
+        ("/1", {"url": "/1"}),
+        ("/2", {"url": "/2"}),
+        ("/3", {"url": "/3"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_detail_stream_backpressure_and_max_items():
+    """The listing waits while the queue is full, and stops at max_items"""
+    release = asyncio.Event()
+    saved = []
+
+    async def fetch(page, url):
+        await release.wait()
+        return url
+
+    async def save(url, result):
+        saved.append(result)
+
+    enqueued = []
+
+    async def produce(enqueue):
+        for i in range(5):
+            await enqueue(f"/{i}")
+            enqueued.append(i)
+
+    stream = DetailStream(
+        PagePool(FakeContext(), size=1), fetch, save, queue_size=1, max_items=4
+    )
+    task = asyncio.create_task(stream.run(produce))
+    await asyncio.sleep(0.01)
+    # One URL is being fetched and one is waiting in the queue
+    assert enqueued == [0, 1]
+
+    release.set()
+    await task
+    assert saved == ["/0", "/1", "/2", "/3"]
+
+
+@pytest.mark.asyncio
+async def test_detail_stream_survives_failed_page():
+    """A page that can't be opened gives a None result and later URLs still run"""
+
+    class FailingContext(FakeContext):
+        async def new_page(self):
+            if not self.pages:
+                self.pages.append(None)
+                raise RuntimeError("Target closed")
+            return await super().new_page()
+
+    saved = []
+
+    async def fetch(page, url):
+        return url
+
+    async def save(url, result):
+        saved.append((url, result))
+
+    async def produce(enqueue):
+        for url in ["/1", "/2", "/3"]:
+            await enqueue(url)
+
+    stream = DetailStream(PagePool(FailingContext(), size=1), fetch, save)
+    await asyncio.wait_for(stream.run(produce), timeout=1)
+
+    assert saved == [("/1", None), ("/2", "/2"), ("/3", "/3")]
+
+
+@pytest.mark.asyncio
+async def test_map_year_pages_opens_pages_in_context():
+    """Year pages are loaded on new pages in the context of the scraper's page"""
+    context = FakeContext()
+    page = FakePage()
+    page.context = context
+
+    async def fetch(year_page, year):
+        await asyncio.sleep(0.01)
+        return year
+
+    results = await map_year_pages(page, ["2024", "2023", "2022"], fetch, 2)
+
+    assert results == ["2024", "2023", "2022"]
+    assert len(context.pages) == 2
+    assert all(year_page.closed for year_page in context.pages)
+    assert not page.closed
@@ -0,0 +1,59 @@
+from argparse import Namespace
+from unittest.mock import Mock
+
+import pytest
+from scrapy.exceptions import UsageError
+from scrapy.settings import Settings
+from twisted.internet.defer import Deferred
+
+from city_scrapers.commands.crawlall import Command
+
+SPIDERS = ["cle_cpc", "cuya_audit", "cuya_health"]
+
+
+@pytest.fixture
+def command():
+    cmd = Command()
+    cmd.settings = Settings({"CITY_SCRAPERS_MAX_CONCURRENT_SPIDERS": 2})
+    cmd.crawler_process = Mock(bootstrap_failed=False)
+    cmd.crawler_process.spider_loader.list.return_value = SPIDERS
+    cmd.crawls = {}
+
+    def crawl(spider_name):
+        cmd.crawls[spider_name] = Deferred()
+        return cmd.crawls[spider_name]
+
+    cmd.crawler_process.crawl.side_effect = crawl
+    return cmd
+
+
+def test_crawls_all_spiders_with_concurrency_cap(command):
+    command.run([], Namespace(max_concurrent=None))
+
+    assert list(command.crawls) == ["cle_cpc", "cuya_audit"]
+    command.crawler_process.start.assert_called_once()
+
+    command.crawls["cle_cpc"].callback(None)
+    assert list(command.crawls) == SPIDERS
+
+
+def test_crawls_provided_spiders(command):
+    command.run(["cuya_health", "cle_cpc"], Namespace(max_concurrent=1))
+
+    assert list(command.crawls) == ["cuya_health"]
+    command.crawls["cuya_health"].callback(None)
+    assert list(command.crawls) == ["cuya_health", "cle_cpc"]
+
+
+def test_failed_spider_does_not_block_queue(command):
+    command.run([], Namespace(max_concurrent=1))
+
+    command.crawls["cle_cpc"].errback(ValueError("bootstrap failed"))
+
+    assert "cuya_audit" in command.crawls
+    assert command.exitcode == 1
+
+
+def test_unknown_spider(command):
+    with pytest.raises(UsageError, match="not_a_spider"):
+        command.run(["cle_cpc", "not_a_spider"], Namespace(max_concurrent=None))
@@ -4,6 +4,7 @@ from os.path import dirname, join
 from city_scrapers_core.constants import ADVISORY_COMMITTEE, PASSED
 from city_scrapers_core.utils import file_response
 from freezegun import freeze_time
+from scrapy.utils.test import get_crawler
 
 from city_scrapers.spiders.cuya_audit import CuyaAuditSpider
 
@@ -87,3 +88,19 @@ def test_classification():
 
 def test_all_day():
     assert parsed_item["all_day"] is False
+
+
+@freeze_time("2024-01-25")
+def test_listing_window():
+    crawler = get_crawler(CuyaAuditSpider, {"LISTING_WINDOW_DAYS": 180})
+    windowed_spider = CuyaAuditSpider.from_crawler(crawler)
+    assert len(list(windowed_spider.parse(test_response))) == 2
+
+
+@freeze_time("2024-01-25")
+def test_listing_backfill():
+    crawler = get_crawler(
+        CuyaAuditSpider, {"LISTING_WINDOW_DAYS": 180, "LISTING_BACKFILL": True}
+    )
+    backfill_spider = CuyaAuditSpider.from_crawler(crawler)
+    assert len(list(backfill_spider.parse(test_response))) == 4
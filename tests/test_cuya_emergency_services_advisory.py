@@ -3,7 +3,7 @@ Unit tests for Cuyahoga County Emergency Services Advisory Board.
 """
 
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from playwright.async_api import async_playwright
@@ -19,6 +19,7 @@ from harambe_scrapers.extractor.cuya_emergency_services_advisory.detail import (
 from harambe_scrapers.extractor.cuya_emergency_services_advisory.listing import (
     scrape as listing_scrape,
 )
+from harambe_scrapers.orchestrator import Stage
 
 
 @pytest.fixture
@@ -87,24 +88,24 @@ async def test_orchestrator_converts_relative_urls_to_absolute():
     """Test that orchestrator correctly converts relative URLs to absolute URLs"""
     orchestrator = CuyaEmergencyServicesOrchestrator(headless=True)
     orchestrator.year_urls = ["emergency-services-advisory-board?year=2024"]
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-
-        with patch(
-            "harambe_scrapers.cuya_emergency_services_advisory." "listing_scrape"
-        ) as mock_listing:
-            mock_listing.return_value = None
-
-            await orchestrator.run_listing_stage(page)
-
-            assert orchestrator.year_urls[0].startswith("https://")
-            assert "emergency-services-advisory-board?year=2024" in (
-                orchestrator.year_urls[0]
-            )
-
-        await browser.close()
+    page = MagicMock()
+    page.goto = AsyncMock()
+    mock_listing = AsyncMock(return_value=None)
+
+    # The stage holds the extractor, so it's replaced rather than the module's
+    # listing_scrape
+    with patch.object(
+        CuyaEmergencyServicesOrchestrator,
+        "listing",
+        Stage(mock_listing, "Extracting event URLs"),
+    ):
+        await orchestrator.run_listing_stage(page)
+
+    assert orchestrator.year_urls[0].startswith("https://")
+    assert "emergency-services-advisory-board?year=2024" in orchestrator.year_urls[0]
+    mock_listing.assert_awaited_once()
+    assert mock_listing.call_args[0][1] == orchestrator.year_urls[0]
+    page.goto.assert_awaited_once()
 
 
 @pytest.mark.asyncio
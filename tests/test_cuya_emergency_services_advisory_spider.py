@@ -0,0 +1,177 @@
+from datetime import datetime
+from os.path import dirname, join
+
+import pytest
+from city_scrapers_core.constants import BOARD, COMMITTEE, PASSED
+from city_scrapers_core.items import Meeting
+from city_scrapers_core.utils import file_response
+from freezegun import freeze_time
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+from city_scrapers.middleware import ListingFingerprintMiddleware
+from city_scrapers.spiders.cuya_emergency_services_advisory import (
+    CuyaEmergencyServicesAdvisorySpider,
+)
+
+test_response = file_response(
+    join(dirname(__file__), "files", "cuya_emergency_services_advisory.html"),
+    url="https://cuyahogacounty.gov/boards-and-commissions/board-details/other/emergency-services-advisory-board",  # noqa
+)
+test_detail_response = file_response(
+    join(dirname(__file__), "files", "cuya_emergency_services_advisory_detail.html"),
+    url="https://cuyahogacounty.gov/boards-and-commissions/bc-event-detail//2024/01/09/ccesab-calendar/01-09-24---ccesab-emergency-management-committee",  # noqa
+)
+spider = CuyaEmergencyServicesAdvisorySpider()
+
+freezer = freeze_time("2024-12-20")
+freezer.start()
+
+parsed_requests = [request for request in spider.parse(test_response)]
+parsed_item = [item for item in spider._parse_detail(test_detail_response)][0]
+
+freezer.stop()
+
+
+def test_count():
+    detail_requests = [r for r in parsed_requests if r.callback != spider.parse]
+    assert len(detail_requests) == 14
+
+
+def test_year_links():
+    year_requests = [r for r in parsed_requests if r.callback == spider.parse]
+    # 2024 is already listed on the page, and earlier years are outside the
+    # default one-year horizon
+    assert len(year_requests) == 1
+    assert year_requests[0].url == (
+        "https://cuyahogacounty.gov/boards-and-commissions/board-details/other/emergency-services-advisory-board?year=2023"  # noqa
+    )
+    assert year_requests[0].meta["year_listing"]
+    # Year listings don't link to other years again
+    year_response = HtmlResponse(
+        year_requests[0].url,
+        body=test_response.body,
+        request=year_requests[0],
+    )
+    assert all(r.callback != spider.parse for r in spider.parse(year_response))
+
+
+@freeze_time("2024-12-20")
+def test_year_links_in_horizon():
+    """Year links follow the year archive horizon, not the listing window"""
+
+    def year_links(settings):
+        crawler = get_crawler(CuyaEmergencyServicesAdvisorySpider, settings)
+        horizon_spider = CuyaEmergencyServicesAdvisorySpider.from_crawler(crawler)
+        return [
+            r.url.split("=")[-1]
+            for r in horizon_spider.parse(test_response)
+            if r.callback == horizon_spider.parse
+        ]
+
+    assert year_links({"YEAR_ARCHIVE_YEARS": 3}) == ["2023", "2022", "2021"]
+    assert year_links({"YEAR_ARCHIVE_YEARS": 3, "LISTING_WINDOW_DAYS": 30}) == [
+        "2023",
+        "2022",
+        "2021",
+    ]
+    assert len(year_links({"LISTING_BACKFILL": True})) == 12
+
+
+def test_title():
+    assert parsed_item["title"] == "01/09/24 - CCESAB Emergency Management Committee"
+
+
+def test_start():
+    assert parsed_item["start"] == datetime(2024, 1, 9, 9, 0)
+
+
+def test_end():
+    assert parsed_item["end"] == datetime(2024, 1, 9, 10, 0)
+
+
+def test_id():
+    assert (
+        parsed_item["id"]
+        == "cuya_emergency_services_advisory/202401090900/x/01_09_24_ccesab_emergency_management_committee"  # noqa
+    )
+
+
+def test_status():
+    assert parsed_item["status"] == PASSED
+
+
+def test_location():
+    assert parsed_item["location"] == {
+        "name": "",
+        "address": "4747 East 49th Street, Cleveland, OH",
+    }
+
+
+def test_links():
+    assert parsed_item["links"] == [
+        {
+            "href": "https://cuyahogacms.blob.core.windows.net/home/docs/default-source/boards-and-commissions/other/ccesab/em/2024/010924-emagenda.pdf?sfvrsn=9a071cac_1",  # noqa
+            "title": "Agenda",
+        }
+    ]
+
+
+def test_classification():
+    assert parsed_item["classification"] == COMMITTEE
+    assert spider._parse_classification("12/12/24 - CCESAB Main") == BOARD
+
+
+def test_title_link_fallback():
+    intermediate_response = HtmlResponse(
+        "https://cuyahogacounty.gov/boards-and-commissions/bc-event-detail//2024/01/09/ccesab-calendar/",  # noqa
+        body=b"""<div class="moudle"><h2 class="title">
+            <a href="/boards-and-commissions/bc-event-detail/meeting">Meeting</a>
+            </h2></div>""",
+    )
+    (request,) = spider._parse_detail(intermediate_response)
+    assert not isinstance(request, Meeting)
+    assert request.url == (
+        "https://cuyahogacounty.gov/boards-and-commissions/bc-event-detail/meeting"
+    )
+    assert request.callback == spider._parse_detail
+
+    with pytest.raises(ValueError):
+        list(spider._parse_detail(HtmlResponse(test_response.url, body=b"<p></p>")))
+
+
+@freeze_time("2024-12-20")
+def test_year_links_replayed_for_unchanged_listing(tmp_path):
+    """A second run with an unchanged listing still requests the earlier years"""
+
+    def run():
+        crawler = get_crawler(
+            CuyaEmergencyServicesAdvisorySpider,
+            {
+                "LISTING_FINGERPRINT_ENABLED": True,
+                "LISTING_FINGERPRINT_DIR": str(tmp_path),
+                "YEAR_ARCHIVE_YEARS": 20,
+            },
+        )
+        run_spider = CuyaEmergencyServicesAdvisorySpider.from_crawler(crawler)
+        crawler.spider = run_spider
+        crawler.stats.open_spider(run_spider)
+        mw = ListingFingerprintMiddleware.from_crawler(crawler)
+        mw.spider_opened(run_spider)
+        (start_request,) = run_spider.start_requests()
+        response = test_response.replace(request=start_request)
+        outputs = list(
+            mw.process_spider_output(response, run_spider.parse(response), run_spider)
+        )
+        mw.spider_closed(run_spider, "finished")
+        year_requests = [r for r in outputs if r.meta.get("year_listing")]
+        return run_spider, crawler.stats, year_requests
+
+    _, _, first = run()
+    second_spider, stats, second = run()
+
+    assert stats.get_value("listing_fingerprint/unchanged") == 1
+    assert [r.url for r in second] == [r.url for r in first]
+    assert len(second) == 12
+    assert second[0].callback == second_spider.parse
+    assert second[0].meta["listing_fingerprint"]
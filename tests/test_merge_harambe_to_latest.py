@@ -9,10 +9,12 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from harambe_scrapers.feed import FeedIndex
 from scripts.merge_harambe_to_latest import (
     download_blob_from_azure,
     filter_out_scrapers,
     filter_upcoming_meetings,
+    main,
     read_harambe_from_local,
     upload_to_azure,
 )
@@ -27,10 +29,10 @@ def test_download_blob_from_azure(mock_blob_service):
     container.get_container_client.return_value = mock_container_client
     mock_container_client.get_blob_client.return_value = mock_blob_client
 
-    jsonlines = '{"id": "m1"}\nINVALID\n{"id": "m2"}'
-    mock_blob_client.download_blob.return_value.readall.return_value = (
-        jsonlines.encode()
-    )
+    mock_blob_client.download_blob.return_value.chunks.return_value = [
+        b'{"id": "m1"}\nINVA',
+        b'LID\n{"id": "m2"}',
+    ]
 
     with patch.dict(
         os.environ, {"AZURE_ACCOUNT_NAME": "test", "AZURE_ACCOUNT_KEY": "test"}
@@ -116,3 +118,104 @@ def test_upload_to_azure(mock_blob_service):
 
     assert len(lines) == 2
     assert json.loads(lines[0])["id"] == "m1"
+
+
+def test_filter_out_scrapers_matches_whole_slug():
+    """A scraper name that prefixes another scraper's doesn't match it"""
+    meetings = [
+        {"extras": {"cityscrapers/id": "cle_planning/20251113/meeting"}},
+        {"extras": {"cityscrapers/id": "cle_planning_commission/20251113/meeting"}},
+        {"extras": {"cityscrapers.org/id": "cle_planning/20251114/meeting"}},
+    ]
+
+    result = filter_out_scrapers(meetings, ["cle_planning"])
+
+    assert result == [meetings[1]]
+
+
+def test_feed_index_replaces_partitions():
+    """Partitions are replaced whole, and both feeds come out sorted by start"""
+    feed = FeedIndex(
+        [
+            {
+                "extras": {"cityscrapers/id": "cle_council/1"},
+                "start_time": "2025-01-01",
+            },
+            {
+                "extras": {"cityscrapers/id": "cle_transit/1"},
+                "start_time": "2025-01-02",
+            },
+            {
+                "extras": {"cityscrapers/id": "cle_council/2"},
+                "start_time": "2025-01-05",
+            },
+        ]
+    )
+    removed = feed.replace(
+        "cle_transit",
+        [
+            {
+                "extras": {"cityscrapers/id": "cle_transit/3"},
+                "start_time": "2025-01-06",
+            },
+            {
+                "extras": {"cityscrapers/id": "cle_transit/2"},
+                "start_time": "2025-01-03",
+            },
+        ],
+    )
+
+    latest, upcoming = feed.latest_and_upcoming(now=datetime(2025, 1, 5, 12))
+
+    assert removed == 1
+    assert [m["extras"]["cityscrapers/id"] for m in latest] == [
+        "cle_council/1",
+        "cle_transit/2",
+        "cle_council/2",
+        "cle_transit/3",
+    ]
+    assert upcoming == latest[2:]
+
+
+def test_main_merges_local_output(tmp_path, monkeypatch):
+    """main replaces Harambe scrapers with new output and keeps the rest"""
+    monkeypatch.setattr("harambe_scrapers.storage.BLOB_STORAGE", "local")
+    monkeypatch.setattr("harambe_scrapers.storage.BLOB_STORAGE_DIR", str(tmp_path))
+    monkeypatch.setenv("AZURE_CONTAINER", "test-container")
+    tomorrow = (datetime.now() + timedelta(days=1)).isoformat()[:19]
+
+    def meeting(meeting_id, start_time="2025-01-01T10:00:00"):
+        return {"extras": {"cityscrapers/id": meeting_id}, "start_time": start_time}
+
+    container = tmp_path / "test-container"
+    container.mkdir()
+    (container / "latest.json").write_text(
+        "\n".join(
+            json.dumps(m)
+            for m in [
+                meeting("cle_city_council/1"),
+                meeting("cle_transit/old"),
+                meeting("cuya_arts_culture/1"),
+            ]
+        )
+    )
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    (output_dir / "cle_transit_20251113_120000.json").write_text(
+        json.dumps(meeting("cle_transit/new", tomorrow)) + "\n"
+    )
+    monkeypatch.setattr("scripts.merge_harambe_to_latest.LOCAL_OUTPUT_DIR", output_dir)
+
+    main()
+
+    def ids(blob_name):
+        lines = (container / blob_name).read_text().splitlines()
+        return [json.loads(line)["extras"]["cityscrapers/id"] for line in lines]
+
+    assert ids("latest.json") == [
+        "cle_city_council/1",
+        "cuya_arts_culture/1",
+        "cle_transit/new",
+    ]
+    assert ids("upcoming.json") == ["cle_transit/new"]
+    assert ids("cle_transit.json") == ["cle_transit/new"]
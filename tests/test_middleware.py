@@ -0,0 +1,370 @@
+from datetime import datetime
+
+import pytest
+from city_scrapers_core.constants import CANCELLED, PASSED, TENTATIVE
+from city_scrapers_core.items import Meeting
+from city_scrapers_core.spiders import CityScrapersSpider
+from scrapy import Request, Spider, signals
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+from twisted.python.failure import Failure
+
+from city_scrapers.middleware import (
+    ConditionalRequestMiddleware,
+    HostThrottleMiddleware,
+    ListingFingerprintMiddleware,
+    PastMeetingCacheMiddleware,
+    PastMeetingCacheSpiderMiddleware,
+    SharedResponseMiddleware,
+)
+from city_scrapers.utils import ResponseStore
+
+DETAIL_URL = "https://cuyahogacounty.gov/boards-and-commissions/bc-event-detail/1"
+LISTING_URL = "https://www.boarddocs.com/oh/cmsd/board.nsf/XML-ActiveMeetings"
+
+
+def make_crawler(settings_dict):
+    crawler = get_crawler(Spider, settings_dict=settings_dict)
+    crawler.spider = crawler._create_spider("test")
+    crawler.stats.open_spider(crawler.spider)
+    return crawler
+
+
+@pytest.fixture
+def throttle():
+    HostThrottleMiddleware.slots.clear()
+    crawler = make_crawler(
+        {
+            "HOST_THROTTLE_ENABLED": True,
+            "HOST_THROTTLE_CONCURRENCY": 2,
+            "HOST_THROTTLE_DELAY": 0,
+            "HOST_THROTTLE_HOSTS": {"cuyahogacounty.gov": {"concurrency": 1}},
+        }
+    )
+    yield HostThrottleMiddleware.from_crawler(crawler), crawler.spider
+    HostThrottleMiddleware.slots.clear()
+
+
+def test_host_throttle_shares_domain_budget(throttle):
+    mw, spider = throttle
+    first = Request("https://cuyahogacounty.gov/boards-and-commissions/1")
+    second = Request("https://www.cuyahogacounty.gov/boards-and-commissions/2")
+
+    first_d = mw.process_request(first, spider)
+    second_d = mw.process_request(second, spider)
+
+    assert first_d.called
+    assert not second_d.called
+
+    mw.process_response(first, HtmlResponse(first.url), spider)
+    assert second_d.called
+
+
+def test_host_throttle_other_hosts_unaffected(throttle):
+    mw, spider = throttle
+    county = Request("https://cuyahogacounty.gov/1")
+    mw.process_request(county, spider)
+
+    requests = [Request("https://clecpc.org/{}".format(i)) for i in range(3)]
+    deferreds = [mw.process_request(request, spider) for request in requests]
+
+    assert [d.called for d in deferreds] == [True, True, False]
+
+    mw.process_exception(requests[0], ValueError(), spider)
+    assert deferreds[2].called
+
+
+@pytest.fixture
+def shared():
+    SharedResponseMiddleware.responses.clear()
+    SharedResponseMiddleware.in_flight.clear()
+    crawlers = [make_crawler({}) for _ in range(2)]
+    yield [(SharedResponseMiddleware.from_crawler(c), c.spider) for c in crawlers]
+    SharedResponseMiddleware.responses.clear()
+    SharedResponseMiddleware.in_flight.clear()
+
+
+def test_shared_response_downloads_once(shared):
+    (first_mw, first_spider), (second_mw, second_spider) = shared
+    first = Request(DETAIL_URL, meta={"shared_response": True})
+    second = Request(DETAIL_URL, meta={"shared_response": True})
+
+    assert first_mw.process_request(first, first_spider) is None
+    waiting = second_mw.process_request(second, second_spider)
+    assert not waiting.called
+
+    response = HtmlResponse(DETAIL_URL, body=b"<html></html>", request=first)
+    first_mw.process_response(first, response, first_spider)
+
+    assert waiting.result.request is second
+    assert waiting.result.body == response.body
+    assert "shared" in waiting.result.flags
+
+    third = Request(DETAIL_URL, meta={"shared_response": True})
+    assert second_mw.process_request(third, second_spider).request is third
+    assert second_spider.crawler.stats.get_value("shared_response/hit") == 1
+
+
+def test_shared_response_failure_downloads_separately(shared):
+    (first_mw, first_spider), (second_mw, second_spider) = shared
+    first = Request(DETAIL_URL, meta={"shared_response": True})
+    second = Request(DETAIL_URL, meta={"shared_response": True})
+
+    first_mw.process_request(first, first_spider)
+    waiting = second_mw.process_request(second, second_spider)
+    first_mw.process_response(first, HtmlResponse(DETAIL_URL, status=500), first_spider)
+
+    assert waiting.result is None
+    assert DETAIL_URL not in SharedResponseMiddleware.responses
+
+
+def test_shared_response_ignores_unmarked_requests(shared):
+    (mw, spider), _ = shared
+    request = Request(DETAIL_URL)
+
+    assert mw.process_request(request, spider) is None
+    assert DETAIL_URL not in SharedResponseMiddleware.in_flight
+
+
+@pytest.fixture
+def past_meeting_cache(tmp_path):
+    ResponseStore._open_stores.clear()
+    crawler = make_crawler(
+        {
+            "PAST_MEETING_CACHE_ENABLED": True,
+            "PAST_MEETING_CACHE_DIR": str(tmp_path),
+            "PAST_MEETING_CACHE_MIN_AGE_DAYS": 30,
+        }
+    )
+    yield (
+        PastMeetingCacheMiddleware.from_crawler(crawler),
+        PastMeetingCacheSpiderMiddleware.from_crawler(crawler),
+        crawler.spider,
+    )
+    ResponseStore._open_stores.clear()
+
+
+def crawl_detail(past_meeting_cache, start):
+    """Run a detail page through the cache middlewares, returning the response"""
+    mw, spider_mw, spider = past_meeting_cache
+    request = Request(DETAIL_URL, meta={"past_meeting_cache": True})
+    response = mw.process_request(request, spider)
+    if response is None:
+        response = HtmlResponse(DETAIL_URL, body=b"<html>detail</html>")
+        mw.process_response(request, response, spider)
+    response.request = request
+    meeting = Meeting(title="Meeting", start=start)
+    list(spider_mw.process_spider_output(response, [meeting], spider))
+    return response
+
+
+def test_past_meeting_cache_serves_old_meetings(past_meeting_cache):
+    mw, _, spider = past_meeting_cache
+
+    first = crawl_detail(past_meeting_cache, datetime(2020, 1, 1, 9))
+    second = crawl_detail(past_meeting_cache, datetime(2020, 1, 1, 9))
+
+    assert "cached" not in first.flags
+    assert "cached" in second.flags
+    assert second.body == b"<html>detail</html>"
+    assert spider.crawler.stats.get_value("past_meeting_cache/hit") == 1
+    assert spider.crawler.stats.get_value("past_meeting_cache/miss") == 1
+
+
+def test_past_meeting_cache_revalidates_upcoming_meetings(past_meeting_cache):
+    crawl_detail(past_meeting_cache, datetime.now())
+    response = crawl_detail(past_meeting_cache, datetime.now())
+
+    assert "cached" not in response.flags
+
+
+def test_past_meeting_cache_persists(past_meeting_cache, tmp_path):
+    mw, _, spider = past_meeting_cache
+    crawl_detail(past_meeting_cache, datetime(2020, 1, 1, 9))
+    mw.spider_closed(spider)
+
+    store = ResponseStore(str(tmp_path))
+    assert store.index[DETAIL_URL]["meeting_start"] == "2020-01-01T09:00:00"
+    assert store.retrieve_response(DETAIL_URL).body == b"<html>detail</html>"
+
+
+def test_response_store_evicts_least_recently_used(tmp_path):
+    store = ResponseStore(str(tmp_path), max_bytes=10)
+    store.store_response("https://example.com/1", HtmlResponse("https://a", body=b"1"))
+    store.store_response("https://example.com/2", HtmlResponse("https://b", body=b"2"))
+    store.index["https://example.com/1"]["accessed_at"] = 0
+    store.store_response(
+        "https://example.com/3", HtmlResponse("https://c", body=b"3" * 9)
+    )
+
+    assert store.save() == 1
+    assert "https://example.com/1" not in store.index
+    assert store.retrieve_response("https://example.com/2").body == b"2"
+
+
+@pytest.fixture
+def conditional(tmp_path):
+    ResponseStore._open_stores.clear()
+    crawler = make_crawler(
+        {"CONDITIONAL_REQUEST_ENABLED": True, "CONDITIONAL_REQUEST_DIR": str(tmp_path)}
+    )
+    yield ConditionalRequestMiddleware.from_crawler(crawler), crawler.spider
+    ResponseStore._open_stores.clear()
+
+
+def test_conditional_request_replays_not_modified(conditional):
+    mw, spider = conditional
+    first = Request(LISTING_URL, meta={"conditional_request": True})
+    assert mw.process_request(first, spider) is None
+    assert b"If-None-Match" not in first.headers
+    mw.process_response(
+        first,
+        HtmlResponse(
+            LISTING_URL,
+            body=b"<meetings></meetings>",
+            headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        ),
+        spider,
+    )
+
+    second = Request(LISTING_URL, meta={"conditional_request": True})
+    mw.process_request(second, spider)
+    assert second.headers["If-None-Match"] == b'"abc"'
+    assert second.headers["If-Modified-Since"] == b"Mon, 01 Jan 2024 00:00:00 GMT"
+
+    response = mw.process_response(
+        second, HtmlResponse(LISTING_URL, status=304), spider
+    )
+    assert response.status == 200
+    assert response.body == b"<meetings></meetings>"
+    assert response.request is second
+    assert "revalidated" in response.flags
+    assert spider.crawler.stats.get_value("conditional_request/bytes_saved") == 21
+
+
+def test_conditional_request_ignores_unmarked_requests(conditional):
+    mw, spider = conditional
+    request = Request(LISTING_URL)
+    mw.process_response(
+        request, HtmlResponse(LISTING_URL, body=b"a", headers={"ETag": "1"}), spider
+    )
+
+    assert mw.store.get(LISTING_URL) is None
+
+
+def test_conditional_request_persists(conditional, tmp_path):
+    mw, spider = conditional
+    request = Request(LISTING_URL, meta={"conditional_request": True})
+    mw.process_response(
+        request, HtmlResponse(LISTING_URL, body=b"a", headers={"ETag": "1"}), spider
+    )
+    mw.spider_closed(spider)
+
+    store = ResponseStore(str(tmp_path))
+    assert store.retrieve_response(LISTING_URL).headers["ETag"] == b"1"
+
+
+class ListingSpider(CityScrapersSpider):
+    name = "listing"
+    listing_fingerprint_css = ".bceventgrid"
+
+
+def make_fingerprint_middleware(tmp_path):
+    crawler = get_crawler(
+        ListingSpider,
+        settings_dict={
+            "LISTING_FINGERPRINT_ENABLED": True,
+            "LISTING_FINGERPRINT_DIR": str(tmp_path),
+        },
+    )
+    crawler.spider = crawler._create_spider()
+    crawler.stats.open_spider(crawler.spider)
+    mw = ListingFingerprintMiddleware.from_crawler(crawler)
+    mw.spider_opened(crawler.spider)
+    return mw, crawler.spider
+
+
+def listing_response(rows):
+    request = Request(LISTING_URL, meta={"listing_fingerprint": True})
+    body = "<div class='bceventgrid'>{}</div><p>{}</p>".format(rows, datetime.now())
+    return HtmlResponse(LISTING_URL, body=body, encoding="utf-8", request=request)
+
+
+def crawl_listing(mw, spider, rows):
+    """Run a listing and its detail page through the middleware, returning items"""
+    listing = listing_response(rows)
+    outputs = list(mw.process_spider_output(listing, [Request(DETAIL_URL)], spider))
+    requests = [output for output in outputs if isinstance(output, Request)]
+    for request in requests:
+        detail = HtmlResponse(DETAIL_URL, request=request)
+        meetings = [
+            Meeting(title="Meeting", start=datetime(2020, 1, 1, 9), status=TENTATIVE),
+            Meeting(title="Other", start=datetime(2020, 1, 2, 9), status=CANCELLED),
+        ]
+        outputs.extend(mw.process_spider_output(detail, meetings, spider))
+    mw.spider_closed(spider, "finished")
+    return outputs
+
+
+def test_listing_fingerprint_replays_unchanged_listing(tmp_path):
+    mw, spider = make_fingerprint_middleware(tmp_path)
+    first = crawl_listing(mw, spider, "<a href='/1'>Meeting</a>")
+    assert len(first) == 3
+
+    mw, spider = make_fingerprint_middleware(tmp_path)
+    second = crawl_listing(mw, spider, "<a href='/1'>  Meeting </a>")
+
+    assert [item["title"] for item in second] == ["Meeting", "Other"]
+    assert second[0]["start"] == datetime(2020, 1, 1, 9)
+    assert [item["status"] for item in second] == [PASSED, CANCELLED]
+    assert spider.crawler.stats.get_value("listing_fingerprint/unchanged") == 1
+
+
+def test_listing_fingerprint_crawls_changed_listing(tmp_path):
+    mw, spider = make_fingerprint_middleware(tmp_path)
+    crawl_listing(mw, spider, "<a href='/1'>Meeting</a>")
+
+    mw, spider = make_fingerprint_middleware(tmp_path)
+    outputs = crawl_listing(mw, spider, "<a href='/2'>Meeting</a>")
+
+    assert isinstance(outputs[0], Request)
+    assert spider.crawler.stats.get_value("listing_fingerprint/changed") == 1
+
+
+def test_listing_fingerprint_not_stored_after_failure(tmp_path):
+    mw, spider = make_fingerprint_middleware(tmp_path)
+    list(
+        mw.process_spider_output(
+            listing_response("<a href='/1'>Meeting</a>"), [], spider
+        )
+    )
+    mw.spider_closed(spider, "shutdown")
+
+    mw, spider = make_fingerprint_middleware(tmp_path)
+    assert mw.stored_entries == {}
+
+
+def test_listing_fingerprint_ignores_other_spiders_errors(tmp_path):
+    """Errors logged by other spiders in the process don't stop saving"""
+    mw, spider = make_fingerprint_middleware(tmp_path)
+    spider.crawler.stats.set_value("log_count/ERROR", 2)
+    crawl_listing(mw, spider, "<a href='/1'>Meeting</a>")
+
+    mw, spider = make_fingerprint_middleware(tmp_path)
+    assert LISTING_URL in mw.stored_entries
+
+
+def test_listing_fingerprint_not_stored_after_spider_error(tmp_path):
+    mw, spider = make_fingerprint_middleware(tmp_path)
+    listing = listing_response("<a href='/1'>Meeting</a>")
+    list(mw.process_spider_output(listing, [], spider))
+    spider.crawler.signals.send_catch_log(
+        signals.spider_error,
+        failure=Failure(ValueError("Unexpected detail page")),
+        response=listing,
+        spider=spider,
+    )
+    mw.spider_closed(spider, "finished")
+
+    mw, spider = make_fingerprint_middleware(tmp_path)
+    assert mw.stored_entries == {}
@@ -2,6 +2,9 @@
 Unit tests for observer classes (DataCollector).
 """
 
+import asyncio
+import json
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -9,6 +12,10 @@ import pytest
 from harambe_scrapers.observers import DataCollector
 
 
+class ResourceNotFoundError(Exception):
+    """Matched by name, like azure.core.exceptions.ResourceNotFoundError"""
+
+
 @pytest.fixture
 def mock_azure_env():
     with patch.dict(
@@ -28,8 +35,7 @@ async def test_data_collector_with_azure(mock_blob_client, mock_azure_env):
     """Test DataCollector with Azure configuration"""
     mock_container = MagicMock()
     mock_blob = MagicMock()
-    mock_blob.download_blob.side_effect = Exception("Not found")
-    mock_blob.upload_blob = MagicMock()
+    mock_blob.get_blob_properties.side_effect = ResourceNotFoundError()
     mock_container.get_blob_client.return_value = mock_blob
     blob_client = mock_blob_client.from_connection_string.return_value
     blob_client.get_container_client.return_value = mock_container
@@ -39,9 +45,13 @@ async def test_data_collector_with_azure(mock_blob_client, mock_azure_env):
     test_data = {"name": "Test Meeting", "start_time": "2025-01-15T09:00:00-05:00"}
 
     await collector.on_save_data(test_data)
+    # Meetings are buffered until close or a flush threshold
+    assert not mock_blob.append_block.called
+    await collector.close()
 
     assert mock_container.get_blob_client.called
-    assert mock_blob.upload_blob.called
+    assert mock_blob.create_append_blob.called
+    mock_blob.append_block.assert_called_once()
 
     blob_path_call = mock_container.get_blob_client.call_args[0][0]
     assert "cle_planning_commission.json" in blob_path_call
@@ -55,7 +65,7 @@ async def test_data_collector_without_azure():
 
     assert collector.scraper_name == "test_scraper"
     assert collector.timezone == "America/Detroit"
-    assert collector.data == []
+    assert collector.count == 0
     assert collector.run_start_time is not None
 
 
@@ -71,8 +81,8 @@ async def test_on_save_data():
 
     await collector.on_save_data(test_data)
 
-    assert len(collector.data) == 1
-    assert collector.data[0] == test_data
+    assert collector.count == 1
+    assert collector.sample == test_data
 
 
 @pytest.mark.asyncio
@@ -85,6 +95,113 @@ async def test_on_save_data_multiple():
     await collector.on_save_data(test_data_1)
     await collector.on_save_data(test_data_2)
 
-    assert len(collector.data) == 2
-    assert collector.data[0]["name"] == "Meeting 1"
-    assert collector.data[1]["name"] == "Meeting 2"
+    assert collector.count == 2
+    assert collector.sample["name"] == "Meeting 1"
+
+
+@pytest.mark.asyncio
+async def test_data_collector_streams_to_output_file(tmp_path):
+    """Meetings are written as they're saved, and the file is completed on close"""
+    collector = DataCollector("test_scraper", output_dir=tmp_path)
+    await collector.on_save_data({"name": "Meeting 1", "__url": "https://a.com"})
+    await collector.on_save_data({"name": "Meeting 2"})
+
+    (partial_file,) = tmp_path.iterdir()
+    assert partial_file.name.endswith(".json.partial")
+    assert len(partial_file.read_text().splitlines()) == 2
+
+    output_file = await collector.close()
+    assert output_file.name.startswith("test_scraper_")
+    assert list(tmp_path.iterdir()) == [output_file]
+    assert [json.loads(line) for line in output_file.read_text().splitlines()] == [
+        {"name": "Meeting 1"},
+        {"name": "Meeting 2"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_data_collector_keeps_partial_output(tmp_path):
+    """An incomplete run leaves its meetings in the .partial file"""
+    collector = DataCollector("test_scraper", output_dir=tmp_path)
+    await collector.on_save_data({"name": "Meeting 1"})
+
+    assert await collector.close(complete=False) is None
+    (partial_file,) = tmp_path.iterdir()
+    assert partial_file.name.endswith(".json.partial")
+    assert json.loads(partial_file.read_text()) == {"name": "Meeting 1"}
+
+
+@pytest.mark.asyncio
+@patch("harambe_scrapers.observers.BlobServiceClient")
+async def test_data_collector_appends_in_batches(mock_blob_client, mock_azure_env):
+    """Buffered meetings are appended once the size threshold is reached, without
+    downloading the blob again"""
+    mock_container = MagicMock()
+    mock_blob = MagicMock()
+    mock_blob.get_blob_properties.side_effect = ResourceNotFoundError()
+    mock_container.get_blob_client.return_value = mock_blob
+    blob_client = mock_blob_client.from_connection_string.return_value
+    blob_client.get_container_client.return_value = mock_container
+
+    collector = DataCollector("test_scraper", flush_bytes=150, flush_seconds=3600)
+    for day in range(1, 6):
+        await collector.on_save_data(
+            {"name": f"Meeting {day}", "start_time": f"2025-01-0{day}T09:00:00"}
+        )
+    await collector.close()
+
+    appended = b"".join(call[0][0] for call in mock_blob.append_block.call_args_list)
+    lines = appended.decode().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == [
+        f"Meeting {day}" for day in range(1, 6)
+    ]
+    assert 1 < collector.uploads < 5
+    assert collector.uploaded_bytes == len(appended)
+    mock_blob.create_append_blob.assert_called_once()
+    assert not mock_blob.download_blob.called
+    assert "5 meetings" in collector.upload_summary()
+
+
+@pytest.mark.asyncio
+@patch("harambe_scrapers.observers.BlobServiceClient")
+async def test_data_collector_retries_failed_flush(mock_blob_client, mock_azure_env):
+    """Meetings stay buffered when an append fails and are sent on the next flush"""
+    mock_container = MagicMock()
+    mock_blob = MagicMock()
+    mock_blob.get_blob_properties.return_value.blob_type = "AppendBlob"
+    mock_blob.append_block.side_effect = [Exception("Timed out"), None]
+    mock_container.get_blob_client.return_value = mock_blob
+    blob_client = mock_blob_client.from_connection_string.return_value
+    blob_client.get_container_client.return_value = mock_container
+
+    collector = DataCollector("test_scraper")
+    await collector.on_save_data({"name": "Meeting", "start_time": "2025-01-01"})
+    await collector.flush()
+    assert len(collector.buffer) == 1
+
+    await collector.close()
+    assert collector.buffer == []
+    assert collector.uploads == 1
+    # The existing append blob is reused
+    assert not mock_blob.create_append_blob.called
+
+
+@pytest.mark.asyncio
+async def test_data_collector_uploads_off_event_loop():
+    """Other coroutines keep running while a flush uploads"""
+    loop_ran = threading.Event()
+    storage = MagicMock()
+    storage.append.side_effect = lambda *args: 1 if loop_ran.wait(5) else 0
+
+    async def other_scraper():
+        loop_ran.set()
+
+    collector = DataCollector("test_scraper", flush_bytes=1)
+    collector.storage = storage
+    await asyncio.gather(
+        collector.on_save_data({"name": "Meeting", "start_time": "2025-01-01"}),
+        other_scraper(),
+    )
+
+    assert collector.uploads == 1
+    assert collector.buffer == []
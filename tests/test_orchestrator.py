@@ -0,0 +1,212 @@
+"""
+Unit tests for the shared Harambe orchestrator engine.
+"""
+
+import json
+from functools import partial
+
+import pytest
+from freezegun import freeze_time
+
+from city_scrapers.utils.render_routes import HTTP, RenderRoutes
+from harambe_scrapers import orchestrator as orchestrator_module
+from harambe_scrapers.orchestrator import Orchestrator, Stage
+
+
+class FakePage:
+    def __init__(self, fail_urls=()):
+        self.url = None
+        self.closed = False
+        self.fail_urls = fail_urls
+
+    async def goto(self, url, **kwargs):
+        if url in self.fail_urls:
+            raise TimeoutError(f"Timed out loading {url}")
+        self.url = url
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, fail_urls=()):
+        self.pages = []
+        self.fail_urls = fail_urls
+        self.routes = []
+
+    async def route(self, url, handler):
+        self.routes.append((url, handler))
+
+    async def close(self):
+        pass
+
+    async def new_page(self):
+        page = FakePage(self.fail_urls)
+        self.pages.append(page)
+        return page
+
+
+async def category_scrape(sdk, url, context):
+    for year in [2024, 2023]:
+        await sdk.enqueue(f"meetings?year={year}")
+
+
+async def listing_scrape(sdk, url, context):
+    year = url.split("=")[-1]
+    for day in [1, 2]:
+        await sdk.enqueue(f"/meeting/{year}-01-0{day}", {"year": year})
+
+
+async def detail_scrape(sdk, url, context):
+    date = url.split("/")[-1]
+    await sdk.save_data(
+        {
+            "title": f"Board Meeting {context['year']}" if date[-1] == "1" else None,
+            "start_time": f"{date}T10:00:00",
+        }
+    )
+
+
+class BoardOrchestrator(Orchestrator):
+    scraper_name = "test_board"
+    agency_name = "Test Board"
+    start_url = "https://example.com/board"
+    default_title = "Test Board Meeting"
+
+    category = Stage(category_scrape, "Generating year URLs")
+    listing = Stage(listing_scrape, "Extracting event URLs")
+    detail = Stage(detail_scrape, "Extracting meeting details")
+
+    def get_listing_url(self, listing_url):
+        return f"https://example.com/{listing_url}"
+
+    def get_source_url(self, event_url):
+        return f"https://example.com{event_url}"
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(orchestrator_module, "OUTPUT_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_run_in_context_runs_declared_stages(output_dir):
+    """Category, listing and detail stages run in order and write the output"""
+    orchestrator = BoardOrchestrator()
+    context = FakeContext()
+    await orchestrator.run_in_context(context)
+
+    assert orchestrator.listing_urls == [
+        "https://example.com/meetings?year=2024",
+        "https://example.com/meetings?year=2023",
+    ]
+    assert orchestrator.stats == {"saved": 4, "skipped": 0, "errors": 0}
+    assert {"category", "listing", "detail", "first_item", "total"} <= set(
+        orchestrator.timings
+    )
+    assert all(page.closed for page in context.pages)
+    assert context.routes == [("**/*", orchestrator.resource_policy.route)]
+
+    (output_file,) = output_dir.iterdir()
+    assert output_file.name.startswith("test_board_")
+    assert output_file == orchestrator.write_output()
+    with open(output_file) as f:
+        meetings = [json.loads(line) for line in f]
+    assert [m["name"] for m in meetings] == [
+        "Board Meeting 2024",
+        "Test Board Meeting",
+        "Board Meeting 2023",
+        "Test Board Meeting",
+    ]
+    assert meetings[0]["sources"][0]["url"] == "https://example.com/meeting/2024-01-01"
+    assert orchestrator.observer.sample == meetings[0]
+
+
+@pytest.mark.asyncio
+async def test_detail_stage_retries_then_counts_errors(output_dir, monkeypatch):
+    """Failed detail pages are retried, then counted as errors (not skipped)
+    without stopping the run"""
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(orchestrator_module.asyncio, "sleep", no_sleep)
+    orchestrator = BoardOrchestrator(retries=2, max_items=3)
+    context = FakeContext(fail_urls=["https://example.com/meeting/2024-01-02"])
+    await orchestrator.run_in_context(context)
+
+    assert orchestrator.stats == {"saved": 2, "skipped": 0, "errors": 1}
+
+
+@pytest.mark.asyncio
+async def test_browserless_stage_uses_static_context(output_dir, monkeypatch):
+    """Stages declared with browser=False get pages from a StaticContext"""
+    static_context = FakeContext()
+    monkeypatch.setattr(orchestrator_module, "StaticContext", lambda: static_context)
+
+    class StaticDetailOrchestrator(BoardOrchestrator):
+        detail = Stage(detail_scrape, "Extracting meeting details", browser=False)
+
+    assert StaticDetailOrchestrator.max_pages() == BoardOrchestrator.max_pages() - (
+        orchestrator_module.DETAIL_CONCURRENCY
+    )
+
+    orchestrator = StaticDetailOrchestrator(detail_concurrency=2)
+    context = FakeContext()
+    await orchestrator.run_in_context(context)
+
+    assert orchestrator.stats["saved"] == 4
+    assert 1 <= len(static_context.pages) <= 2
+    assert {page.url for page in static_context.pages} <= {
+        f"https://example.com/meeting/{year}-01-0{day}"
+        for year in [2023, 2024]
+        for day in [1, 2]
+    }
+    assert all(
+        page.url.startswith("https://example.com/meetings")
+        for page in context.pages[1:]
+    )
+
+
+@pytest.mark.asyncio
+async def test_render_routes_override_stage_default(output_dir, monkeypatch):
+    """Pages matching an "http" route skip the browser even in browser stages"""
+    static_context = FakeContext()
+    monkeypatch.setattr(orchestrator_module, "StaticContext", lambda: static_context)
+    routes = RenderRoutes({"https://example.com/meeting/*": {"fetch": HTTP}})
+
+    orchestrator = BoardOrchestrator(routes=routes)
+    context = FakeContext()
+    await orchestrator.run_in_context(context)
+
+    assert orchestrator.stats["saved"] == 4
+    assert static_context.pages
+    assert all(
+        page.url.startswith("https://example.com/meeting/")
+        for page in static_context.pages
+    )
+    assert not any(
+        (page.url or "").startswith("https://example.com/meeting/")
+        for page in context.pages
+    )
+
+
+@pytest.mark.asyncio
+@freeze_time("2024-03-01")
+async def test_year_archive_limits_listing_pages(output_dir, monkeypatch):
+    """Only year listing pages in the horizon are scraped"""
+    monkeypatch.setattr(
+        orchestrator_module,
+        "years_in_horizon",
+        partial(orchestrator_module.years_in_horizon, previous_years=0, backfill=False),
+    )
+
+    class YearArchiveOrchestrator(BoardOrchestrator):
+        year_archive = True
+
+    orchestrator = YearArchiveOrchestrator()
+    await orchestrator.run_in_context(FakeContext())
+
+    assert orchestrator.listing_urls == ["https://example.com/meetings?year=2024"]
+    assert orchestrator.stats["saved"] == 2
@@ -0,0 +1,134 @@
+import os
+import time
+from os.path import dirname, join
+
+import pytest
+from scrapy.settings import Settings
+from scrapy.statscollectors import StatsCollector
+from scrapy.utils.test import get_crawler
+from twisted.internet import reactor
+
+from city_scrapers.spiders.cuya_community_college import LAPARAMS, match_agenda_date
+from city_scrapers.utils.pdf import (
+    PdfExtractor,
+    PdfTextCache,
+    extract_pdf_text,
+    find_in_pdf_pages,
+)
+
+with open(join(dirname(__file__), "files", "cuya_community_college.pdf"), "rb") as f:
+    calendar_pdf = f.read()
+with open(
+    join(dirname(__file__), "files", "cuya_community_college_agenda.pdf"), "rb"
+) as f:
+    agenda_pdf = f.read()
+
+
+def test_extract_pdf_text():
+    pdf_text = extract_pdf_text(calendar_pdf, laparams={"line_margin": 5.0})
+    assert "BOARD MEETINGS CALENDAR" in pdf_text
+
+
+def test_extract_pdf_text_max_pages():
+    first_page = extract_pdf_text(agenda_pdf, max_pages=1)
+    assert first_page
+    assert len(first_page) < len(extract_pdf_text(agenda_pdf))
+
+
+def test_extract_pdf_text_timeout():
+    with pytest.raises(TimeoutError):
+        extract_pdf_text(calendar_pdf, timeout=0.0001)
+
+
+def test_pdf_extractor(monkeypatch):
+    monkeypatch.setattr(reactor, "callFromThread", lambda f, *args: f(*args))
+    PdfExtractor._extractors.clear()
+    settings = Settings({"PDF_EXTRACTION_WORKERS": 1})
+    extractor = PdfExtractor.from_settings(settings)
+    assert PdfExtractor.from_settings(settings) is extractor
+
+    results = []
+    d = extractor.extract_text(calendar_pdf, laparams={"line_margin": 5.0})
+    d.addCallback(results.append)
+    for _ in range(300):
+        if results:
+            break
+        time.sleep(0.1)
+    extractor.shutdown()
+    PdfExtractor._extractors.clear()
+
+    assert results[0] == extract_pdf_text(calendar_pdf, laparams={"line_margin": 5.0})
+
+
+def test_pdf_text_cache(tmp_path):
+    cache = PdfTextCache(str(tmp_path), max_bytes=10)
+    key = cache.key(calendar_pdf, {"line_margin": 5.0})
+    assert key != cache.key(calendar_pdf, {"line_margin": 0.5})
+    assert key != cache.key(calendar_pdf, {"line_margin": 5.0}, max_pages=1)
+    assert cache.get(key) is None
+
+    assert cache.set(key, "calendar") == 0
+    assert cache.get(key) == "calendar"
+
+    other_key = cache.key(agenda_pdf)
+    os.utime(cache._entry_path(key), (0, 0))
+    assert cache.set(other_key, "agenda") == 1
+    assert cache.get(key) is None
+    assert cache.get(other_key) == "agenda"
+
+
+def test_pdf_extractor_cache_hit(tmp_path):
+    cache = PdfTextCache(str(tmp_path))
+    cache.set(cache.key(calendar_pdf, {"line_margin": 5.0}), "calendar")
+    extractor = PdfExtractor(workers=1, cache=cache)
+    stats = StatsCollector(get_crawler())
+
+    results = []
+    d = extractor.extract_text(calendar_pdf, laparams={"line_margin": 5.0}, stats=stats)
+    d.addCallback(results.append)
+    extractor.shutdown()
+
+    assert results == ["calendar"]
+    assert stats.get_value("pdf_text_cache/hit") == 1
+
+
+def test_find_in_pdf_pages_stops_at_match():
+    pages = []
+
+    def predicate(page_text):
+        pages.append(page_text)
+        return "AGENDA" in page_text and "matched"
+
+    assert find_in_pdf_pages(agenda_pdf, predicate) == "matched"
+    assert len(pages) == 1
+
+
+def test_find_in_pdf_pages_no_match():
+    assert find_in_pdf_pages(agenda_pdf, lambda page_text: False) is None
+
+
+def test_pdf_extractor_find_in_pages_cache(tmp_path, monkeypatch):
+    """Pages laid out by a search are cached, and the search runs on them next time"""
+    monkeypatch.setattr(reactor, "callFromThread", lambda f, *args: f(*args))
+    cache = PdfTextCache(str(tmp_path))
+    extractor = PdfExtractor(workers=1, cache=cache)
+    stats = StatsCollector(get_crawler())
+    expected = find_in_pdf_pages(agenda_pdf, match_agenda_date, LAPARAMS)
+
+    results = []
+    d = extractor.find_in_pages(agenda_pdf, match_agenda_date, LAPARAMS, stats=stats)
+    d.addCallback(results.append)
+    for _ in range(300):
+        if results:
+            break
+        time.sleep(0.1)
+    extractor.shutdown()
+
+    # Answered from the cache, without the stopped workers
+    d = extractor.find_in_pages(agenda_pdf, match_agenda_date, LAPARAMS, stats=stats)
+    d.addCallback(results.append)
+
+    assert results == [expected, expected]
+    assert stats.get_value("pdf_text_cache/miss") == 1
+    assert stats.get_value("pdf_text_cache/hit") == 1
+    assert cache.get(cache.key(agenda_pdf, LAPARAMS)) is None
@@ -0,0 +1,122 @@
+"""
+Tests for the render routes manifest, and for routing pages with it.
+"""
+
+import pytest
+
+from city_scrapers.utils.render_routes import BROWSER, HTTP, RenderRoutes, url_pattern
+from harambe_scrapers.concurrency import RoutedPagePool
+from scripts.probe_render import diff_fields, normalize
+
+
+class FakePool:
+    def __init__(self, name, size=2):
+        self.name = name
+        self.size = size
+        self.urls = []
+
+    def page(self, url=None):
+        self.urls.append(url)
+        return self.name
+
+    async def close(self):
+        pass
+
+
+def test_url_pattern():
+    assert (
+        url_pattern("https://www.riderta.com/events/2024-7-30/board-meeting")
+        == "https://www.riderta.com/events/*"
+    )
+    assert url_pattern("https://www.riderta.com/events") == "https://www.riderta.com/*"
+    assert url_pattern("https://www.noaca.org/") == "https://www.noaca.org/*"
+
+
+def test_fetch_for():
+    routes = RenderRoutes(
+        {
+            "https://example.com/*": {"fetch": BROWSER},
+            "https://example.com/events/*": {"fetch": HTTP},
+        }
+    )
+    assert routes.fetch_for("https://example.com/events/board") == HTTP
+    assert routes.fetch_for("https://example.com/calendar") == BROWSER
+    assert routes.fetch_for("https://other.com/events/board") == BROWSER
+    assert routes.fetch_for("https://other.com/events/board", HTTP) == HTTP
+    assert not routes.uses_browser("https://example.com/events/board")
+    assert routes.uses_browser("https://other.com/", default=True)
+    assert not routes.uses_browser("https://other.com/", default=False)
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "render_routes.json")
+    assert RenderRoutes.load(path).routes == {}
+
+    routes = RenderRoutes.load(path)
+    routes.set("https://example.com/events/*", HTTP, samples=3, differences=[])
+    routes.save()
+
+    loaded = RenderRoutes.load(path)
+    assert loaded.fetch_for("https://example.com/events/board") == HTTP
+    assert loaded.routes["https://example.com/events/*"]["samples"] == 3
+    assert "checked_at" in loaded.routes["https://example.com/events/*"]
+
+
+def test_set_probe_keeps_browser_for_shared_pattern(tmp_path):
+    path = str(tmp_path / "render_routes.json")
+    routes = RenderRoutes.load(path)
+    pattern = "https://cuyahogacounty.gov/boards-and-commissions/*"
+    routes.set_probe(pattern, "cuya_audit", BROWSER, samples=3, differences=["count"])
+    routes.set_probe(pattern, "cuya_health", HTTP, samples=3)
+    routes.save()
+
+    assert routes.fetch_for(pattern) == BROWSER
+    assert routes.routes[pattern]["samples"] == 6
+    assert routes.routes[pattern]["differences"] == ["count"]
+
+    # Probing a scraper again replaces only its own result
+    loaded = RenderRoutes.load(path)
+    loaded.set_probe(pattern, "cuya_audit", HTTP, samples=3)
+    assert loaded.fetch_for(pattern) == HTTP
+    assert set(loaded.routes[pattern]["probes"]) == {"cuya_audit", "cuya_health"}
+
+
+def test_routed_page_pool():
+    routes = RenderRoutes({"https://example.com/events/*": {"fetch": HTTP}})
+    pool = RoutedPagePool(
+        routes,
+        FakePool("browser"),
+        FakePool("static"),
+        BROWSER,
+        resolve=lambda url: "https://example.com" + url,
+    )
+
+    assert pool.page("/events/board") == "static"
+    assert pool.page("/calendar/2024") == "browser"
+    assert pool.page() == "browser"
+    assert pool.static_pool.urls == ["/events/board"]
+
+
+def test_diff_fields():
+    rendered = normalize([{"title": "Board Meeting", "start_time": "2024-01-09"}])
+    assert diff_fields(rendered, rendered) == []
+    assert diff_fields(normalize([{"title": "Board Meeting"}]), rendered) == [
+        "start_time"
+    ]
+    assert diff_fields([], rendered) == ["count"]
+
+
+@pytest.mark.asyncio
+async def test_routed_pool_closes_both():
+    closed = []
+
+    class ClosingPool(FakePool):
+        async def close(self):
+            closed.append(self.name)
+
+    pool = RoutedPagePool(
+        RenderRoutes(), ClosingPool("browser"), ClosingPool("static"), HTTP
+    )
+    assert pool.page("https://example.com/") == "static"
+    await pool.close()
+    assert closed == ["browser", "static"]
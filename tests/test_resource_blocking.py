@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import pytest
+from scrapy.statscollectors import StatsCollector
+from scrapy.utils.test import get_crawler
+
+from city_scrapers.utils.resource_blocking import BLOCKED_HOSTS, ResourcePolicy
+
+
+def playwright_request(resource_type, url, navigation=False, parent_frame=None):
+    return SimpleNamespace(
+        resource_type=resource_type,
+        url=url,
+        is_navigation_request=lambda: navigation,
+        frame=SimpleNamespace(parent_frame=parent_frame),
+    )
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.result = None
+
+    async def abort(self, error_code=None):
+        self.result = "abort"
+
+    async def fallback(self):
+        self.result = "fallback"
+
+
+def test_should_block():
+    policy = ResourcePolicy(
+        block_types=["image", "font"], block_hosts=["youtube.com", "*.analytics.*"]
+    )
+    assert policy.should_block("image", "https://example.com/logo.png")
+    assert policy.should_block("script", "https://www.youtube.com/iframe_api")
+    assert policy.should_block("xhr", "https://cdn.analytics.example.com/collect")
+    assert not policy.should_block("script", "https://example.com/app.js")
+    assert not policy.should_block("script", "https://notyoutube.com/app.js")
+    assert not policy.should_block(
+        "document", "https://www.youtube.com/watch", main_frame=True
+    )
+
+
+def test_allow_overrides_block():
+    policy = ResourcePolicy(
+        block_types=["image"],
+        block_hosts=["example.com"],
+        allow_hosts=["cdn.example.com"],
+    )
+    assert policy.should_block("script", "https://example.com/app.js")
+    assert not policy.should_block("image", "https://cdn.example.com/logo.png")
+
+    policy = ResourcePolicy(block_types=["image", "font"], allow_types=["font"])
+    assert not policy.should_block("font", "https://example.com/font.woff2")
+
+
+def test_from_env(monkeypatch):
+    policy = ResourcePolicy.from_env(block_types=["stylesheet"], allow_types=["font"])
+    assert {"image", "media", "font", "stylesheet"} == policy.block_types
+    assert policy.block_hosts == BLOCKED_HOSTS
+    assert not policy.should_block("font", "https://example.com/font.woff2")
+
+    monkeypatch.setenv("RESOURCE_BLOCKING_TYPES", "image, media")
+    monkeypatch.setenv("RESOURCE_BLOCKING_HOSTS", "")
+    policy = ResourcePolicy.from_env()
+    assert policy.block_types == {"image", "media"}
+    assert policy.block_hosts == []
+
+    monkeypatch.setenv("RESOURCE_BLOCKING_ENABLED", "False")
+    assert not ResourcePolicy.from_env().should_block("image", "https://a.com/b.png")
+
+
+def test_abort_request_counts_blocked():
+    policy = ResourcePolicy(block_types=["image"], block_hosts=["youtube.com"])
+    assert policy(playwright_request("image", "https://example.com/a.png"))
+    assert policy(playwright_request("image", "https://example.com/b.png"))
+    assert policy(
+        playwright_request(
+            "document", "https://www.youtube.com/embed/1", True, parent_frame="main"
+        )
+    )
+    assert not policy(
+        playwright_request("document", "https://www.youtube.com/watch", True)
+    )
+    assert policy.blocked == {"image": 2, "document": 1}
+    assert policy.summary() == "Blocked 3 requests (image 2, document 1)"
+
+    stats = StatsCollector(get_crawler())
+    policy.record_stats(stats)
+    assert stats.get_value("resource_blocking/blocked/image") == 2
+
+
+@pytest.mark.asyncio
+async def test_route():
+    policy = ResourcePolicy(block_types=["font"])
+    blocked = FakeRoute(playwright_request("font", "https://example.com/a.woff"))
+    allowed = FakeRoute(playwright_request("script", "https://example.com/a.js"))
+    await policy.route(blocked)
+    await policy.route(allowed)
+    assert blocked.result == "abort"
+    assert allowed.result == "fallback"
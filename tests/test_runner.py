@@ -0,0 +1,163 @@
+"""
+Unit tests for the shared-browser Harambe runner.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from harambe_scrapers import (
+    cle_building_standards,
+    cle_transit,
+    cuya_emergency_services_advisory,
+    runner,
+)
+from harambe_scrapers.concurrency import LISTING_CONCURRENCY, YEAR_CONCURRENCY
+from harambe_scrapers.runner import (
+    PageBudget,
+    context_harness,
+    discover_scrapers,
+    run_scraper,
+    scraper_pages,
+)
+
+
+class FakeContext:
+    def __init__(self, **options):
+        self.options = options
+        self.pages = 0
+        self.closed = False
+        self.headers = {}
+        self.cookies = []
+
+    async def new_page(self):
+        self.pages += 1
+        return f"page {self.pages}"
+
+    async def set_extra_http_headers(self, headers):
+        self.headers.update(headers)
+
+    async def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def close(self):
+        pass
+
+    async def new_context(self, **options):
+        context = FakeContext(**options)
+        self.contexts.append(context)
+        return context
+
+
+def test_discover_scrapers():
+    names = [module.SCRAPER_NAME for module in discover_scrapers()]
+    assert "cle_transit" in names
+    assert "cle_planning_commission" in names
+    assert "orchestrator" not in names
+
+    assert discover_scrapers(["cle_transit"]) == [cle_transit]
+
+    # Covered by a Scrapy spider, so only run when named
+    assert "cuya_emergency_services_advisory" not in names
+    assert discover_scrapers(["cuya_emergency_services_advisory"]) == [
+        cuya_emergency_services_advisory
+    ]
+
+
+def test_scraper_pages():
+    # Detail pages are fetched without a browser
+    assert scraper_pages(cle_transit) == 1
+    assert scraper_pages(cuya_emergency_services_advisory) == 1 + LISTING_CONCURRENCY
+    assert scraper_pages(SimpleNamespace(__name__="sdk_scraper")) == 1
+    assert scraper_pages(cle_building_standards) == 1 + YEAR_CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_context_harness_opens_pages_in_context():
+    context = FakeContext()
+    cookies = [{"name": "session", "value": "1", "url": "https://example.com"}]
+    async with context_harness(context)(
+        headless=True, headers={"X-Test": "1"}, cookies=cookies
+    ) as page_factory:
+        assert await page_factory() == "page 1"
+    assert context.headers == {"X-Test": "1"}
+    assert context.cookies == cookies
+
+
+@pytest.mark.asyncio
+async def test_page_budget_limits_running_scrapers(monkeypatch):
+    """Scrapers wait for pages, and one needing more than the budget runs alone"""
+    monkeypatch.setattr(runner, "scraper_pages", lambda module: module.pages)
+    budget = PageBudget(size=5)
+    browser = FakeBrowser()
+    running = []
+    together = []
+
+    def scraper(name, pages, fail=False):
+        async def main(context):
+            running.append(name)
+            together.append(sorted(running))
+            await asyncio.sleep(0.01)
+            running.remove(name)
+            if fail:
+                raise RuntimeError("boom")
+
+        return SimpleNamespace(SCRAPER_NAME=name, main=main, pages=pages)
+
+    modules = [scraper("a", 3), scraper("b", 2), scraper("c", 9, fail=True)]
+    results = await asyncio.gather(
+        *(run_scraper(browser, budget, module) for module in modules)
+    )
+
+    assert ["a", "b"] in together
+    assert ["c"] in together
+    assert max(len(names) for names in together) == 2
+    assert [result["name"] for result in results] == ["a", "b", "c"]
+    assert results[0]["error"] is None
+    assert isinstance(results[2]["error"], RuntimeError)
+    assert all(context.closed for context in browser.contexts)
+    # Contexts get the options playwright_harness would have used
+    assert all(
+        context.options["ignore_https_errors"] and context.options["user_agent"]
+        for context in browser.contexts
+    )
+    assert budget.available == budget.size
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = SimpleNamespace(launch=AsyncMock(return_value=FakeBrowser()))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+def test_main_exits_with_error_when_scraper_fails(monkeypatch, tmp_path):
+    """A moved meeting location fails the scraper, and the runner exits non-zero"""
+    monkeypatch.setattr(runner, "async_playwright", FakePlaywright)
+    monkeypatch.setattr(cle_building_standards, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(
+        "sys.argv", ["runner", "cle_building_standards", "--page-budget", "8"]
+    )
+    moved = ValueError("Meeting location has changed (2025)")
+
+    with patch.object(cle_building_standards.SDK, "run", AsyncMock(side_effect=moved)):
+        with pytest.raises(SystemExit) as exit_info:
+            runner.main()
+    assert exit_info.value.code == 1
+
+    with patch.object(cle_building_standards.SDK, "run", AsyncMock()):
+        runner.main()
@@ -0,0 +1,115 @@
+"""
+Tests for reading a field spec from a page in one round trip.
+"""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from harambe_scrapers.cle_planning_commission import START_URL, scrape
+from harambe_scrapers.snapshot import SNAPSHOT_JS, snapshot
+from harambe_scrapers.static_page import StaticPage
+
+FILES_DIR = Path(__file__).parent / "files"
+
+SPEC = {
+    "title": "h1",
+    "missing": ".missing",
+    "missing_all": {"selector": ".missing", "all": True},
+    "links": {
+        "selector": ".attachments a",
+        "all": True,
+        "fields": {
+            "title": {"text": "content"},
+            "href": {"attribute": "href"},
+            "url": {"url": "href"},
+        },
+    },
+    "years": {"selector": "option", "all": True, "attribute": "value"},
+}
+
+
+class FixturePage(StaticPage):
+    """Serves saved pages instead of fetching them"""
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+        await self.set_content(self.pages[url])
+
+
+@pytest.mark.asyncio
+async def test_snapshot_static_page():
+    page = FixturePage({"https://example.com/meetings/": """
+                <h1>Board <span>Meeting</span></h1>
+                <div class="attachments">
+                  <a href="agenda.pdf"> Agenda </a>
+                  <a href="https://docs.example.com/minutes.pdf">Minutes</a>
+                </div>
+                <select><option value="2024">2024</option><option>2023</option></select>
+            """})
+    await page.goto("https://example.com/meetings/")
+
+    assert await snapshot(page, SPEC) == {
+        "title": "Board Meeting",
+        "missing": None,
+        "missing_all": [],
+        "links": [
+            {
+                "title": " Agenda ",
+                "href": "agenda.pdf",
+                "url": "https://example.com/meetings/agenda.pdf",
+            },
+            {
+                "title": "Minutes",
+                "href": "https://docs.example.com/minutes.pdf",
+                "url": "https://docs.example.com/minutes.pdf",
+            },
+        ],
+        "years": ["2024", None],
+    }
+
+
+@pytest.mark.asyncio
+async def test_snapshot_browser_page():
+    """Browser pages resolve the spec in a single evaluate call"""
+    page = MagicMock()
+    page.evaluate = AsyncMock(return_value={"title": "Board Meeting"})
+
+    assert await snapshot(page, SPEC) == {"title": "Board Meeting"}
+    page.evaluate.assert_awaited_once_with(SNAPSHOT_JS, SPEC)
+
+
+@pytest.mark.asyncio
+async def test_planning_commission_schedule():
+    schedule_html = (FILES_DIR / "cle_planning_commission.html").read_text()
+    page = FixturePage(
+        {
+            "https://planning.clevelandohio.gov/landmark/cpc.html": (
+                '<div class="body3">601 Lakeside Avenue, Room 514 Phone</div>'
+            ),
+            # The saved page gives the time as "9am"
+            START_URL: schedule_html.replace("at 9am,", "at 9:00am,"),
+        }
+    )
+    sdk = MagicMock()
+    sdk.save_data = AsyncMock()
+    sdk.page = page
+
+    await scrape(sdk, START_URL, {})
+
+    meetings = [call[0][0] for call in sdk.save_data.call_args_list]
+    assert meetings[0]["name"] == "CITY PLANNING COMMISSION"
+    assert meetings[0]["start_time"] == "2021-01-15T09:00:00-05:00"
+    assert [link["title"] for link in meetings[2]["links"]] == [
+        "Agenda",
+        "Presentation",
+    ]
+    assert meetings[2]["links"][1]["url"] == (
+        "https://planning.clevelandohio.gov/designreview/drcagenda/2021/PDF/"
+        "CPC-presentation-02-19-2021.pdf"
+    )
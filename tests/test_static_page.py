@@ -0,0 +1,172 @@
+"""
+Tests for the browserless StaticPage, running the Harambe extractors on the saved
+pages in tests/files without a browser.
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from playwright.async_api import Error, TimeoutError
+
+from harambe_scrapers.extractor.cle_transit.detail import (
+    scrape as transit_detail_scrape,
+)
+from harambe_scrapers.extractor.cuya_county_council.detail import (
+    scrape as council_detail_scrape,
+)
+from harambe_scrapers.extractor.cuya_emergency_services_advisory.detail import (
+    scrape as esab_detail_scrape,
+)
+from harambe_scrapers.extractor.cuya_emergency_services_advisory.listing import (
+    scrape as esab_listing_scrape,
+)
+from harambe_scrapers.orchestrator import DetailSDK, ListingSDK
+from harambe_scrapers.static_page import StaticContext, StaticPage, static_harness
+
+FILES_DIR = Path(__file__).parent / "files"
+
+
+async def static_page(file_name):
+    page = StaticPage()
+    await page.set_content((FILES_DIR / file_name).read_text())
+    return page
+
+
+@pytest.mark.asyncio
+async def test_transit_detail():
+    sdk = DetailSDK(await static_page("cle_transit_meeting.html"))
+    await transit_detail_scrape(
+        sdk, "https://www.riderta.com/events/2024-7-30/board-meeting", {}
+    )
+
+    assert sdk.data["title"] == "Board Meeting"
+    assert sdk.data["start_time"] == "2024-07-30T09:00:00-04:00"
+    assert sdk.data["end_time"] == "2024-07-30T11:00:00-04:00"
+    assert sdk.data["location"]["address"] == "1240 West 6th St, Cleveland, OH 44113"
+    assert len(sdk.data["links"]) == 3
+    assert sdk.data["classification"] == "BOARD"
+
+
+@pytest.mark.asyncio
+async def test_esab_listing_and_detail():
+    event_urls = []
+    await esab_listing_scrape(
+        ListingSDK(
+            await static_page("cuya_emergency_services_advisory.html"), event_urls
+        ),
+        "https://cuyahogacounty.gov/boards-and-commissions/board-details/other",
+        {},
+    )
+    assert (
+        "/boards-and-commissions/bc-event-detail//"
+        "2024/12/12/ccesab-calendar/12-12-24---ccesab-main"
+    ) in event_urls
+
+    sdk = DetailSDK(await static_page("cuya_emergency_services_advisory_detail.html"))
+    await esab_detail_scrape(sdk, "https://cuyahogacounty.gov/", {})
+
+    assert sdk.data["title"] == "01/09/24 - CCESAB Emergency Management Committee"
+    assert sdk.data["start_time"] == "2024-01-09T09:00:00-05:00"
+    assert sdk.data["end_time"] == "2024-01-09T10:00:00-05:00"
+    assert "4747 East 49th Street" in sdk.data["location"]["address"]
+    assert sdk.data["links"][0]["title"] == "Agenda"
+    assert sdk.data["classification"] == "COMMITTEE"
+
+
+@pytest.mark.asyncio
+async def test_council_detail():
+    sdk = DetailSDK(await static_page("cuya_county_council_detail.html"))
+    await council_detail_scrape(
+        sdk,
+        "https://cuyahogacounty.gov/council/council-event-details/",
+        {
+            "title": "Committee of the Whole Meeting",
+            "description": "",
+            "start_time": "2024-01-09T15:00:00-05:00",
+            "is_all_day_event": False,
+        },
+    )
+
+    assert "2079 East 9th Street" in sdk.data["location"]["address"]
+    assert [link["title"] for link in sdk.data["links"]] == [
+        "Agenda",
+        "Minutes",
+        "Legislation",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_selectors():
+    page = StaticPage()
+    await page.set_content("""
+        <html><head><title> Meetings </title><style>p { color: red; }</style></head>
+        <body>
+          <h1>Board  <span>Meeting</span></h1>
+          <div class="item"><p>First<br>line</p><a href="/a.pdf">Agenda</a></div>
+          <div class="item"><p>Second</p><script>var x = 1;</script></div>
+        </body></html>
+        """)
+
+    assert await page.title() == "Meetings"
+    assert await page.inner_text("h1") == "Board Meeting"
+    assert await page.get_attribute("a", "href") == "/a.pdf"
+    item = await page.query_selector(".item")
+    assert await item.inner_text() == "First\nline\nAgenda"
+    assert await (await item.query_selector("a")).text_content() == "Agenda"
+    assert len(await page.query_selector_all(".item")) == 2
+
+    items = page.locator(".item")
+    assert await items.count() == 2
+    assert await items.nth(1).inner_text() == "Second"
+    assert await items.locator("p").all_text_contents() == ["Firstline", "Second"]
+    assert await items.last.locator("p").text_content() == "Second"
+    with pytest.raises(Error, match="strict mode violation"):
+        await items.text_content()
+    with pytest.raises(TimeoutError):
+        await page.locator(".missing").text_content()
+    with pytest.raises(TimeoutError):
+        await page.wait_for_selector(".missing")
+
+
+@pytest.mark.asyncio
+async def test_goto():
+    async def meeting(request):
+        return web.Response(
+            text="<h1>Board Meeting</h1><a href='agenda.pdf'>Agenda</a>",
+            content_type="text/html",
+        )
+
+    app = web.Application()
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.Response(text="<h1>Slow</h1>", content_type="text/html")
+
+    app.router.add_get("/meetings/board", meeting)
+    app.router.add_get("/slow", slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    context = StaticContext()
+    try:
+        page = await context.new_page()
+        response = await page.goto(f"http://127.0.0.1:{port}/meetings/board")
+        assert response.ok
+        assert page.url == f"http://127.0.0.1:{port}/meetings/board"
+        assert await page.inner_text("h1") == "Board Meeting"
+
+        with pytest.raises(TimeoutError):
+            await page.goto(f"http://127.0.0.1:{port}/slow", timeout=50)
+
+        async with static_harness() as page_factory:
+            harness_page = await page_factory()
+            await harness_page.goto(f"http://127.0.0.1:{port}/meetings/board")
+            assert await harness_page.get_attribute("a", "href") == "agenda.pdf"
+    finally:
+        await context.close()
+        await runner.cleanup()
@@ -0,0 +1,117 @@
+"""
+Tests for the blob storage backends, and reading JSON lines from them.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from harambe_scrapers.jsonl import JsonLinesReader
+from harambe_scrapers.storage import (
+    AzureBlobStorage,
+    BlobNotFound,
+    LocalBlobStorage,
+    storage_from_env,
+)
+from scripts.merge_harambe_to_latest import download_blob_from_azure, upload_to_azure
+
+
+def test_local_storage(tmp_path):
+    storage = LocalBlobStorage(tmp_path)
+
+    storage.put("latest.json", '{"id": "m1"}\n')
+    storage.append("2025/01/15/0900/test_scraper.json", b'{"id": "m2"}\n')
+    storage.append("2025/01/15/0900/test_scraper.json", '{"id": "m3"}\n')
+
+    assert storage.get("latest.json") == b'{"id": "m1"}\n'
+    assert storage.get("2025/01/15/0900/test_scraper.json") == (
+        b'{"id": "m2"}\n{"id": "m3"}\n'
+    )
+    assert storage.list() == ["2025/01/15/0900/test_scraper.json", "latest.json"]
+    assert storage.list("2025/") == ["2025/01/15/0900/test_scraper.json"]
+    assert list(storage.stream("latest.json", chunk_size=5)) == [
+        b'{"id"',
+        b': "m1',
+        b'"}\n',
+    ]
+
+    with pytest.raises(BlobNotFound):
+        storage.get("upcoming.json")
+    with pytest.raises(BlobNotFound):
+        list(storage.stream("upcoming.json"))
+
+
+def test_azure_storage_converts_existing_blob():
+    """A block blob at an append path keeps its content"""
+    container = MagicMock()
+    blob = container.get_blob_client.return_value
+    blob.get_blob_properties.return_value.blob_type = "BlockBlob"
+    blob.download_blob.return_value.readall.return_value = b"old\n"
+    storage = AzureBlobStorage(container)
+
+    assert storage.append("test.json", b"new\n") == 2
+    assert storage.append("test.json", b"newer\n") == 1
+
+    blob.create_append_blob.assert_called_once()
+    assert [call[0][0] for call in blob.append_block.call_args_list] == [
+        b"old\n",
+        b"new\n",
+        b"newer\n",
+    ]
+
+
+def test_azure_storage_keeps_blob_on_error():
+    """Only a missing blob is created, so an error can't replace existing output"""
+    container = MagicMock()
+    blob = container.get_blob_client.return_value
+    blob.get_blob_properties.side_effect = TimeoutError("timed out")
+    storage = AzureBlobStorage(container)
+
+    with pytest.raises(TimeoutError):
+        storage.append("test.json", b"new\n")
+    blob.create_append_blob.assert_not_called()
+    blob.append_block.assert_not_called()
+
+    class ResourceNotFoundError(Exception):
+        pass
+
+    blob.get_blob_properties.side_effect = ResourceNotFoundError()
+    assert storage.append("test.json", b"new\n") == 1
+    blob.create_append_blob.assert_called_once()
+
+
+def test_storage_from_env(tmp_path):
+    with patch("harambe_scrapers.storage.BLOB_STORAGE_DIR", str(tmp_path)):
+        storage = storage_from_env("meetings-feed-cle", backend="local")
+    assert storage.root == tmp_path / "meetings-feed-cle"
+
+    with patch.dict("os.environ", {}, clear=True):
+        with pytest.raises(ValueError, match="AZURE_ACCOUNT_NAME"):
+            storage_from_env("meetings-feed-cle", MagicMock(), backend="azure")
+
+    with pytest.raises(ValueError, match="Unknown"):
+        storage_from_env("meetings-feed-cle", backend="s3")
+
+
+def test_merge_with_local_storage(tmp_path):
+    """The merge script reads and writes the local backend without Azure"""
+    with patch("harambe_scrapers.storage.BLOB_STORAGE", "local"), patch(
+        "harambe_scrapers.storage.BLOB_STORAGE_DIR", str(tmp_path)
+    ):
+        assert download_blob_from_azure("latest.json", "test-container") == []
+        upload_to_azure([{"id": "m1"}, {"id": "m2"}], "latest.json", "test-container")
+        assert download_blob_from_azure("latest.json", "test-container") == [
+            {"id": "m1"},
+            {"id": "m2"},
+        ]
+    assert (tmp_path / "test-container" / "latest.json").exists()
+
+
+def test_json_lines_reader():
+    """Lines split across chunks are joined, and invalid lines are counted"""
+    reader = JsonLinesReader(
+        [b'{"id": "m1"}\n{"name": "Caf', 'é"}\n\nINVA'.encode(), b'LID\n{"id": 3}']
+    )
+    assert list(reader) == [{"id": "m1"}, {"name": "Café"}, {"id": 3}]
+    assert reader.count == 3
+    assert reader.bad_lines == 1
@@ -0,0 +1,77 @@
+import pytest
+from freezegun import freeze_time
+from scrapy.utils.test import get_crawler
+
+from city_scrapers.spiders.cle_zoning_appeals import CleZoningAppealsSpider
+from city_scrapers.utils.listing_window import parse_backfill
+from city_scrapers.utils.year_archive import (
+    parse_year,
+    spider_years_in_horizon,
+    years_in_horizon,
+)
+
+YEAR_URLS = [
+    "emergency-services-advisory-board?year=2025",
+    "emergency-services-advisory-board?year=2024",
+    "emergency-services-advisory-board?year=2023",
+    "emergency-services-advisory-board?year=2022",
+]
+
+
+def test_parse_year():
+    assert parse_year("2024") == 2024
+    assert parse_year(2024) == 2024
+    assert parse_year("bbs.html?ID=2019&btn=Change+Year") == 2019
+    assert parse_year("AGENDA09182019.pdf") is None
+    assert parse_year("") is None
+
+
+@freeze_time("2024-03-01")
+def test_years_in_horizon():
+    assert years_in_horizon(YEAR_URLS, previous_years=1, backfill=False) == (
+        YEAR_URLS[:3]
+    )
+    assert years_in_horizon(["2024", "2023"], previous_years=0, backfill=False) == [
+        "2024"
+    ]
+    assert years_in_horizon(YEAR_URLS, previous_years=0, backfill=True) == YEAR_URLS
+    assert years_in_horizon(["archive"], previous_years=0, backfill=False) == [
+        "archive"
+    ]
+
+
+@freeze_time("2024-03-01")
+def test_spider_years_in_horizon():
+    crawler = get_crawler(CleZoningAppealsSpider, {"YEAR_ARCHIVE_YEARS": 2})
+    spider = CleZoningAppealsSpider.from_crawler(crawler)
+    assert spider_years_in_horizon(spider, YEAR_URLS) == YEAR_URLS
+
+    assert spider.start_urls == [
+        "http://planning.city.cleveland.oh.us/bza/cpc.html",
+        "http://planning.city.cleveland.oh.us/bza/cpc.html?ID=2023&btn=Change+Year",
+        "http://planning.city.cleveland.oh.us/bza/cpc.html?ID=2022&btn=Change+Year",
+    ]
+
+    crawler = get_crawler(
+        CleZoningAppealsSpider, {"YEAR_ARCHIVE_YEARS": 0, "LISTING_BACKFILL": True}
+    )
+    spider = CleZoningAppealsSpider.from_crawler(crawler)
+    assert spider_years_in_horizon(spider, YEAR_URLS) == YEAR_URLS
+
+
+def test_parse_backfill():
+    """The environment flag is parsed like the spiders' LISTING_BACKFILL setting"""
+    assert parse_backfill("1") is True
+    assert parse_backfill("true") is True
+    assert parse_backfill("0") is False
+    assert parse_backfill("False") is False
+    for value in ["0", "1", "true", "False"]:
+        crawler = get_crawler(settings_dict={"LISTING_BACKFILL": value})
+        assert parse_backfill(value) == crawler.settings.getbool("LISTING_BACKFILL")
+
+    with pytest.raises(ValueError):
+        parse_backfill("yes")
+    with pytest.raises(ValueError):
+        get_crawler(settings_dict={"LISTING_BACKFILL": "yes"}).settings.getbool(
+            "LISTING_BACKFILL"
+        )